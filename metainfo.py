@@ -1,13 +1,11 @@
 # -*- coding: utf-8 -*-
-import subprocess 
 import os 
 import sys
 import argparse 
-import shutil
-import gzip
 from src.Main import Main
 from src.Messages import Messages
 from src.ParameterValidator import ParameterValidator
+from src.ResultStore import ResultStore
 
 # Versión del programa
 VERSION = "1.0.0"
@@ -39,21 +37,9 @@ class MetaInfo:
     def check_dependencies(self): 
         # Verificar si podemos generar PDFs
         if self.pdf_enabled:
-            try:
-                import pypandoc
-                # Verificar si pandoc está instalado
-                if self.verbose:
-                    Messages.print_debug("Verificando si pandoc está instalado para generar PDF", verbose=True)
-                result = subprocess.run(['pandoc', '--version'], 
-                                       stdout=subprocess.PIPE, 
-                                       stderr=subprocess.PIPE)
-                if result.returncode != 0:
-                    Messages.print_warning(Messages.WARNING_PANDOC_NOT_FOUND)
-                    self.pdf_enabled = False
-            except ImportError:
-                Messages.print_warning(Messages.WARNING_PYPANDOC_NOT_FOUND)
+            if not ParameterValidator.check_dependency('reportlab'):
+                Messages.print_warning(Messages.WARNING_MISSING_REPORTLAB, verbose=True)
                 self.pdf_enabled = False
-                sys.exit()
 
         try:
            import exiftool           
@@ -62,6 +48,9 @@ class MetaInfo:
            sys.exit()
         
     def main(self): 
+       # Subcomando de consulta de resultados guardados
+       if len(sys.argv) > 1 and sys.argv[1] == 'query':
+           return self.query(sys.argv[2:])
        try:
         # Configurar el analizador de argumentos
         parser = argparse.ArgumentParser(description="MetaInfo - Herramienta para gestión de metadatos")
@@ -75,6 +64,21 @@ class MetaInfo:
         parser.add_argument("--markdown", "--md", action="store_true", default=True, help="Generar informe en formato Markdown (predeterminado: True)")
         parser.add_argument("--html", action="store_true", default=False, help="Generar informe en formato HTML (predeterminado: False)")
         parser.add_argument("--pdf", action="store_true", default=False, help="Generar informe en formato PDF (predeterminado: False)")
+        parser.add_argument("--pdf_font", type=str, default=None, help="Fuente TrueType (.ttf) del PDF para los valores con caracteres fuera de Latin-1 (predeterminado: DejaVu Sans, Noto Sans o Arial si están instaladas)")
+        parser.add_argument("--ndjson", "--json", action="store_true", default=False, help="Generar informe NDJSON con un objeto JSON por archivo y un resumen final (predeterminado: False)")
+        parser.add_argument("--gzip", action="store_true", default=False, help="Comprimir con gzip el informe NDJSON (predeterminado: False)")
+        parser.add_argument("--parquet", action="store_true", default=False, help="Exportar los campos de metadatos en formato Parquet, un campo por fila, para pandas/duckdb (requiere pyarrow, predeterminado: False)")
+        parser.add_argument("--store", nargs='?', const=ResultStore.DEFAULT_PATH, default=None, help=f"Guardar los resultados en una base de datos SQLite para consultarlos con 'metainfo query' (predeterminado si no se indica ruta: {ResultStore.DEFAULT_PATH})")
+        parser.add_argument("--bulk", action="store_true", default=False, help="Limpiar los archivos por lotes con un único proceso exiftool por lote (predeterminado: False)")
+        parser.add_argument("--batch_size", type=int, default=256, help="Número máximo de archivos por petición a exiftool al generar informes o limpiar con --bulk (predeterminado: 256)")
+        parser.add_argument("--batch_mb", type=int, default=64, help="Tamaño máximo en MB de los archivos de cada lote de extracción (predeterminado: 64)")
+        parser.add_argument("--native", action="store_true", default=False, help="Leer los metadatos de JPEG/PNG, PDF, MP4/MOV/M4A y documentos Office/OpenDocument con lectores nativos sin lanzar exiftool cuando sea posible (predeterminado: False)")
+        parser.add_argument("--max_value_length", type=int, default=4096, help="Número máximo de caracteres de cada valor que se analizan y se guardan en el informe; los datos binarios se omiten (predeterminado: 4096)")
+        parser.add_argument("--patterns", "--pattern_packs", type=str, default=None, help="Paquetes de patrones sensibles separados por comas, p. ej. english,device (predeterminado: todos)")
+        parser.add_argument("--pattern_file", action="append", default=None, help="Archivo YAML con paquetes de patrones adicionales; se puede repetir")
+        parser.add_argument("--pattern_cache", type=str, default=None, help="Carpeta donde guardar el índice de patrones compilado para reutilizarlo (predeterminado: desactivada)")
+        parser.add_argument("--scan_threads", type=int, default=1, help="Número de hilos que listan directorios en paralelo, útil en unidades de red NFS/SMB (predeterminado: 1)")
+        parser.add_argument("--workers", type=int, default=1, help="Número de procesos (informes) o hilos (limpieza) que trabajan en paralelo (predeterminado: 1)")
         parser.add_argument("--show_supported", "--show_mimes", action="store_true", default=False, help="Mostrar extensiones soportadas y salir (predeterminado: False)")
         parser.add_argument("--show_sensitive", "--show_patterns", action="store_true", default=False, help="Mostrar patrones considerados sensibles y salir (predeterminado: False)")
         parser.add_argument("--version", action="version", version="%(prog)s "+VERSION, help="Mostrar versión del programa")
@@ -106,6 +110,60 @@ class MetaInfo:
     
        return 0
     
+    def query(self, argv):
+        """
+        Consulta los resultados guardados con --store sin volver a analizar los archivos.
+        
+        Args:
+            argv: Argumentos de la línea de comandos posteriores a 'query'
+            
+        Returns:
+            int: 0 si la consulta se realizó, 1 en caso de error
+        """
+        parser = argparse.ArgumentParser(prog="metainfo query", description="MetaInfo - Consulta de resultados guardados con --store. Los filtros admiten comodines * y ? y distinguen mayúsculas")
+        parser.add_argument("--store", type=str, default=ResultStore.DEFAULT_PATH, help=f"Base de datos SQLite de resultados (predeterminado: {ResultStore.DEFAULT_PATH})")
+        parser.add_argument("--tag", type=str, default=None, help="Etiqueta del campo sin grupo, p. ej. 'GPS*'")
+        parser.add_argument("--group", type=str, default=None, help="Grupo del campo, p. ej. EXIF o XMP")
+        parser.add_argument("--pattern", type=str, default=None, help="Patrón sensible que coincidió, p. ej. gps o valor:email")
+        parser.add_argument("--ext", type=str, default=None, help="Extensión del archivo, p. ej. jpg")
+        parser.add_argument("--path", type=str, default=None, help="Ruta relativa del archivo, p. ej. 'fotos/*'")
+        parser.add_argument("--value", type=str, default=None, help="Valor del campo")
+        parser.add_argument("--sensitive", action="store_true", default=False, help="Mostrar solo los campos sensibles")
+        parser.add_argument("--run", type=int, default=None, help="Ejecución consultada (predeterminado: la última completada)")
+        parser.add_argument("--files", action="store_true", default=False, help="Mostrar solo las rutas de los archivos que coinciden")
+        parser.add_argument("--runs", action="store_true", default=False, help="Listar las ejecuciones guardadas y salir")
+        parser.add_argument("--limit", type=int, default=None, help="Número máximo de resultados")
+        args = parser.parse_args(argv)
+        
+        if not os.path.exists(os.path.expanduser(args.store)):
+            Messages.print_error(Messages.ERROR_STORE_NOT_FOUND, args.store)
+            return 1
+        
+        store = ResultStore(args.store)
+        try:
+            if args.runs:
+                for run in store.runs():
+                    print("\t".join("" if column is None else str(column) for column in run))
+                return 0
+            
+            if args.run is None and store.latest_run() is None:
+                Messages.print_error(Messages.ERROR_STORE_NO_RUNS, args.store)
+                return 1
+            
+            rows = store.query(tag=args.tag, group=args.group, pattern=args.pattern, extension=args.ext,
+                               path=args.path, value=args.value, sensitive=args.sensitive, run_id=args.run,
+                               files_only=args.files, limit=args.limit)
+            for row in rows:
+                if args.files:
+                    print(row[1])
+                else:
+                    run_id, path, group, tag, value, is_sensitive, patterns = row
+                    key = f"{group}:{tag}" if group else tag
+                    print(f"{path}\t{key}\t{value}\t{'Sensible' if is_sensitive else 'No'}\t{patterns or '-'}")
+            return 0
+        finally:
+            store.connection.close()
+    
     def help(self):
         self.parser.print_help()
         sys.exit()
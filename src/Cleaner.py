@@ -1,17 +1,30 @@
 import os
 from src.Messages import Messages
 from src.ParameterValidator import ParameterValidator
-import exiftool
 import subprocess
 import shutil
-import traceback
+import tempfile
+import collections
+import concurrent.futures
 from src.SensitivePatterns import SensitivePatterns
+from src.DirectoryWalker import DirectoryWalker
 
 class Cleaner:
     """
     Clase responsable de limpiar metadatos de archivos.
     """
     
+    # Campos que exiftool siempre devuelve y que no son metadatos del archivo
+    SYSTEM_KEYS = frozenset([
+        'SourceFile', 'ExifTool:ExifToolVersion', 'File:FileName', 'File:Directory',
+        'File:FileSize', 'File:FileModifyDate', 'File:FileAccessDate',
+        'File:FileInodeChangeDate', 'File:FilePermissions', 'File:FileType',
+        'File:FileTypeExtension', 'File:MIMEType'
+    ])
+    
+    # Marcador con el que exiftool informa del estado de cada archivo en la limpieza en bloque
+    BULK_STATUS_MARKER = "##METAINFO_STATUS"
+    
     def __init__(self, main_instance):
         """
         Inicializa el Cleaner con una referencia a la instancia principal.
@@ -23,6 +36,7 @@ class Cleaner:
         self.args = main_instance.args if hasattr(main_instance, 'args') else None
         self.verbose = self.args.get('verbose', False)
         self.sensitive = self.args.get('wipe_sensitive', False)
+        self.summary = {'processed': 0, 'cleaned': 0, 'failed': 0}
         # Verificar si el atributo EXIFTOOL_AVAILABLE está en main_instance
         verbose = ParameterValidator.safe_get(self.args, 'verbose', False)
         
@@ -36,9 +50,11 @@ class Cleaner:
         Returns:
             bool: True si se completó la limpieza correctamente, False en caso contrario
         """
-        lower_extensions = tuple(self.main.extensions)
-        upper_extensions = tuple(ext.upper() for ext in self.main.extensions)
+        walker = DirectoryWalker(self.main.extensions, on_error=self._report_directory_error,
+                                 workers=self.args.get('scan_threads'))
         verbose = self.args.get('verbose', False)
+        workers = max(1, int(self.args.get('workers') or 1))
+        self.summary = {'processed': 0, 'cleaned': 0, 'failed': 0}
                 
         try:
             # Mensaje sobre el modo de limpieza
@@ -47,33 +63,38 @@ class Cleaner:
             else:
                 Messages.print_info("Modo de limpieza: TODOS LOS METADATOS")
             
-            files_found = self._process_directory(src_path, lower_extensions, upper_extensions)
+            if self.args.get('bulk', False):
+                files_found = self._process_directory_in_bulk(src_path, walker)
+            elif workers > 1:
+                files_found = self._process_directory_in_parallel(src_path, walker, workers)
+            else:
+                files_found = self._process_directory(src_path, walker)
             
             if not files_found:
                 Messages.print_info("No se encontraron archivos con las extensiones soportadas.")
             else:
                 Messages.print_info("Proceso de limpieza de metadatos completado.")
+                Messages.print_info(f"Resumen de limpieza: {self.summary['processed']} archivos procesados, "
+                                    f"{self.summary['cleaned']} limpiados, {self.summary['failed']} con errores")
                 
             return True
         except Exception as e:
             Messages.print_error(f"Error al eliminar metadatos: {str(e)}")
-            traceback.print_exc()
+            Messages.print_traceback()
             return False
             
-    def _process_directory(self, directory, lower_extensions, upper_extensions):
+    def _process_directory(self, directory, walker):
         """
-        Procesa recursivamente un directorio y todos sus subdirectorios para limpiar metadatos.
+        Procesa un directorio y todos sus subdirectorios para limpiar metadatos.
         
         Args:
             directory: Ruta al directorio a procesar
-            lower_extensions: Tupla de extensiones en minúsculas
-            upper_extensions: Tupla de extensiones en mayúsculas
+            walker: DirectoryWalker con las extensiones soportadas
             
         Returns:
             bool: True si se encontraron archivos, False en caso contrario
         """
         files_found = False
-        verbose = self.args.get('verbose', False)
         
         try:
             # Verificar si el directorio existe
@@ -83,39 +104,283 @@ class Cleaner:
                 
             Messages.print_debug(f"DEBUG-Cleaner-process - Procesando directorio: {directory}", verbose=self.verbose)
             
-            for item in os.listdir(directory):
-                item_path = os.path.join(directory, item)
-                
-                # Omitir archivos .txt
-                # if item.lower().endswith('.txt'):
-                #    Messages.print_debug(f"DEBUG-Cleaner - Omitiendo archivo .txt: {item_path}", verbose=self.verbose)
-                #    continue
-                
-                if os.path.isfile(item_path) and (item.lower().endswith(lower_extensions) or item.upper().endswith(upper_extensions)):
-                    try:
-                        Messages.print_info(f"Limpiando metadatos de {item_path} ...")
-                        files_found = True
-                        
-                        if self.sensitive is False:                            
-                            self._clean_all_metadata(item_path)
-                        else:
-                            self._clean_sensitive_metadata(item_path)
-                        
-                    except Exception as e:
-                        Messages.print_error(f"Error al procesar archivo {item_path}: {str(e)}")                        
-                        continue
-                    
-                elif os.path.isdir(item_path):
-                    # Procesar subdirectorio
-                    Messages.print_debug(f"DEBUG-Cleaner - Procesando subdirectorio {item_path}", verbose=verbose)
-                    subdir_files_found = self._process_directory(item_path, lower_extensions, upper_extensions)
-                    files_found = files_found or subdir_files_found
+            for item_path in walker.iter_files(directory):
+                files_found = True
+                self._record_result(self._clean_file(item_path))
                     
             return files_found
         except Exception as e:
             Messages.print_error(f"Error al procesar directorio {directory}: {str(e)}")
-            traceback.print_exc()
+            Messages.print_traceback()
             return files_found
+    
+    def _process_directory_in_parallel(self, directory, walker, workers):
+        """
+        Limpia los archivos de un directorio con un pool acotado de hilos.
+        
+        Cada archivo se limpia de forma aislada: un fallo solo afecta a ese archivo.
+        Los mensajes de cada archivo se acumulan y se imprimen en el orden del
+        recorrido, y como máximo hay workers * 4 archivos pendientes a la vez.
+        
+        Args:
+            directory: Ruta al directorio a procesar
+            walker: DirectoryWalker con las extensiones soportadas
+            workers: Número de hilos de limpieza
+            
+        Returns:
+            bool: True si se encontraron archivos, False en caso contrario
+        """
+        if not os.path.exists(directory):
+            Messages.print_error(f"Error: El directorio {directory} no existe")
+            return False
+        
+        Messages.print_debug(f"DEBUG-Cleaner - Limpieza paralela con {workers} hilos", verbose=self.verbose)
+        files_found = False
+        pending = collections.deque()
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for item_path in walker.iter_files(directory):
+                files_found = True
+                pending.append(executor.submit(self._clean_file_captured, item_path))
+                if len(pending) >= workers * 4:
+                    self._flush_result(pending.popleft())
+            
+            while pending:
+                self._flush_result(pending.popleft())
+        
+        return files_found
+    
+    def _process_directory_in_bulk(self, directory, walker):
+        """
+        Limpia los archivos de un directorio por lotes, cada lote con un único proceso exiftool.
+        
+        Args:
+            directory: Ruta al directorio a procesar
+            walker: DirectoryWalker con las extensiones soportadas
+            
+        Returns:
+            bool: True si se encontraron archivos, False en caso contrario
+        """
+        if not os.path.exists(directory):
+            Messages.print_error(f"Error: El directorio {directory} no existe")
+            return False
+        
+        batch_size = max(1, int(self.args.get('batch_size') or self.main.reporter.DEFAULT_BATCH_SIZE))
+        Messages.print_debug(f"DEBUG-Cleaner - Limpieza en bloque con lotes de {batch_size} archivos", verbose=self.verbose)
+        files_found = False
+        batch = []
+        
+        for item_path in walker.iter_files(directory):
+            files_found = True
+            batch.append(item_path)
+            if len(batch) >= batch_size:
+                self._clean_batch(batch)
+                batch = []
+        
+        if batch:
+            self._clean_batch(batch)
+        
+        return files_found
+    
+    def _clean_batch(self, batch):
+        """
+        Limpia un lote de archivos con un único proceso exiftool y un archivo de argumentos.
+        
+        Los archivos que necesitan mat2/qpdf (PDF, XLSX, DOCX) o cuya ruta no se puede
+        escribir en un archivo de argumentos se limpian individualmente. La verificación
+        posterior se hace con una única lectura por lotes.
+        
+        Args:
+            batch: Lista de rutas de archivos
+        """
+        blocks = []
+        deleted_tags = {}
+        
+        if self.sensitive:
+            bulk_files = []
+            for file_path in batch:
+                if self._can_bulk(file_path):
+                    bulk_files.append(file_path)
+                else:
+                    self._record_result(self._clean_file(file_path))
+            
+            bulk_metadata = self.main.inspect_batch(bulk_files) if bulk_files else []
+            # Clasificar todos los campos del lote de una vez y repartir los veredictos por archivo
+            verdicts = iter(self._check_fields(
+                [field for metadata in bulk_metadata for field in self._metadata_fields(metadata)]))
+            for file_path, metadata in zip(bulk_files, bulk_metadata):
+                Messages.print_info(f"Limpiando metadatos de {file_path} ...")
+                sensitive_tags = self._find_sensitive_tags(metadata, verdicts)
+                if not sensitive_tags:
+                    Messages.print_info(f"No se encontraron datos sensibles en {file_path}")
+                    self._record_result(True)
+                    continue
+                deleted_tags[file_path] = sensitive_tags
+                blocks.append((file_path, [f"-{tag}=" for tag in sensitive_tags]))
+        else:
+            for file_path in batch:
+                if not self._can_bulk(file_path) or self._get_real_file_type(file_path) in ['pdf', 'xlsx', 'docx']:
+                    self._record_result(self._clean_file(file_path))
+                    continue
+                Messages.print_info(f"Limpiando metadatos de {file_path} ...")
+                blocks.append((file_path, self._wipe_all_tag_args()))
+        
+        if not blocks:
+            return
+        
+        results = self._run_argfile(blocks)
+        cleaned = []
+        for file_path, _ in blocks:
+            ok, error = results[file_path]
+            if ok:
+                cleaned.append(file_path)
+            else:
+                Messages.print_error(f"Error al ejecutar exiftool sobre {file_path}: {error}")
+                self._record_result(False)
+        
+        # Verificación final de todo el lote con una única lectura
+        for file_path, metadata in zip(cleaned, self.main.inspect_batch(cleaned) if cleaned else []):
+            if not isinstance(metadata, list) or not metadata:
+                Messages.print_error(f"No se pudieron verificar los metadatos restantes de {file_path}")
+                self._record_result(False)
+                continue
+            remaining_metadata = metadata[0]
+            if self.sensitive:
+                still_sensitive = [tag for tag in deleted_tags[file_path] if tag in remaining_metadata]
+                for tag in still_sensitive:
+                    Messages.print_warning(f"No se pudo eliminar completamente la etiqueta: {tag}")
+                if still_sensitive:
+                    Messages.print_warning(f"Algunas etiquetas sensibles no pudieron eliminarse de {file_path}")
+                else:
+                    Messages.print_info(f"Metadatos sensibles eliminados correctamente de {file_path}")
+                self._record_result(not still_sensitive)
+            else:
+                self._report_remaining_metadata(file_path, remaining_metadata)
+                self._record_result(True)
+    
+    def _can_bulk(self, file_path):
+        """
+        Indica si una ruta puede escribirse en un archivo de argumentos de exiftool,
+        que elimina los espacios de los extremos de cada línea e ignora las que empiezan por '#'.
+        """
+        return '\n' not in file_path and file_path == file_path.strip() and not file_path.startswith('#')
+    
+    def _run_argfile(self, blocks):
+        """
+        Ejecuta varios comandos de exiftool en un único proceso mediante un archivo -@.
+        
+        Cada archivo es un comando independiente (separado por -execute) que imprime
+        su estado de salida con -echo3 y un marcador en stderr con -echo4, de modo que
+        el resultado y los errores se obtienen por archivo.
+        
+        Args:
+            blocks: Lista de tuplas (ruta del archivo, argumentos de borrado de etiquetas)
+            
+        Returns:
+            dict: Ruta del archivo -> (True si exiftool terminó correctamente, mensaje de error)
+        """
+        fd, argfile = tempfile.mkstemp(prefix="metainfo_", suffix=".args")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for index, (file_path, tag_args) in enumerate(blocks):
+                    if index > 0:
+                        f.write("-execute\n")
+                    for arg in tag_args + ["-overwrite_original", file_path,
+                                           "-echo3", f"{self.BULK_STATUS_MARKER} {index} ${{status}}",
+                                           "-echo4", f"{self.BULK_STATUS_MARKER} {index}"]:
+                        f.write(f"{arg}\n")
+            
+            command = ["exiftool", "-@", argfile]
+            Messages.print_debug(f"DEBUG-Cleaner - Ejecutando exiftool sobre {len(blocks)} archivos: {' '.join(command)}", verbose=self.verbose)
+            result = subprocess.run(command, capture_output=True, text=True)
+        finally:
+            if os.path.exists(argfile):
+                os.remove(argfile)
+        
+        statuses = {}
+        for line in (result.stdout or "").splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[0] == self.BULK_STATUS_MARKER:
+                statuses[int(parts[1])] = parts[2]
+        
+        # -echo4 cierra en stderr los mensajes de cada comando: los anteriores al marcador son suyos
+        errors = collections.defaultdict(list)
+        block_lines = []
+        for line in (result.stderr or "").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == self.BULK_STATUS_MARKER and parts[1].isdigit():
+                errors[int(parts[1])].extend(block_lines)
+                block_lines = []
+            else:
+                block_lines.append(line)
+        # Mensajes sin marcador (p. ej. si exiftool se interrumpe): se asocian por la ruta exacta al final de la línea
+        for index, (file_path, _) in enumerate(blocks):
+            errors[index].extend(line for line in block_lines if line == file_path or line.endswith(f" - {file_path}"))
+        
+        results = {}
+        for index, (file_path, _) in enumerate(blocks):
+            status = statuses.get(index)
+            error = "; ".join(errors[index])
+            if not error:
+                error = f"estado de salida {status}" if status is not None else "sin respuesta de exiftool"
+            results[file_path] = (status == "0", error)
+        return results
+    
+    def _report_directory_error(self, directory, error):
+        """Informa de un directorio que no se puede leer y continúa con el resto del recorrido."""
+        Messages.print_error(f"Error al procesar directorio {directory}: {str(error)}")
+    
+    def _clean_file(self, item_path):
+        """
+        Limpia un único archivo según el modo configurado, aislando cualquier error.
+        
+        Args:
+            item_path: Ruta al archivo a limpiar
+            
+        Returns:
+            bool: True si el archivo se limpió correctamente, False en caso contrario
+        """
+        try:
+            Messages.print_info(f"Limpiando metadatos de {item_path} ...")
+            
+            if self.sensitive is False:                            
+                result = self._clean_all_metadata(item_path)
+            else:
+                result = self._clean_sensitive_metadata(item_path)
+            return result is not False
+            
+        except Exception as e:
+            Messages.print_error(f"Error al procesar archivo {item_path}: {str(e)}")                        
+            return False
+    
+    def _clean_file_captured(self, item_path):
+        """
+        Limpia un archivo acumulando sus mensajes para imprimirlos más tarde en orden.
+        
+        Returns:
+            tuple: (resultado de la limpieza, lista de mensajes)
+        """
+        Messages.start_capture()
+        try:
+            return self._clean_file(item_path), Messages.stop_capture()
+        except BaseException:
+            Messages.stop_capture()
+            raise
+    
+    def _flush_result(self, future):
+        """Imprime los mensajes de un archivo limpiado en paralelo y registra su resultado."""
+        ok, lines = future.result()
+        for line in lines:
+            print(line)
+        self._record_result(ok)
+    
+    def _record_result(self, ok):
+        """Actualiza el resumen de limpieza con el resultado de un archivo."""
+        self.summary['processed'] += 1
+        if ok:
+            self.summary['cleaned'] += 1
+        else:
+            self.summary['failed'] += 1
         
     def _get_real_file_type(self, file_path):
         """
@@ -236,7 +501,7 @@ class Cleaner:
             if real_type == 'pdf':
                 if not self._verify_pdf_integrity(file_path):
                     Messages.print_error(f"No se puede procesar el PDF corrupto: {file_path}")
-                    return
+                    return False
             
             # 1. Primero usar mat2 para PDFs y XLSX
             if real_type in ['pdf', 'xlsx', 'docx']:
@@ -258,13 +523,13 @@ class Cleaner:
                             Messages.print_warning(f"El PDF quedó corrupto después de mat2, intentando reparar...")
                             if not self._verify_pdf_integrity(file_path):
                                 Messages.print_error(f"No se pudo reparar el PDF después de mat2: {file_path}")
-                                return
+                                return False
             
-            # 2. Limpieza general con exiftool
+            # 2. Limpieza general y de claves sensibles con una única escritura de exiftool
             Messages.print_info(f"Realizando limpieza general con exiftool para {file_path}...")
             
-            # Comando para limpiar todo y sobrescribir el original
-            exiftool_command = ["exiftool", "-all=", "-overwrite_original", file_path]
+            # Comando para limpiar todo, eliminar las claves sensibles y sobrescribir el original
+            exiftool_command = self._build_wipe_all_command(file_path)
             Messages.print_debug(f"DEBUG-Cleaner - Ejecutando comando de limpieza general: {' '.join(exiftool_command)}", verbose=self.verbose)
             
             result = subprocess.run(exiftool_command, capture_output=True, text=True)
@@ -277,58 +542,122 @@ class Cleaner:
                         result = subprocess.run(exiftool_command, capture_output=True, text=True)
                         if result.returncode != 0:
                             Messages.print_error(f"Error al ejecutar limpieza general con exiftool después de reparación: {result.stderr}")
-                            return
+                            return False
                     else:
                         Messages.print_error(f"No se pudo reparar el PDF después de la limpieza: {file_path}")
-                        return
+                        return False
                 else:
                     Messages.print_error(f"Error al ejecutar limpieza general con exiftool: {result.stderr}")
-                    return
-            
-            # 3. Limpieza específica de claves sensibles
-            Messages.print_info(f"Realizando limpieza específica de claves sensibles para {file_path}...")
+                    return False
             
-            keys_to_delete = SensitivePatterns.get_keys_to_delete()
-            if keys_to_delete:
-                specific_command = ["exiftool"]
-                for key in keys_to_delete:
-                    specific_command.append(f"-{key}=")
-                specific_command.extend(["-overwrite_original", file_path])
-                
-                Messages.print_debug(f"DEBUG-Cleaner - Ejecutando comando de limpieza específica: {' '.join(specific_command)}", verbose=self.verbose)
-                
-                result_specific = subprocess.run(specific_command, capture_output=True, text=True)
-                if result_specific.returncode != 0:
-                    Messages.print_error(f"Error al ejecutar limpieza específica: {result_specific.stderr}")
-            
-            # Verificación final
-            with exiftool.ExifToolHelper() as et:
-                remaining_metadata = et.get_metadata(file_path)
-                metadata_count = len(remaining_metadata[0]) if remaining_metadata and len(remaining_metadata) > 0 else 0
-                non_system_count = sum(1 for key, val in remaining_metadata[0].items() 
-                                  if key not in ['SourceFile', 'ExifTool:ExifToolVersion', 'File:FileName', 'File:Directory', 
-                                               'File:FileSize', 'File:FileModifyDate', 'File:FileAccessDate',
-                                               'File:FileInodeChangeDate', 'File:FilePermissions', 'File:FileType', 
-                                               'File:FileTypeExtension', 'File:MIMEType'])
-                
-                if non_system_count > 0:
-                    Messages.print_warning(f"Después de la limpieza, aún quedan {non_system_count} campos de metadatos en {file_path}")
-                    if self.verbose:
-                        Messages.print_debug("Campos restantes:", verbose=True)
-                        for key, val in remaining_metadata[0].items():
-                            if key not in ['SourceFile', 'ExifTool:ExifToolVersion', 'File:FileName', 'File:Directory', 
-                                         'File:FileSize', 'File:FileModifyDate', 'File:FileAccessDate',
-                                         'File:FileInodeChangeDate', 'File:FilePermissions', 'File:FileType', 
-                                         'File:FileTypeExtension', 'File:MIMEType']:
-                                Messages.print_debug(f"  {key}: {val}", verbose=True)
-                else:
-                    Messages.print_info(f"Limpieza finalizada con éxito para {file_path}")
+            # Verificación final (lector nativo con --native o proceso exiftool persistente)
+            remaining_metadata = self.main.inspect(file_path)
+            if not isinstance(remaining_metadata, list) or not remaining_metadata:
+                Messages.print_error(f"No se pudieron verificar los metadatos restantes de {file_path}")
+                return False
+            self._report_remaining_metadata(file_path, remaining_metadata[0])
+            return True
         
         except Exception as e:
             Messages.print_error(f"Error general al limpiar {file_path}: {str(e)}")
-            traceback.print_exc()
+            Messages.print_traceback()
+            return False
 
 
+    def _report_remaining_metadata(self, file_path, remaining_metadata):
+        """
+        Informa de los campos de metadatos que siguen presentes tras una limpieza completa.
+        
+        Args:
+            file_path: Ruta al archivo procesado
+            remaining_metadata: Diccionario de metadatos leído después de la limpieza
+        """
+        remaining = [(key, val) for key, val in remaining_metadata.items() if key not in self.SYSTEM_KEYS]
+        
+        if remaining:
+            Messages.print_warning(f"Después de la limpieza, aún quedan {len(remaining)} campos de metadatos en {file_path}")
+            if self.verbose:
+                Messages.print_debug("Campos restantes:", verbose=True)
+                for key, val in remaining:
+                    Messages.print_debug(f"  {key}: {val}", verbose=True)
+        else:
+            Messages.print_info(f"Limpieza finalizada con éxito para {file_path}")
+    
+    def _find_sensitive_tags(self, metadata, verdicts=None):
+        """
+        Identifica las etiquetas sensibles de los metadatos de un archivo.
+        
+        Args:
+            metadata: Metadatos devueltos por Main.inspect (lista de diccionarios o diccionario)
+            verdicts: Iterador con los veredictos ya calculados en bloque, en el orden de
+                      _metadata_fields (None para clasificar aquí los campos del archivo)
+            
+        Returns:
+            list: Claves de las etiquetas sensibles encontradas
+        """
+        fields = self._metadata_fields(metadata)
+        if verdicts is None:
+            verdicts = iter(self._check_fields(fields))
+        
+        sensitive_tags = []
+        for key, _ in fields:
+            is_sensitive, matching_patterns = next(verdicts)
+            if is_sensitive:
+                sensitive_tags.append(key)
+                Messages.print_info(f"  - Etiqueta sensible encontrada: {key} ({', '.join(matching_patterns)})")
+        
+        return sensitive_tags
+    
+    def _metadata_fields(self, metadata):
+        """
+        Obtiene los pares clave/valor que se clasifican de los metadatos de un archivo.
+        
+        Args:
+            metadata: Metadatos devueltos por Main.inspect (lista de diccionarios o diccionario)
+            
+        Returns:
+            list: Tuplas (clave, valor)
+        """
+        fields = []
+        if isinstance(metadata, list) and len(metadata) > 0:
+            for d in metadata:
+                if hasattr(d, 'items') and callable(d.items):
+                    fields.extend(d.items())
+        elif isinstance(metadata, dict):
+            # Ignorar el campo 'SourceFile' que es añadido por ExifTool
+            fields.extend((key, val) for key, val in metadata.items() if key != 'SourceFile')
+        return fields
+    
+    def _check_fields(self, fields):
+        """Clasifica en bloque una lista de pares (clave, valor) con el índice de patrones."""
+        return self.main.reporter._check_sensitive_batch([key for key, _ in fields], [val for _, val in fields])
+    
+    def _wipe_all_tag_args(self):
+        """
+        Obtiene los argumentos de exiftool que eliminan todos los metadatos y las claves
+        de SensitivePatterns.KEYS_TO_DELETE.
+        
+        Returns:
+            list: Argumentos de borrado de etiquetas
+        """
+        args = ["-all="]
+        for key in SensitivePatterns.get_keys_to_delete():
+            args.append(f"-{key}=")
+        return args
+    
+    def _build_wipe_all_command(self, file_path):
+        """
+        Construye el comando exiftool que elimina todos los metadatos y las claves
+        de SensitivePatterns.KEYS_TO_DELETE reescribiendo el archivo una sola vez.
+        
+        Args:
+            file_path: Ruta al archivo a procesar
+            
+        Returns:
+            list: Argumentos del comando exiftool
+        """
+        return ["exiftool"] + self._wipe_all_tag_args() + ["-overwrite_original", file_path]
+
     def _clean_sensitive_metadata(self, file_path):
         """
         Limpia solo los metadatos sensibles de un archivo, manteniendo el resto.
@@ -340,37 +669,14 @@ class Cleaner:
         Messages.print_debug(f"DEBUG-Cleaner - Iniciando limpieza selectiva de {file_path}", verbose=self.verbose)
         
         try:
-            # Obtener metadatos actuales
+            # Obtener metadatos actuales e identificar qué etiquetas son sensibles
             metadata = self.main.inspect(file_path)
-            sensitive_found = False
-            sensitive_tags = []
-            
-            # Identificar qué etiquetas son sensibles
-            if isinstance(metadata, list) and len(metadata) > 0:
-                for d in metadata:
-                    if hasattr(d, 'items') and callable(d.items):
-                        for key, val in d.items():
-                            # Verificar si contiene datos sensibles
-                            is_sensitive, matching_patterns = self.main.reporter._check_sensitive_data(key, val)
-                            if is_sensitive:
-                                sensitive_found = True
-                                sensitive_tags.append(key)
-                                Messages.print_info(f"  - Etiqueta sensible encontrada: {key} ({', '.join(matching_patterns)})")
-            elif isinstance(metadata, dict):
-                # Si metadata es un diccionario
-                for key, val in metadata.items():
-                    # Ignorar el campo 'SourceFile' que es añadido por ExifTool
-                    if key != 'SourceFile':
-                        # Verificar si contiene datos sensibles
-                        is_sensitive, matching_patterns = self.main.reporter._check_sensitive_data(key, val)
-                        if is_sensitive:
-                            sensitive_found = True
-                            sensitive_tags.append(key)
-                            Messages.print_info(f"  - Etiqueta sensible encontrada: {key} ({', '.join(matching_patterns)})")
+            sensitive_tags = self._find_sensitive_tags(metadata)
+            sensitive_found = len(sensitive_tags) > 0
             
             if not sensitive_found:
                 Messages.print_info(f"No se encontraron datos sensibles en {file_path}")
-                return
+                return True
             
             # Proceder con la limpieza usando subprocess
             temp_dir = os.path.dirname(file_path)
@@ -411,7 +717,7 @@ class Cleaner:
                     os.chmod(file_path, original_perms)
                     
                     Messages.print_info(f"Metadatos sensibles eliminados correctamente de {file_path}")
-                    return
+                    return True
                 except Exception as e:
                     Messages.print_error(f"Error al reemplazar el archivo original: {str(e)}")
             else:
@@ -420,29 +726,31 @@ class Cleaner:
             # Si llegamos aquí, el método directo falló; intentar con la biblioteca
             Messages.print_info(f"Intentando método alternativo para {file_path}...")
             
-            with exiftool.ExifToolHelper() as et:
-                for tag in sensitive_tags:
-                    try:
-                        et.execute(f"-{tag}=", "-overwrite_original", file_path)
-                        Messages.print_debug(f"DEBUG-Cleaner - Campo sensible '{tag}' eliminado", verbose=self.verbose)
-                    except Exception as e:
-                        Messages.print_error(f"Error al eliminar etiqueta {tag}: {str(e)}")
-                
-                # Verificar si se eliminaron correctamente
-                remaining_metadata = et.get_metadata(file_path)
-                still_sensitive = False
-                
-                if isinstance(remaining_metadata, list) and len(remaining_metadata) > 0:
-                    for d in remaining_metadata[0]:
-                        if d in sensitive_tags:
-                            still_sensitive = True
-                            Messages.print_warning(f"No se pudo eliminar completamente la etiqueta: {d}")
-                
-                if not still_sensitive:
-                    Messages.print_info(f"Limpieza selectiva de {file_path} completada")
-                else:
-                    Messages.print_warning(f"Algunas etiquetas sensibles no pudieron eliminarse de {file_path}")
+            et = self.main.exiftool_pool
+            for tag in sensitive_tags:
+                try:
+                    et.execute(f"-{tag}=", "-overwrite_original", file_path)
+                    Messages.print_debug(f"DEBUG-Cleaner - Campo sensible '{tag}' eliminado", verbose=self.verbose)
+                except Exception as e:
+                    Messages.print_error(f"Error al eliminar etiqueta {tag}: {str(e)}")
+            
+            # Verificar si se eliminaron correctamente
+            remaining_metadata = self.main.inspect(file_path)
+            still_sensitive = False
+            
+            if isinstance(remaining_metadata, list) and len(remaining_metadata) > 0:
+                for d in remaining_metadata[0]:
+                    if d in sensitive_tags:
+                        still_sensitive = True
+                        Messages.print_warning(f"No se pudo eliminar completamente la etiqueta: {d}")
+            
+            if not still_sensitive:
+                Messages.print_info(f"Limpieza selectiva de {file_path} completada")
+            else:
+                Messages.print_warning(f"Algunas etiquetas sensibles no pudieron eliminarse de {file_path}")
+            return not still_sensitive
             
         except Exception as e:
             Messages.print_error(f"Error general al limpiar selectivamente {file_path}: {str(e)}")
-            traceback.print_exc() 
\ No newline at end of file
+            Messages.print_traceback()
+            return False 
\ No newline at end of file
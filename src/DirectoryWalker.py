@@ -0,0 +1,217 @@
+import os
+import concurrent.futures
+
+
+class DirectoryWalker:
+    """
+    Recorrido iterativo de directorios basado en os.scandir.
+
+    Cada directorio se lee una sola vez con os.scandir y el tipo de cada entrada
+    se toma del propio DirEntry, sin llamadas adicionales a os.path.isfile u
+    os.path.isdir. Los subdirectorios se recorren con una pila explícita en el
+    mismo orden que el recorrido recursivo (en profundidad, cada subdirectorio
+    en su posición del listado), por lo que la profundidad del árbol no está
+    limitada por el límite de recursión de Python. Las extensiones se comparan
+    contra un conjunto precalculado de sufijos en minúsculas.
+
+    Con workers mayor que 1, los subdirectorios se listan por adelantado en un
+    pool de hilos (útil en NFS/SMB, donde domina la latencia de cada listado)
+    con una cola acotada de listados pendientes. Los archivos se devuelven en
+    cuanto su directorio está listado y en el mismo orden que el recorrido
+    secuencial.
+    """
+
+    # Listados pendientes por hilo en el recorrido paralelo
+    QUEUE_FACTOR = 4
+
+    def __init__(self, extensions, on_error=None, workers=1):
+        """
+        Inicializa el recorrido.
+
+        Args:
+            extensions: Extensiones soportadas (con o sin punto inicial)
+            on_error: Función llamada con (directorio, excepción) si un directorio no se
+                      puede leer; si es None, la excepción se propaga
+            workers: Número de hilos que listan directorios (1 para el recorrido secuencial)
+        """
+        self.suffixes = frozenset(ext.lower().lstrip('.') for ext in extensions)
+        self.on_error = on_error
+        self.workers = max(1, int(workers or 1))
+
+    def matches(self, name):
+        """
+        Indica si un nombre de archivo tiene una extensión soportada.
+
+        Args:
+            name: Nombre del archivo
+
+        Returns:
+            bool: True si la extensión (sin distinguir mayúsculas) está en el conjunto
+        """
+        ext = os.path.splitext(name)[1]
+        return bool(ext) and ext[1:].lower() in self.suffixes
+
+    def iter_entries(self, directory):
+        """
+        Recorre un directorio y sus subdirectorios devolviendo los archivos soportados.
+
+        Args:
+            directory: Ruta al directorio a recorrer
+
+        Yields:
+            os.DirEntry: Entrada de cada archivo soportado, en el orden del recorrido
+        """
+        if self.workers > 1:
+            yield from self._iter_entries_parallel(directory)
+            return
+
+        listing = self._safe_list(directory)
+        if listing is None:
+            return
+        stack = [iter(listing)]
+
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+
+            entry, kind = item
+            if kind is False:
+                yield entry
+            elif kind is True:
+                listing = self._safe_list(entry.path)
+                if listing is not None:
+                    stack.append(iter(listing))
+            else:
+                self._handle_error(entry.path, kind)
+
+    def iter_files(self, directory):
+        """
+        Recorre un directorio devolviendo las rutas de los archivos soportados.
+
+        Args:
+            directory: Ruta al directorio a recorrer
+
+        Yields:
+            str: Ruta de cada archivo soportado, en el orden del recorrido
+        """
+        for entry in self.iter_entries(directory):
+            yield entry.path
+
+    def _iter_entries_parallel(self, directory):
+        """
+        Recorrido en profundidad con los listados de subdirectorios adelantados en hilos.
+
+        Cada subdirectorio encontrado se apunta como pendiente y, mientras haya hueco
+        en la cola, se lista en el pool empezando por el siguiente que necesitará el
+        recorrido. Los resultados se consumen en el orden del recorrido secuencial y
+        los errores se notifican desde el hilo que recorre.
+        """
+        max_inflight = self.workers * self.QUEUE_FACTOR
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+        inflight = 0
+        # Subdirectorios aún sin listar; el último es el siguiente en el orden del recorrido
+        waiting = []
+
+        def submit(item):
+            nonlocal inflight
+            item[2] = executor.submit(self._list, item[0].path)
+            inflight += 1
+
+        def top_up():
+            while inflight < max_inflight and waiting:
+                item = waiting.pop()
+                if item[2] is None:
+                    submit(item)
+
+        def expand(listing):
+            items = [[entry, kind, None] for entry, kind in listing]
+            waiting.extend(reversed([item for item in items if item[1] is True]))
+            top_up()
+            return iter(items)
+
+        try:
+            root = executor.submit(self._list, directory)
+            try:
+                stack = [expand(root.result())]
+            except OSError as e:
+                self._handle_error(directory, e)
+                return
+
+            while stack:
+                item = next(stack[-1], None)
+                if item is None:
+                    stack.pop()
+                    continue
+
+                entry, kind, future = item
+                if kind is False:
+                    yield entry
+                elif kind is True:
+                    if future is None:
+                        submit(item)
+                        future = item[2]
+                    try:
+                        listing = future.result()
+                    except OSError as e:
+                        listing = None
+                        self._handle_error(entry.path, e)
+                    finally:
+                        inflight -= 1
+                    if listing is not None:
+                        stack.append(expand(listing))
+                    else:
+                        top_up()
+                else:
+                    self._handle_error(entry.path, kind)
+        finally:
+            # Como máximo quedan max_inflight listados pendientes
+            executor.shutdown(wait=True)
+
+    def _list(self, directory):
+        """
+        Lee y clasifica las entradas de un directorio, cerrando el descriptor antes de seguir.
+
+        Returns:
+            list: Tuplas (entrada, tipo) en el orden del listado, con tipo False para
+                  los archivos soportados, True para los subdirectorios que se recorren
+                  y la excepción si no se pudo determinar el tipo de la entrada
+        """
+        with os.scandir(directory) as it:
+            entries = list(it)
+
+        listing = []
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    if self.matches(entry.name):
+                        listing.append((entry, False))
+                elif entry.is_dir() and not self._is_link_loop(entry, directory):
+                    listing.append((entry, True))
+            except OSError as e:
+                listing.append((entry, e))
+        return listing
+
+    def _safe_list(self, directory):
+        """Lista un directorio notificando el error si no se puede leer."""
+        try:
+            return self._list(directory)
+        except OSError as e:
+            self._handle_error(directory, e)
+            return None
+
+    def _handle_error(self, path, error):
+        """Notifica un error de lectura o lo propaga si no hay función de error."""
+        if self.on_error is None:
+            raise error
+        self.on_error(path, error)
+
+    @staticmethod
+    def _is_link_loop(entry, current):
+        """Indica si un enlace simbólico a directorio apunta a un directorio que se está recorriendo."""
+        if not entry.is_symlink():
+            return False
+        target = os.path.realpath(entry.path)
+        current = os.path.realpath(current)
+        return current == target or current.startswith(target.rstrip(os.sep) + os.sep)
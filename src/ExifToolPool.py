@@ -0,0 +1,165 @@
+import threading
+from contextlib import ExitStack
+
+import exiftool
+from exiftool.exceptions import ExifToolExecuteException
+
+from src.Messages import Messages
+
+
+class ExifToolPool:
+    """
+    Mantiene un conjunto de procesos ExifTool persistentes (modo -stay_open).
+
+    Cada proceso se arranca la primera vez que se necesita y se reutiliza en
+    las siguientes peticiones, evitando lanzar un intérprete Perl por archivo.
+    Si un proceso muere durante una petición se descarta, se arranca uno nuevo
+    y la petición se reintenta una vez.
+
+    Los hilos que esperan un proceso libre se despiertan cuando se devuelve uno,
+    cuando se descarta uno (y pueden arrancar su sustituto) o cuando se cierra
+    el pool.
+    """
+
+    def __init__(self, size=1, verbose=False):
+        """
+        Inicializa el pool sin arrancar ningún proceso.
+
+        Args:
+            size: Número máximo de procesos ExifTool simultáneos
+            verbose: Si es True, se muestran mensajes de depuración
+        """
+        self.size = max(1, int(size or 1))
+        self.verbose = verbose
+        self._idle = []
+        self._workers = []
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+    def get_metadata(self, files, params=None):
+        """
+        Obtiene los metadatos de uno o varios archivos con un proceso del pool.
+
+        Args:
+            files: Ruta o lista de rutas a inspeccionar
+            params: Parámetros adicionales para exiftool
+
+        Returns:
+            list: Lista de diccionarios de metadatos, uno por archivo
+        """
+        return self._run(lambda et: et.get_metadata(files, params=params))
+
+    def execute(self, *params):
+        """
+        Ejecuta un comando arbitrario de exiftool con un proceso del pool.
+
+        Args:
+            *params: Parámetros de la línea de comandos de exiftool
+
+        Returns:
+            str: Salida estándar del comando
+        """
+        return self._run(lambda et: et.execute(*params))
+
+    def close(self):
+        """
+        Detiene todos los procesos ExifTool arrancados por el pool.
+
+        Los huecos reservados por procesos que aún se están arrancando se conservan
+        para que esos procesos ocupen su sitio al terminar, y los hilos en espera
+        se despiertan para arrancar procesos nuevos: el pool sigue siendo utilizable.
+        """
+        with self._cond:
+            workers = [worker for worker in self._workers if worker[0] is not None]
+            self._workers = [worker for worker in self._workers if worker[0] is None]
+            self._idle = []
+            self._cond.notify_all()
+
+        for worker in workers:
+            self._stop_worker(worker)
+
+    def _run(self, operation):
+        """
+        Ejecuta una operación sobre un proceso del pool, reiniciándolo si ha muerto.
+
+        Los errores propios del archivo (ExifToolExecuteException) se propagan sin
+        reintentar, ya que el proceso sigue siendo válido.
+        """
+        worker = self._acquire()
+        try:
+            try:
+                return operation(worker[1])
+            except ExifToolExecuteException:
+                raise
+            except Exception as e:
+                Messages.print_debug(f"DEBUG-ExifToolPool - Reiniciando proceso exiftool: {str(e)}", verbose=self.verbose)
+                self._discard(worker)
+                worker = self._acquire()
+                return operation(worker[1])
+        finally:
+            if worker is not None:
+                self._release(worker)
+
+    def _acquire(self):
+        """Obtiene un proceso libre, arrancando uno nuevo si el pool no está completo."""
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._workers) < self.size:
+                    # Reservar el hueco antes de arrancar el proceso fuera del lock
+                    placeholder = (None, object())
+                    self._workers.append(placeholder)
+                    break
+                self._cond.wait()
+
+        try:
+            worker = self._start_worker()
+        except Exception:
+            with self._cond:
+                if placeholder in self._workers:
+                    self._workers.remove(placeholder)
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._workers[self._workers.index(placeholder)] = worker
+        return worker
+
+    def _release(self, worker):
+        """Devuelve un proceso al conjunto de procesos libres."""
+        with self._cond:
+            if worker in self._workers:
+                self._idle.append(worker)
+                self._cond.notify()
+
+    def _discard(self, worker):
+        """Elimina un proceso del pool y lo detiene; un hilo en espera puede arrancar su sustituto."""
+        with self._cond:
+            if worker in self._workers:
+                self._workers.remove(worker)
+                self._cond.notify()
+        self._stop_worker(worker)
+
+    def _start_worker(self):
+        """Arranca un nuevo proceso ExifTool persistente."""
+        stack = ExitStack()
+        helper = stack.enter_context(exiftool.ExifToolHelper())
+        Messages.print_debug("DEBUG-ExifToolPool - Proceso exiftool iniciado", verbose=self.verbose)
+        return (stack, helper)
+
+    def _stop_worker(self, worker):
+        """Detiene un proceso ignorando los errores si ya había terminado."""
+        stack = worker[0]
+        if stack is None:
+            return
+        try:
+            stack.close()
+        except Exception as e:
+            Messages.print_debug(f"DEBUG-ExifToolPool - Error al detener exiftool: {str(e)}", verbose=self.verbose)
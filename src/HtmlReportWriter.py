@@ -0,0 +1,100 @@
+import datetime
+import html
+import os
+
+from src.ReportWriter import ReportWriter
+from src.resources.templates import Templates
+
+
+class HtmlReportWriter(ReportWriter):
+    """
+    Escritor incremental del informe HTML.
+
+    Genera el HTML directamente desde los registros de cada archivo, con las
+    plantillas de src/resources/templates.py, sin pasar por el informe Markdown
+    ni por la biblioteca markdown.
+    """
+
+    # Longitud máxima de los valores mostrados en las tablas
+    MAX_DISPLAY_LENGTH = 100
+
+    def _header(self, src_path, metadata_info):
+        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        title = html.escape(self.reporter._report_title())
+        directory = html.escape(os.path.relpath(src_path, self.reporter.output_path))
+
+        parts = [
+            Templates.get_html_report_start(title, directory, current_time),
+            f"<h1>{title}</h1>\n",
+            "<h2>Información General</h2>\n<ul>\n",
+            f"<li><strong>Directorio analizado</strong>: <code>{directory}</code></li>\n",
+            f"<li><strong>Fecha del análisis</strong>: {current_time}</li>\n",
+            f"<li><strong>Total de archivos analizados</strong>: {metadata_info.get('total_files', 0)}</li>\n",
+            f"<li><strong>Archivos con metadatos</strong>: {metadata_info.get('files_with_metadata', 0)}</li>\n",
+            f"<li><strong>Archivos con información sensible</strong>: {metadata_info.get('files_with_sensitive', 0)}</li>\n",
+            "</ul>\n",
+            "<h2>Resumen por Tipo de Archivo</h2>\n<table>\n",
+            "<thead><tr><th>Extensión</th><th>Cantidad</th><th>Con Metadatos</th><th>Con Datos Sensibles</th></tr></thead>\n<tbody>\n",
+        ]
+        for ext, stats in metadata_info.get('extensions_stats', {}).items():
+            parts.append(f"<tr><td>{html.escape(ext)}</td><td>{stats['count']}</td>"
+                         f"<td>{stats['with_metadata']}</td><td>{stats['with_sensitive']}</td></tr>\n")
+        parts.append("</tbody>\n</table>\n<h2>Detalles por Archivo</h2>\n")
+        return "".join(parts)
+
+    def _section(self, file_info):
+        file_path = file_info.get('file_path', '')
+        parts = [
+            f"<h3>{html.escape(os.path.basename(file_path))}</h3>\n",
+            f"<p><strong>Ruta relativa</strong>: <code>{html.escape(file_path)}</code></p>\n",
+            f"<p><strong>Total de campos de metadatos</strong>: {file_info.get('total_metadata', 0)}</p>\n",
+        ]
+        if file_info.get('has_sensitive', False):
+            parts.append("<p><strong>Estado de datos sensibles</strong>: Se han encontrado coincidencias de datos sensibles</p>\n")
+
+        parts.append("<table>\n<thead><tr><th>Campo</th><th>Valor</th><th>Sensible</th><th>Patrón Coincidente</th></tr></thead>\n<tbody>\n")
+        for metadata_entry in file_info.get('metadata', []):
+            value = str(metadata_entry.get('value', '')).replace('\n', ' ')
+            # Convertir rutas absolutas a relativas si es necesario
+            if os.path.isabs(value) and os.path.exists(value):
+                value = os.path.relpath(value, self.reporter.main.src_path)
+            if len(value) > self.MAX_DISPLAY_LENGTH:
+                value = value[:self.MAX_DISPLAY_LENGTH - 3] + "..."
+
+            patterns = metadata_entry.get('matching_patterns', [])
+            if metadata_entry.get('is_sensitive', False):
+                status = '<td class="sensitive">Sensible/Yes</td>'
+            else:
+                status = '<td>No</td>'
+            patterns_str = html.escape(", ".join(patterns)) if patterns else "-"
+            parts.append(f"<tr><td>{html.escape(str(metadata_entry.get('key', '')))}</td>"
+                         f"<td>{html.escape(value)}</td>{status}<td>{patterns_str}</td></tr>\n")
+        parts.append("</tbody>\n</table>\n<hr>\n")
+        return "".join(parts)
+
+    def _trailer(self):
+        parts = ["""<h2>Recomendaciones de Seguridad</h2>
+<ol>
+<li><strong>Limpieza de Metadatos</strong>: Considere limpiar los metadatos de archivos antes de compartirlos, especialmente aquellos marcados como sensibles.</li>
+<li><strong>Revisión Manual</strong>: Verifique manualmente los archivos con datos sensibles para confirmar que la información identificada es realmente sensible.</li>
+<li><strong>Políticas de Seguridad</strong>: Implemente políticas para la verificación rutinaria de metadatos antes de publicar o compartir archivos.</li>
+<li><strong>Herramientas de Limpieza</strong>: Utilice la funcionalidad de limpieza de esta herramienta ejecutando el comando con la opción <code>--clean</code>.</li>
+</ol>
+<h2>Patrones de Detección de Información Sensible</h2>
+<p>A continuación se muestran los patrones utilizados por MetaInfo para identificar potencialmente información sensible en los metadatos.</p>
+"""]
+        in_details = False
+        for title, patterns, collapsed in self.reporter._pattern_groups():
+            if collapsed and not in_details:
+                parts.append("<details>\n<summary>Patrones en otros idiomas (Francés, Alemán, Italiano, Portugués)</summary>\n")
+            elif not collapsed and in_details:
+                parts.append("</details>\n")
+            in_details = collapsed
+            heading = "h4" if collapsed else "h3"
+            parts.append(f"<{heading}>{html.escape(title)}</{heading}>\n<p>"
+                         + ", ".join(f"<code>{html.escape(p)}</code>" for p in patterns) + "</p>\n")
+        if in_details:
+            parts.append("</details>\n")
+
+        parts.append(Templates.get_html_report_end(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        return "".join(parts)
@@ -1,13 +1,12 @@
 import os
-import datetime
-import sys
-import subprocess
-import exiftool
 
+from src.ExifToolPool import ExifToolPool
+from src.readers.NativeReader import NativeReader
 from src.Reporter import Reporter
 from src.Cleaner import Cleaner
 from src.SupportedExtensions import SupportedExtensions
-from src.SensitivePatterns import SensitivePatterns
+from src.PatternIndex import PatternIndex
+from src.PatternPacks import PatternPacks
 from src.Messages import Messages
 from src.ParameterValidator import ParameterValidator
 
@@ -47,14 +46,25 @@ class Main:
         
     def _initialize_components(self):
         """Inicializa los componentes especializados del sistema."""
+        # Un proceso exiftool persistente por proceso de trabajo (informes) o hilo de limpieza
+        self.exiftool_pool = ExifToolPool(size=self.args.get('workers') or 1, verbose=self.verbose)
+        self.native_enabled = self.args.get('native', False)
         self.reporter = Reporter(self)
         self.cleaner = Cleaner(self)
         
     def _setup_extensions_and_patterns(self):
         """Configura las extensiones soportadas y patrones sensibles."""
         self.extensions = SupportedExtensions.get_all_extensions()
-        self.sensitive_patterns = SensitivePatterns.get_all_patterns()
-        self.negative_patterns = SensitivePatterns.get_negative_patterns()
+        self.pattern_packs = PatternPacks(self.args.get('pattern_file'))
+        self.sensitive_patterns = self.pattern_packs.select(self.args.get('patterns'))
+        self.negative_patterns = self.pattern_packs.negative_patterns
+        self.pattern_index = PatternIndex(self.sensitive_patterns, self.negative_patterns,
+                                          max_value_length=max(1, int(self.args.get('max_value_length') or PatternIndex.MAX_VALUE_LENGTH)),
+                                          cache_dir=self.args.get('pattern_cache') or None)
+        Messages.print_debug(Messages.DEBUG_PATTERN_INDEX, len(self.sensitive_patterns),
+                             ", ".join(self.pattern_packs.selected),
+                             "cargado de la caché" if self.pattern_index.loaded_from_cache else "compilado",
+                             verbose=self.verbose)
 
     # ===== Métodos de Inspección y Análisis =====
     
@@ -68,13 +78,80 @@ class Main:
         Returns:
             dict: Metadatos del archivo
         """
+        native_metadata = self._inspect_native(fn)
+        if native_metadata is not None:
+            return native_metadata
+        return self._inspect_with_exiftool(fn)
+
+    def _inspect_with_exiftool(self, fn):
+        """Inspecciona un archivo con el pool de exiftool."""
         try:
-            with exiftool.ExifToolHelper() as et:
-                metadata = et.get_metadata(fn)
-                return metadata
+            return self.exiftool_pool.get_metadata(fn)
         except Exception as e:
             return {"error": str(e)}
-            
+
+    def inspect_batch(self, files):
+        """
+        Inspecciona un lote de archivos con una única petición a exiftool.
+
+        Con --native, los archivos con lector nativo se leen sin exiftool. Cada
+        resultado de exiftool se asocia a su archivo mediante el campo 'SourceFile'. Si la
+        petición del lote falla, o algún archivo no aparece en la respuesta, esos
+        archivos se inspeccionan de uno en uno para aislar el que provoca el error.
+
+        Args:
+            files: Lista de rutas a inspeccionar
+
+        Returns:
+            list: Metadatos de cada archivo (en el formato de inspect), en el mismo orden que files
+        """
+        batch_metadata = [self._inspect_native(fn) for fn in files]
+        pending = [fn for fn, metadata in zip(files, batch_metadata) if metadata is None]
+        if not pending:
+            return batch_metadata
+
+        exiftool_metadata = iter(self._inspect_batch_with_exiftool(pending))
+        return [metadata if metadata is not None else next(exiftool_metadata) for metadata in batch_metadata]
+
+    def _inspect_native(self, fn):
+        """
+        Lee los metadatos con un lector nativo si el modo --native está activo.
+
+        Returns:
+            list: Metadatos en el formato de inspect o None si hay que usar exiftool
+        """
+        if not self.native_enabled:
+            return None
+        metadata = NativeReader.read(fn)
+        return [metadata] if metadata is not None else None
+
+    def _inspect_batch_with_exiftool(self, files):
+        """Inspecciona un lote de archivos con exiftool, aislando los que fallan."""
+        if len(files) == 1:
+            return [self._inspect_with_exiftool(files[0])]
+
+        try:
+            results = self.exiftool_pool.get_metadata(files)
+        except Exception as e:
+            Messages.print_debug(f"DEBUG-Main - Fallo en la extracción por lotes, inspeccionando archivo a archivo: {str(e)}", verbose=self.verbose)
+            return [self._inspect_with_exiftool(fn) for fn in files]
+
+        by_source = {}
+        for data in results or []:
+            if hasattr(data, 'get'):
+                by_source[self._normalize_source_path(data.get('SourceFile', ''))] = data
+
+        batch_metadata = []
+        for fn in files:
+            data = by_source.get(self._normalize_source_path(fn))
+            batch_metadata.append([data] if data is not None else self._inspect_with_exiftool(fn))
+        return batch_metadata
+
+    @staticmethod
+    def _normalize_source_path(path):
+        """Normaliza una ruta para compararla con el campo 'SourceFile' de exiftool."""
+        return os.path.normpath(str(path).replace('\\', '/'))
+
     def report(self):
         """
         Genera un informe de metadatos para los archivos en el directorio especificado.
@@ -100,9 +177,24 @@ class Main:
         # Inicializar estructura para el informe
         metadata_info = self._initialize_metadata_info()
         
-        # Procesar el directorio y generar el informe
-        self.reporter._process_directory_for_report(self.src_path, metadata_info)
-        return self.reporter.generate_report(self.src_path, metadata_info)
+        # Procesar el directorio escribiendo cada archivo en los informes a medida que se clasifica
+        writers = self.reporter.open_report_writers()
+        
+        def add_file(file_info):
+            for writer in writers.values():
+                writer.add_file(file_info)
+        
+        try:
+            self.reporter._process_directory_for_report(self.src_path, metadata_info, on_file=add_file)
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+        finally:
+            self.exiftool_pool.close()
+        # En modo paralelo las estadísticas llegan agregadas desde los procesos secundarios
+        self._print_key_cache_stats(self.reporter.worker_cache_stats or self.pattern_index.cache_stats())
+        return self.reporter.generate_report(self.src_path, metadata_info, writers)
         
     
     def _initialize_metadata_info(self):
@@ -123,7 +215,24 @@ class Main:
         Returns:
             bool: True si se completó la limpieza correctamente, False en caso contrario
         """
-        return self.cleaner.clean_metadata(self.src_path)
+        try:
+            return self.cleaner.clean_metadata(self.src_path)
+        finally:
+            self.exiftool_pool.close()
+            self._print_key_cache_stats(self.pattern_index.cache_stats())
+
+    def _print_key_cache_stats(self, stats):
+        """
+        Muestra en modo verbose la tasa de aciertos de la caché de veredictos de clave.
+        
+        Args:
+            stats: Diccionario con 'hits', 'misses' y 'size' (ver PatternIndex.cache_stats)
+        """
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        if not lookups:
+            return
+        Messages.print_debug(Messages.DEBUG_KEY_CACHE, stats['hits'], stats['misses'],
+                             100.0 * stats['hits'] / lookups, stats.get('size', 0), verbose=self.verbose)
 
     # ===== Métodos de Información =====
         
@@ -132,8 +241,8 @@ class Main:
         print(SupportedExtensions.print_extensions_by_type())
         
     def show_sensitive_patterns(self):
-        """Muestra los patrones sensibles agrupados por idioma."""
-        print(SensitivePatterns.print_patterns_by_language())
+        """Muestra los patrones sensibles de los paquetes seleccionados (--patterns, --pattern_file)."""
+        print(self.pattern_packs.print_selected_packs())
         
     def print_version(self):
         """Muestra la versión de la aplicación."""
@@ -0,0 +1,20 @@
+from src.ReportWriter import ReportWriter
+
+
+class MarkdownReportWriter(ReportWriter):
+    """
+    Escritor incremental del informe Markdown.
+
+    El contenido de cada parte lo genera Reporter (_markdown_header,
+    _markdown_file_section y _markdown_trailer), de modo que el informe escrito
+    de forma incremental es idéntico al generado en memoria.
+    """
+
+    def _header(self, src_path, metadata_info):
+        return self.reporter._markdown_header(src_path, metadata_info)
+
+    def _section(self, file_info):
+        return self.reporter._markdown_file_section(file_info)
+
+    def _trailer(self):
+        return self.reporter._markdown_trailer()
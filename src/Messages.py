@@ -3,8 +3,15 @@ Clase para centralizar todos los mensajes al usuario.
 Facilita el mantenimiento y la consistencia de la interfaz.
 """
 
+import sys
+import threading
+import traceback
+
 class Messages:
 
+    # Buffer de mensajes por hilo, usado para ordenar la salida de tareas paralelas
+    _capture = threading.local()
+
     ERROR_NO_INPUT_PATH = "Error: No se ha especificado la ruta de entrada. Use --i ruta_archivo"
 
     WARNING_NO_ACTION = "ADVERTENCIA: No se ha especificado ninguna acción. Use --report, --wipe o --version"
@@ -16,68 +23,41 @@ class Messages:
     
     # Mensajes relacionados con dependencias
     ERROR_MISSING_YAML = """ERROR: La biblioteca 'pyyaml' es requerida pero no está instalada.
-Por favor, instálela ejecutando: pip install pypandoc"""
-    
-    ERROR_MISSING_PANDOC = """ERROR: Pandoc no está instalado o no se encuentra en el PATH.
-Por favor, instale Pandoc desde https://pandoc.org/installing.html
-La generación de PDF ha sido desactivada."""
-    
-    WARNING_MISSING_PYPANDOC = """ADVERTENCIA: pypandoc no está instalado. No se podrán generar PDFs.
-Instale con: pip install pypandoc"""
+Por favor, instálela ejecutando: pip install pyyaml"""
     
-    ERROR_PYPANDOC_NOT_AVAILABLE = """Error: pypandoc no está disponible.
-Por favor, instale pypandoc: pip install pypandoc"""
+    ERROR_PATTERN_FILE = "ERROR: No se pudo cargar el archivo de patrones {0}: {1}"
+    ERROR_UNKNOWN_PATTERN_PACK = "ERROR: Paquete de patrones desconocido: {0}. Paquetes disponibles: {1}"
     
-    ERROR_MARKDOWN_NOT_EXISTS = "Error: No se puede generar PDF/HTML, el archivo Markdown no existe."
+    WARNING_MISSING_REPORTLAB = """ADVERTENCIA: reportlab no está instalado. No se podrán generar PDFs.
+Instale con: pip install reportlab"""
     
-    # Mensajes relacionados con la generación de informes
-    ERROR_PDF_GENERATION = """ADVERTENCIA: Se generó el informe en Markdown pero falló la conversión a PDF.
-Puede encontrar el informe en Markdown en: {0}
-Puede visualizar el informe en HTML en: {1}
-El formato HTML siempre está disponible como alternativa al PDF."""
+    WARNING_PDF_FONT = "ADVERTENCIA: No se pudo cargar la fuente {0} para el PDF: {1}"
     
-    ERROR_FONT_NOT_FOUND = """ERROR: No se pudo generar el PDF debido a un problema con las fuentes.
-Se ha modificado la configuración para usar fuentes estándar.
-Intente ejecutar nuevamente el comando."""
+    WARNING_PDF_NO_UNICODE_FONT = """ADVERTENCIA: No se encontró una fuente Unicode para el PDF y algunos valores
+contienen caracteres que no se mostrarán correctamente. Indique una fuente TrueType con --pdf_font"""
     
-    ERROR_PDF_CONVERSION_FAILED = """ERROR: Todos los métodos de conversión a PDF han fallado.
-Razones comunes:
-1. Problemas con las fuentes instaladas
-2. LaTeX no está correctamente configurado
-3. Contenido no compatible en el informe
-Revise el mensaje de error detallado para más información."""
+    WARNING_MISSING_PYARROW = """ADVERTENCIA: pyarrow no está instalado. No se podrá exportar a Parquet.
+Instale con: pip install pyarrow"""
     
     ERROR_EXIFTOOL = "exiftool no está disponible. La funcionalidad será limitada."
     
-    # Mensajes relacionados con LaTeX
-    LATEX_RECOMMENDATIONS = """
-Recomendaciones para solucionar el problema:
- 1. Instale Pandoc desde https://pandoc.org/installing.html
- 2. Instale una distribución completa de LaTeX con soporte Unicode:
-    - En Ubuntu/Debian: sudo apt install texlive-xetex texlive-fonts-recommended texlive-lang-spanish
-    - Para una instalación completa: sudo apt install texlive-full
-    - En Fedora/RHEL: sudo dnf install texlive-xetex texlive-collection-fontsrecommended texlive-collection-langspanish
-    - En Windows/Mac: Instale TeX Live o MiKTeX desde https://www.latex-project.org/get/
- 3. Asegúrese de que ambos estén en su PATH del sistema
- 4. Para conversiones simples, puede usar el HTML generado con --html como alternativa"""
-    
     # Mensajes informativos
     INFO_REPORT_FORMATS = """
 NOTA SOBRE FORMATOS DE SALIDA:
 - Siempre se genera un archivo Markdown (.md) como formato base.
 - Si se especifica --html, se genera un archivo HTML para visualización en navegadores.
-- Si se especifica --pdf, se intentará generar un PDF (requiere Pandoc y XeLaTeX/LaTeX instalados).
-  - XeLaTeX es preferido para mejor soporte de caracteres Unicode.
-  - Instale los paquetes necesarios con: sudo apt install texlive-xetex texlive-fonts-recommended
+- Si se especifica --pdf, se genera un PDF con reportlab (pip install reportlab).
+- Si se especifica --ndjson (o --json), se genera un archivo NDJSON con un objeto JSON por archivo y un
+  resumen final, pensado para SIEM y scripts; con --gzip se comprime (.ndjson.gz).
+- Si se especifica --parquet, se exporta un campo por fila en formato Parquet para pandas/duckdb
+  (requiere pyarrow).
 - Si la generación de PDF falla, siempre puede usar el formato HTML como alternativa."""
     
     INFO_MD_GENERATED = "Reporte Markdown generado: {0}"
     INFO_HTML_GENERATED = "Reporte HTML generado: {0}"
     INFO_PDF_GENERATED = "Reporte PDF generado: {0}"
     
-    INFO_HTML_ALTERNATIVE = "Se ha generado un HTML como alternativa al PDF: {0}"
-    INFO_TRYING_ALTERNATIVE = "Intentando método alternativo para generar PDF..."
-    INFO_SUCCESSFUL_CONVERSION = "Conversión a PDF exitosa utilizando método alternativo."
+    INFO_HTML_ALTERNATIVE = "No se pudo generar el PDF; puede consultar el informe HTML como alternativa: {0}"
     
     # Mensajes de depuración
     DEBUG_PDF_ENABLED = "DEBUG - PDF habilitado: {0}"
@@ -85,14 +65,66 @@ NOTA SOBRE FORMATOS DE SALIDA:
     DEBUG_ARGS_SETUP = "DEBUG: Valores iniciales: PDF={0}, HTML={1}"
     DEBUG_MAIN_INIT = "DEBUG-Main-init - Inicializado args con valores por defecto"
     DEBUG_READING_FILE = "Leyendo {0} ..."
-    DEBUG_CONVERSION_STARTED = "Iniciando conversión a PDF con pypandoc..."
-    DEBUG_USING_SIMPLIFIED_OPTIONS = "Utilizando opciones simplificadas para evitar problemas con fuentes"
+    DEBUG_PATTERN_INDEX = "DEBUG - Índice de patrones: {0} patrones de los paquetes {1} ({2})"
+    DEBUG_KEY_CACHE = "DEBUG - Caché de claves: {0} aciertos, {1} fallos ({2:.1f}% de aciertos), {3} claves distintas"
     
     # Mensajes relacionados con PDF
-    ERROR_PYPANDOC_MISSING = "Error: pypandoc no está disponible."
     INFO_MARKDOWN_GENERATED = "Reporte Markdown generado: {0}"
     INFO_HTML_GENERATED = "Reporte HTML generado: {0}"
     INFO_PDF_GENERATED = "Reporte PDF generado: {0}" 
+    INFO_NDJSON_GENERATED = "Reporte NDJSON generado: {0}"
+    INFO_PARQUET_GENERATED = "Exportación Parquet generada: {0}"
+    INFO_STORE_SAVED = "Resultados guardados como ejecución {0} en: {1}"
+    ERROR_STORE_NOT_FOUND = "Error: No existe la base de datos de resultados {0}. Genere un informe con --store primero"
+    ERROR_STORE_NO_RUNS = "Error: La base de datos {0} no contiene ejecuciones completadas"
+    
+    @staticmethod
+    def start_capture():
+        """
+        Empieza a acumular los mensajes del hilo actual en lugar de imprimirlos.
+        """
+        Messages._capture.lines = []
+    
+    @staticmethod
+    def stop_capture():
+        """
+        Deja de acumular los mensajes del hilo actual.
+        
+        Returns:
+            list: Mensajes acumulados desde la llamada a start_capture
+        """
+        lines = getattr(Messages._capture, 'lines', None)
+        Messages._capture.lines = None
+        return lines or []
+    
+    @staticmethod
+    def _output(text):
+        """
+        Imprime un mensaje o lo acumula si el hilo actual está capturando la salida.
+        
+        Args:
+            text: Texto ya formateado
+        """
+        lines = getattr(Messages._capture, 'lines', None)
+        if lines is None:
+            print(text)
+        else:
+            lines.append(text)
+    
+    @staticmethod
+    def print_traceback():
+        """
+        Imprime la traza de la excepción que se está tratando.
+        
+        Si el hilo actual está capturando la salida, la traza se acumula junto al
+        resto de sus mensajes para mantener el orden; si no, se escribe en stderr.
+        """
+        text = traceback.format_exc().rstrip("\n")
+        lines = getattr(Messages._capture, 'lines', None)
+        if lines is None:
+            print(text, file=sys.stderr)
+        else:
+            lines.append(text)
     
     @staticmethod
     def print_error(message, *args):
@@ -104,9 +136,9 @@ NOTA SOBRE FORMATOS DE SALIDA:
             *args: Argumentos para formatear el mensaje
         """
         if args:
-            print(message.format(*args))
+            Messages._output(message.format(*args))
         else:
-            print(message)
+            Messages._output(message)
     
     @staticmethod
     def print_info(message, *args):
@@ -118,9 +150,9 @@ NOTA SOBRE FORMATOS DE SALIDA:
             *args: Argumentos para formatear el mensaje
         """
         if args:
-            print(message.format(*args))
+            Messages._output(message.format(*args))
         else:
-            print(message)
+            Messages._output(message)
     
     @staticmethod
     def print_debug(message, *args, verbose=False):
@@ -137,9 +169,9 @@ NOTA SOBRE FORMATOS DE SALIDA:
             return
             
         if args:
-            print(message.format(*args))
+            Messages._output(message.format(*args))
         else:
-            print(message)
+            Messages._output(message)
 
     def print_warning(message, *args, verbose=False):
         """
@@ -154,6 +186,6 @@ NOTA SOBRE FORMATOS DE SALIDA:
             return
             
         if args:
-            print(message.format(*args))
+            Messages._output(message.format(*args))
         else:
-            print(message)
+            Messages._output(message)
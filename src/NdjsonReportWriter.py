@@ -0,0 +1,115 @@
+import datetime
+import gzip
+import io
+import json
+import os
+
+from src.ReportWriter import ReportWriter
+
+
+class NdjsonReportWriter(ReportWriter):
+    """
+    Escritor del informe NDJSON para consumo automático (SIEM, scripts).
+
+    A diferencia de los informes de lectura, no hay cabecera que dependa de los
+    totales: cada archivo se escribe como un objeto JSON por línea directamente
+    en el informe final en cuanto se clasifica, y al cerrar se añade un último
+    objeto de resumen con los contadores y extensions_stats. La escritura pasa
+    por un búfer y, opcionalmente, se comprime con gzip al vuelo.
+
+    Cada línea tiene un campo 'type': 'file' para los archivos y 'summary' para
+    el resumen final.
+    """
+
+    # Nivel de compresión gzip: el 9 por defecto es mucho más lento y apenas reduce más
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, reporter, path, compress=False):
+        """
+        Inicializa el escritor.
+
+        Args:
+            reporter: Instancia de Reporter que generó el análisis
+            path: Ruta del informe final (se añade '.gz' si se comprime)
+            compress: True para comprimir la salida con gzip
+        """
+        super().__init__(reporter, path + ".gz" if compress else path)
+        self.compress = compress
+        self._out = None
+
+    def add_file(self, file_info):
+        """
+        Escribe el objeto JSON de un archivo clasificado.
+
+        Args:
+            file_info: Información del archivo (ver Reporter._add_file_to_report)
+        """
+        self._open().write(self._section(file_info))
+
+    def close(self, src_path, metadata_info):
+        """
+        Escribe el objeto de resumen y cierra el informe.
+
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con los contadores y estadísticas del análisis
+
+        Returns:
+            str: Ruta al informe generado
+        """
+        out = self._open()
+        try:
+            out.write(self._summary(src_path, metadata_info))
+        finally:
+            out.close()
+            self._out = None
+        return self.path
+
+    def abort(self):
+        """Descarta el informe a medio escribir."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _open(self):
+        """Abre el informe con la primera escritura, con búfer y compresión opcional."""
+        if self._out is None:
+            if self.compress:
+                raw = gzip.GzipFile(self.path, 'wb', compresslevel=self.COMPRESS_LEVEL)
+                self._out = io.TextIOWrapper(io.BufferedWriter(raw, self.BUFFER_SIZE), encoding='utf-8')
+            else:
+                self._out = open(self.path, 'w', encoding='utf-8', buffering=self.BUFFER_SIZE)
+        return self._out
+
+    def _section(self, file_info):
+        file_path = file_info.get('file_path', '')
+        record = {
+            'type': 'file',
+            'file_path': file_path,
+            'extension': os.path.splitext(file_path)[1].lower(),
+            'total_metadata': file_info.get('total_metadata', 0),
+            'has_sensitive': file_info.get('has_sensitive', False),
+            'metadata': file_info.get('metadata', []),
+        }
+        return self._dumps(record)
+
+    def _summary(self, src_path, metadata_info):
+        """Objeto final con los contadores del análisis."""
+        record = {
+            'type': 'summary',
+            'directory': os.path.abspath(src_path),
+            'date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'only_sensitive': bool(self.reporter.args.get('only_sensitive', False)),
+            'total_files': metadata_info.get('total_files', 0),
+            'files_with_metadata': metadata_info.get('files_with_metadata', 0),
+            'files_with_sensitive': metadata_info.get('files_with_sensitive', 0),
+            'extensions_stats': metadata_info.get('extensions_stats', {}),
+        }
+        return self._dumps(record)
+
+    @staticmethod
+    def _dumps(record):
+        """Serializa un objeto en una línea JSON compacta; los valores no serializables se convierten a texto."""
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + "\n"
@@ -0,0 +1,121 @@
+import functools
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.ReportWriter import ReportWriter
+from src.ResultStore import ResultStore
+
+
+# Las claves se repiten en casi todos los archivos: se separan una sola vez
+_split_key = functools.lru_cache(maxsize=8192)(ResultStore.split_key)
+
+
+class ParquetReportWriter(ReportWriter):
+    """
+    Exportación columnar de los campos de metadatos en formato Parquet.
+
+    Cada campo clasificado es una fila (ruta, extensión, grupo, etiqueta, valor,
+    sensible, patrones). Las filas se acumulan por columnas y se escriben como
+    un grupo de filas (row group) cada ROW_GROUP_SIZE filas mientras continúa el
+    análisis, de modo que la memoria no depende del número de campos. Las
+    columnas de ruta, extensión, grupo y etiqueta usan el tipo dictionary de
+    Arrow (categorías en pandas) y todas las columnas se guardan con
+    codificación de diccionario, así que las etiquetas y valores repetidos
+    apenas ocupan espacio.
+    """
+
+    # Filas de cada grupo de filas
+    ROW_GROUP_SIZE = 128 * 1024
+
+    CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+    SCHEMA = pa.schema([
+        ('path', CATEGORY),
+        ('extension', CATEGORY),
+        ('group', CATEGORY),
+        ('tag', CATEGORY),
+        ('value', pa.string()),
+        ('sensitive', pa.bool_()),
+        ('patterns', pa.list_(pa.string())),
+    ])
+
+    def __init__(self, reporter, path):
+        super().__init__(reporter, path)
+        self._writer = None
+        self._columns = {name: [] for name in self.SCHEMA.names}
+
+    def add_file(self, file_info):
+        """
+        Añade una fila por cada campo de metadatos de un archivo clasificado.
+
+        Args:
+            file_info: Información del archivo (ver Reporter._add_file_to_report)
+        """
+        entries = file_info.get('metadata', [])
+        if not entries:
+            return
+        file_path = file_info.get('file_path', '')
+        count = len(entries)
+        keys = [_split_key(entry.get('key', '')) for entry in entries]
+
+        # Las columnas se amplían por archivo: la ruta y la extensión se repiten en cada campo
+        columns = self._columns
+        columns['path'].extend([file_path] * count)
+        columns['extension'].extend([os.path.splitext(file_path)[1].lower()] * count)
+        columns['group'].extend(group for group, _ in keys)
+        columns['tag'].extend(tag for _, tag in keys)
+        columns['value'].extend(None if value is None else str(value)
+                                for value in (entry.get('value') for entry in entries))
+        columns['sensitive'].extend(bool(entry.get('is_sensitive', False)) for entry in entries)
+        columns['patterns'].extend(list(entry.get('matching_patterns', [])) for entry in entries)
+        if len(columns['path']) >= self.ROW_GROUP_SIZE:
+            self._write_row_group()
+
+    def close(self, src_path, metadata_info):
+        """
+        Escribe el último grupo de filas y cierra el archivo.
+
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con los contadores del análisis
+
+        Returns:
+            str: Ruta del archivo Parquet
+        """
+        try:
+            if self._columns['path'] or self._writer is None:
+                self._write_row_group()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        return self.path
+
+    def abort(self):
+        """Descarta la exportación a medio escribir."""
+        self._columns = {name: [] for name in self.SCHEMA.names}
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _write_row_group(self):
+        """Convierte las filas acumuladas en un grupo de filas y las escribe."""
+        columns = self._columns
+        arrays = [
+            pa.array(columns['path'], type=pa.string()).dictionary_encode(),
+            pa.array(columns['extension'], type=pa.string()).dictionary_encode(),
+            pa.array(columns['group'], type=pa.string()).dictionary_encode(),
+            pa.array(columns['tag'], type=pa.string()).dictionary_encode(),
+            pa.array(columns['value'], type=pa.string()),
+            pa.array(columns['sensitive'], type=pa.bool_()),
+            pa.array(columns['patterns'], type=pa.list_(pa.string())),
+        ]
+        table = pa.Table.from_arrays(arrays, schema=self.SCHEMA)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.SCHEMA, use_dictionary=True)
+        self._writer.write_table(table, row_group_size=self.ROW_GROUP_SIZE)
+        self._columns = {name: [] for name in self.SCHEMA.names}
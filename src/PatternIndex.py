@@ -0,0 +1,420 @@
+import hashlib
+import marshal
+import os
+import re
+import tempfile
+from collections import deque, namedtuple
+from functools import lru_cache
+
+from src.ValueDetectors import ValueDetectors
+
+
+# Veredicto cacheado de una clave: excluida por un patrón negativo, forma
+# normalizada y patrones sensibles que ya coinciden en la propia clave
+KeyVerdict = namedtuple('KeyVerdict', 'negative key_str hits')
+
+# Clasificación de un valor: patrones encontrados como subcadena, patrones cortos
+# que coinciden de forma exacta y nombres de los detectores de valor que coinciden
+ValueVerdict = namedtuple('ValueVerdict', 'hits exact detected')
+
+
+class PatternIndex:
+    """
+    Índice precompilado de patrones sensibles y negativos.
+
+    Los patrones se normalizan una sola vez (minúsculas y sin espacios). Los de
+    3 caracteres o menos se comparan por igualdad exacta contra un frozenset y
+    el resto se buscan como subcadenas con un autómata Aho-Corasick, de modo que
+    la clave y el valor de cada metadato se recorren una única vez sea cual sea
+    el número de patrones. Los valores de texto pasan además por los detectores
+    de ValueDetectors, cuyas coincidencias se añaden como 'valor:*'.
+
+    Con cache_dir, el autómata compilado se guarda en disco con una clave que
+    depende de los patrones, y las ejecuciones siguientes con los mismos
+    paquetes lo cargan sin volver a compilarlo. La caché solo contiene listas,
+    diccionarios, textos y enteros (marshal, sin objetos que ejecuten código al
+    cargarse), y se ignora si el archivo pertenece a otro usuario, si otros
+    pueden modificarlo o si sus datos no son coherentes.
+    """
+
+    # Longitud máxima de los patrones que se comparan por igualdad exacta
+    EXACT_MATCH_LENGTH = 3
+
+    # Número máximo de claves distintas cuyo veredicto se guarda en caché
+    KEY_CACHE_SIZE = 4096
+
+    # Número máximo de caracteres de un valor que se analizan
+    MAX_VALUE_LENGTH = 4096
+
+    # Prefijos con los que exiftool representa los datos binarios
+    BINARY_PREFIXES = ("(Binary data ", "base64:")
+
+    # Caracteres de control que no aparecen en texto (se admiten tabulador y saltos de línea)
+    CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+    # Caracteres iniciales que se inspeccionan para decidir si un texto es binario
+    BINARY_SAMPLE_SIZE = 512
+
+    # Versión del formato de la caché en disco; se incluye en la clave de cada entrada
+    CACHE_FORMAT = 2
+
+    def __init__(self, sensitive_patterns, negative_patterns, key_cache_size=KEY_CACHE_SIZE,
+                 max_value_length=MAX_VALUE_LENGTH, cache_dir=None):
+        """
+        Construye el índice a partir de las listas de patrones.
+
+        Args:
+            sensitive_patterns: Lista de patrones sensibles (en el orden en que se informan)
+            negative_patterns: Lista de patrones negativos, que excluyen una clave
+            key_cache_size: Número máximo de veredictos de clave en la caché LRU
+            max_value_length: Número máximo de caracteres analizados de cada valor
+            cache_dir: Carpeta de la caché del índice compilado (None para no usarla)
+        """
+        self.sensitive_patterns = list(sensitive_patterns)
+        self.negative_patterns = list(negative_patterns)
+        self.max_value_length = max_value_length
+
+        self._index_patterns()
+        automaton = self._load_automaton(cache_dir) if cache_dir else None
+        self.loaded_from_cache = automaton is not None
+        if automaton is None:
+            automaton = self._build_automaton(self._normalized)
+            if cache_dir:
+                self._save_automaton(cache_dir, automaton)
+        self._transitions, self._outputs = automaton
+
+        # Las claves se repiten en todos los archivos: su parte de la clasificación se memoriza
+        self._key_verdict = lru_cache(maxsize=key_cache_size)(self._classify_key)
+
+    def _index_patterns(self):
+        """Normaliza los patrones y los separa en exactos y de subcadena."""
+        # Patrones normalizados distintos; cada uno se identifica por su posición
+        self._normalized = []
+        self._ids = {}
+
+        def pattern_id(pattern):
+            normalized = self.normalize(pattern)
+            if normalized not in self._ids:
+                self._ids[normalized] = len(self._normalized)
+                self._normalized.append(normalized)
+            return self._ids[normalized]
+
+        # Posiciones de la lista original que corresponden a cada patrón normalizado
+        self._positions = {}
+        for position, pattern in enumerate(self.sensitive_patterns):
+            self._positions.setdefault(pattern_id(pattern), []).append(position)
+
+        self._sensitive_ids = frozenset(self._positions)
+        self._negative_ids = frozenset(pattern_id(p) for p in self.negative_patterns)
+        self._substring_ids = frozenset(i for i in self._sensitive_ids
+                                        if len(self._normalized[i]) > self.EXACT_MATCH_LENGTH)
+        self.exact_patterns = frozenset(self._normalized[i] for i in self._sensitive_ids
+                                        if len(self._normalized[i]) <= self.EXACT_MATCH_LENGTH)
+
+    def cache_key(self):
+        """
+        Calcula la clave de caché del índice a partir de los patrones.
+
+        Returns:
+            str: Resumen SHA-256 de los patrones sensibles y negativos y del formato
+        """
+        digest = hashlib.sha256()
+        digest.update(repr((self.CACHE_FORMAT, marshal.version, self.EXACT_MATCH_LENGTH,
+                            self.sensitive_patterns, self.negative_patterns)).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _cache_path(self, cache_dir):
+        """Ruta del archivo de caché de este conjunto de patrones."""
+        return os.path.join(cache_dir, f"patterns-{self.cache_key()}.marshal")
+
+    def _load_automaton(self, cache_dir):
+        """Carga el autómata de la caché, o None si no existe, no es válido o no es de confianza."""
+        try:
+            with open(self._cache_path(cache_dir), 'rb') as f:
+                if not self._trusted_cache_file(os.fstat(f.fileno())):
+                    return None
+                data = marshal.loads(f.read())
+            return self._automaton_from_data(data)
+        except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    @staticmethod
+    def _trusted_cache_file(stat):
+        """Indica si un archivo de caché es del usuario actual y no pueden modificarlo otros usuarios."""
+        if hasattr(os, 'getuid') and stat.st_uid != os.getuid():
+            return False
+        return not stat.st_mode & 0o022
+
+    def _automaton_from_data(self, data):
+        """
+        Reconstruye el autómata a partir de los datos de la caché, comprobando que es coherente.
+
+        Raises:
+            ValueError: Si los patrones no coinciden o algún estado está fuera de rango
+        """
+        if not isinstance(data, dict) or data['patterns'] != self._normalized:
+            raise ValueError("la caché no corresponde a los patrones")
+        transitions = data['transitions']
+        outputs = data['outputs']
+        states = len(transitions)
+        if not isinstance(transitions, list) or not isinstance(outputs, list) or len(outputs) != states:
+            raise ValueError("número de estados incoherente")
+        highest_state = max((max(row.values(), default=0) for row in transitions), default=0)
+        lowest_state = min((min(row.values(), default=0) for row in transitions), default=0)
+        highest_id = max((max(row, default=0) for row in outputs), default=0)
+        lowest_id = min((min(row, default=0) for row in outputs), default=0)
+        if lowest_state < 0 or highest_state >= states or lowest_id < 0 or highest_id >= len(self._normalized):
+            raise ValueError("estado o patrón fuera de rango")
+        return transitions, [frozenset(row) for row in outputs]
+
+    def _save_automaton(self, cache_dir, automaton):
+        """Guarda el autómata en la caché; los errores de escritura se ignoran."""
+        transitions, outputs = automaton
+        data = {'patterns': self._normalized, 'transitions': transitions,
+                'outputs': [sorted(row) for row in outputs]}
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            # Escritura atómica: varios procesos pueden crear la misma entrada a la vez
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    marshal.dump(data, f)
+                os.replace(temp_path, self._cache_path(cache_dir))
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError:
+            pass
+
+    @staticmethod
+    def normalize(text):
+        """
+        Normaliza un texto para la comparación (minúsculas y sin espacios).
+
+        Args:
+            text: Texto o valor a normalizar
+
+        Returns:
+            str: Texto normalizado
+        """
+        return str(text).lower().replace(' ', '')
+
+    @classmethod
+    def is_binary_value(cls, value):
+        """
+        Indica si un valor es un dato binario (miniaturas, perfiles ICC, vistas previas).
+
+        Args:
+            value: Valor del metadato
+
+        Returns:
+            bool: True para bytes, marcadores binarios de exiftool y textos con caracteres de control
+        """
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return True
+        if not isinstance(value, str):
+            return False
+        if value.startswith(cls.BINARY_PREFIXES):
+            return True
+        sample = value[:cls.BINARY_SAMPLE_SIZE]
+        control_chars = len(cls.CONTROL_CHARS_RE.findall(sample))
+        return '\x00' in sample or control_chars > len(sample) // 10
+
+    def value_texts(self, val):
+        """
+        Obtiene los textos normalizados que se analizan de un valor.
+
+        Las listas se analizan elemento a elemento, los datos binarios se omiten y
+        los textos más largos que max_value_length se recortan.
+
+        Args:
+            val: Valor del metadato
+
+        Returns:
+            list: Textos normalizados
+        """
+        return [self.normalize(text) for text, _ in self._bounded_items(val)]
+
+    def _bounded_items(self, val):
+        """Obtiene (texto recortado, es_cadena) de cada elemento no binario de un valor."""
+        items = val if isinstance(val, (list, tuple)) else [val]
+        bounded = []
+        for item in items:
+            if isinstance(item, (list, tuple)):
+                bounded.extend(self._bounded_items(item))
+            elif not self.is_binary_value(item):
+                is_text = isinstance(item, str)
+                text = item if is_text else str(item)
+                bounded.append((text[:self.max_value_length], is_text))
+        return bounded
+
+    def check(self, key, val):
+        """
+        Verifica si una clave o valor contiene datos sensibles.
+
+        Args:
+            key: Clave del metadato
+            val: Valor del metadato
+
+        Returns:
+            tuple: (es_sensible, patrones_coincidentes), con los patrones en el
+                   mismo orden que la lista de patrones sensibles
+        """
+        verdict = self._key_verdict(key)
+        if verdict.negative:
+            return False, []
+        return self._combine(verdict, self._classify_value(val))
+
+    def check_batch(self, keys, values):
+        """
+        Verifica en bloque columnas de claves y valores (por ejemplo, todo un lote de exiftool).
+
+        Las claves y los valores se deduplican: cada clave y cada valor distinto se
+        clasifica una sola vez y los veredictos se reparten después a cada par.
+
+        Args:
+            keys: Secuencia de claves de los metadatos
+            values: Secuencia de valores, alineada con keys
+
+        Returns:
+            list: Tupla (es_sensible, patrones_coincidentes) de cada par, en el mismo orden
+        """
+        key_verdicts = {}
+        value_verdicts = {}
+        results = []
+        for key, val in zip(keys, values):
+            verdict = key_verdicts.get(key)
+            if verdict is None:
+                verdict = key_verdicts[key] = self._key_verdict(key)
+            if verdict.negative:
+                results.append((False, []))
+                continue
+
+            value_id = self._value_id(val)
+            if value_id is None:
+                value_verdict = self._classify_value(val)
+            else:
+                value_verdict = value_verdicts.get(value_id)
+                if value_verdict is None:
+                    value_verdict = value_verdicts[value_id] = self._classify_value(val)
+            results.append(self._combine(verdict, value_verdict))
+        return results
+
+    def cache_stats(self):
+        """
+        Obtiene las estadísticas de la caché de veredictos de clave.
+
+        Returns:
+            dict: Aciertos ('hits'), fallos ('misses'), entradas ('size') y capacidad ('maxsize')
+        """
+        info = self._key_verdict.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+    def _classify_value(self, val):
+        """Clasifica la parte del valor: patrones, coincidencias exactas y detectores."""
+        bounded = self._bounded_items(val)
+        hits = set()
+        exact = set()
+        found = set()
+        for text, is_text in bounded:
+            val_str = self.normalize(text)
+            hits |= self._scan(val_str)
+            if val_str in self.exact_patterns:
+                exact.add(self._ids[val_str])
+            # Los detectores de valor solo se aplican a textos (no a números)
+            if is_text:
+                found.update(ValueDetectors.detect(text))
+        detected = tuple(label for label in ValueDetectors.DETECTORS.values() if label in found)
+        return ValueVerdict(frozenset(hits), frozenset(exact), detected)
+
+    def _combine(self, verdict, value_verdict):
+        """Combina los veredictos de clave y valor en el resultado de check."""
+        # Hacer una excepción para la clave 'author' si el valor no contiene ningún patrón
+        if (verdict.key_str == 'author' and not (value_verdict.hits & self._sensitive_ids)
+                and not value_verdict.detected):
+            return False, []
+
+        matched = (value_verdict.hits & self._substring_ids) | value_verdict.exact | verdict.hits
+        if not matched and not value_verdict.detected:
+            return False, []
+
+        positions = sorted(position for i in matched for position in self._positions[i])
+        return True, [self.sensitive_patterns[position] for position in positions] + list(value_verdict.detected)
+
+    @classmethod
+    def _value_id(cls, val):
+        """Obtiene una clave hashable para deduplicar un valor, o None si no se puede."""
+        if isinstance(val, (list, tuple)):
+            items = tuple(cls._value_id(item) for item in val)
+            return None if None in items else (list, items)
+        try:
+            hash(val)
+        except (TypeError, ValueError):
+            return None
+        # El tipo distingue valores iguales con distinto texto (True, 1 y 1.0)
+        return type(val), val
+
+    def _classify_key(self, key):
+        """Clasifica la parte de la clave: negativa o patrones sensibles que ya coinciden en ella."""
+        key_str = self.normalize(key)
+        key_hits = self._scan(key_str)
+        if key_hits & self._negative_ids:
+            return KeyVerdict(True, key_str, frozenset())
+
+        hits = key_hits & self._substring_ids
+        if key_str in self.exact_patterns:
+            hits.add(self._ids[key_str])
+        return KeyVerdict(False, key_str, frozenset(hits))
+
+    def _scan(self, text):
+        """Recorre el texto una vez con el autómata y devuelve los patrones encontrados como subcadena."""
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        hits = set()
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return hits
+
+    @staticmethod
+    def _build_automaton(patterns):
+        """
+        Construye el autómata Aho-Corasick con las transiciones de fallo ya resueltas.
+
+        Args:
+            patterns: Lista de patrones normalizados
+
+        Returns:
+            tuple: (transiciones por estado, patrones reconocidos en cada estado)
+        """
+        transitions = [{}]
+        outputs = [set()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                if char not in transitions[state]:
+                    transitions.append({})
+                    outputs.append(set())
+                    transitions[state][char] = len(transitions) - 1
+                state = transitions[state][char]
+            outputs[state].add(pattern_id)
+
+        # Recorrido en anchura: cada estado hereda las transiciones y salidas de su estado de fallo
+        fail = [0] * len(transitions)
+        goto = [dict(t) for t in transitions]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                fallback = transitions[fail[state]].get(char, 0) if state else 0
+                fail[child] = fallback if fallback != child else 0
+                outputs[child] |= outputs[fail[child]]
+            transitions[state] = dict(transitions[fail[state]], **goto[state]) if state else goto[state]
+
+        return transitions, [frozenset(o) for o in outputs]
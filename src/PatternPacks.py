@@ -0,0 +1,132 @@
+from src.Messages import Messages
+from src.SensitivePatterns import SensitivePatterns
+
+
+class PatternPacks:
+    """
+    Paquetes de patrones sensibles seleccionables en cada ejecución.
+
+    Los paquetes incluidos son las listas por idioma de SensitivePatterns y los
+    metadatos de dispositivos. Se pueden añadir paquetes desde archivos YAML en
+    los que cada clave es el nombre de un paquete y su valor la lista de
+    patrones; la clave 'negative' añade patrones negativos:
+
+        medical:
+          - patient
+          - diagnosis
+        negative:
+          - patientcount
+    """
+
+    # Paquetes incluidos, en el orden en que se combinan
+    BUILTIN = ("spanish", "english", "french", "german", "italian", "portuguese", "device")
+
+    # Títulos con los que se listan los paquetes incluidos
+    TITLES = {
+        "spanish": "ESPAÑOL",
+        "english": "INGLÉS",
+        "french": "FRANCÉS",
+        "german": "ALEMÁN",
+        "italian": "ITALIANO",
+        "portuguese": "PORTUGUÉS",
+        "device": "METADATOS DE DISPOSITIVOS",
+    }
+
+    # Clave de los archivos YAML con patrones negativos adicionales
+    NEGATIVE_KEY = "negative"
+
+    def __init__(self, pattern_files=None):
+        """
+        Carga los paquetes incluidos y los de los archivos indicados.
+
+        Args:
+            pattern_files: Lista de rutas a archivos YAML de paquetes (opcional)
+        """
+        self.packs = {name: list(SensitivePatterns.get_patterns_by_language(name)) for name in self.BUILTIN}
+        self.negative_patterns = list(SensitivePatterns.get_negative_patterns())
+        self.selected = list(self.packs)
+        for path in pattern_files or []:
+            self.load_file(path)
+
+    def load_file(self, path):
+        """
+        Añade los paquetes de un archivo YAML; un paquete con el mismo nombre se reemplaza.
+
+        Args:
+            path: Ruta al archivo YAML
+
+        Raises:
+            ValueError: Si el archivo no existe o no tiene el formato esperado
+        """
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(Messages.ERROR_MISSING_YAML)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise ValueError(Messages.ERROR_PATTERN_FILE.format(path, str(e)))
+
+        if not isinstance(data, dict):
+            raise ValueError(Messages.ERROR_PATTERN_FILE.format(path, "se esperaba un diccionario de paquetes"))
+
+        for name, patterns in data.items():
+            if not isinstance(patterns, list) or not all(isinstance(p, (str, int, float)) for p in patterns):
+                raise ValueError(Messages.ERROR_PATTERN_FILE.format(path, f"el paquete '{name}' no es una lista de patrones"))
+            name = str(name).lower()
+            if name == self.NEGATIVE_KEY:
+                self.negative_patterns.extend(str(p) for p in patterns)
+            else:
+                self.packs[name] = [str(p) for p in patterns]
+                if name not in self.selected:
+                    self.selected.append(name)
+
+    def select(self, names=None):
+        """
+        Selecciona los paquetes de la ejecución y combina sus patrones.
+
+        Args:
+            names: Nombres de los paquetes (lista o texto separado por comas); None para todos
+
+        Returns:
+            list: Patrones sensibles de los paquetes seleccionados, en el orden indicado
+
+        Raises:
+            ValueError: Si algún paquete no existe
+        """
+        if names:
+            if isinstance(names, str):
+                names = names.split(',')
+            names = [name.strip().lower() for name in names if name.strip()]
+            unknown = [name for name in names if name not in self.packs]
+            if unknown:
+                raise ValueError(Messages.ERROR_UNKNOWN_PATTERN_PACK.format(", ".join(unknown), ", ".join(self.packs)))
+            self.selected = list(dict.fromkeys(names))
+
+        patterns = []
+        for name in self.selected:
+            patterns.extend(self.packs[name])
+        return patterns
+
+    def extra_packs(self):
+        """
+        Obtiene los paquetes seleccionados que no están incluidos en la herramienta.
+
+        Returns:
+            dict: Nombre del paquete y su lista de patrones
+        """
+        return {name: self.packs[name] for name in self.selected if name not in self.BUILTIN}
+
+    def print_selected_packs(self):
+        """
+        Obtiene los patrones de los paquetes seleccionados, agrupados por paquete.
+
+        Returns:
+            str: Texto con los patrones de cada paquete seleccionado y los patrones negativos
+        """
+        sections = [f"{self.TITLES.get(name, name.upper())}:\n" + ", ".join(self.packs[name])
+                    for name in self.selected]
+        sections.append("PATRONES NEGATIVOS (EXCLUYEN LA ETIQUETA):\n" + ", ".join(self.negative_patterns))
+        return "PATRONES SENSIBLES POR PAQUETE:\n\n" + "\n\n".join(sections)
@@ -0,0 +1,335 @@
+import datetime
+import functools
+import json
+import os
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFError, TTFont
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from src.Messages import Messages
+from src.ReportWriter import ReportWriter
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_cell(text, font, size, width):
+    """Parte el texto de una celda en líneas; las claves, estados y patrones se repiten mucho entre archivos."""
+    return "\n".join(simpleSplit(text, font, size, width) or [""])
+
+
+def _is_cp1252(text):
+    """Indica si el texto se puede escribir con las fuentes estándar de PDF (codificación cp1252)."""
+    try:
+        text.encode('cp1252')
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+class _StreamingDocTemplate(SimpleDocTemplate):
+    """
+    SimpleDocTemplate que maqueta los flowables de un iterador por tramos.
+
+    build_stream entrega a reportlab una lista con los primeros flowables del
+    iterador; cada vez que reportlab maqueta uno de ellos (handle_flowable, que
+    recibe la lista pendiente), la lista se rellena desde el iterador. El
+    informe nunca está completo en memoria y la lista no se vacía hasta que se
+    agota el iterador.
+
+    La lista se rellena hasta lookahead - 1 elementos: el hueco restante es para
+    el salto de marco que reportlab inserta delante de un flowable que no cabe
+    en la página, de modo que la lista pendiente no pasa de lookahead.
+    """
+
+    def build_stream(self, flowables, lookahead, **kwargs):
+        """
+        Maqueta el documento a partir de un iterador de flowables.
+
+        Args:
+            flowables: Iterador de flowables en el orden del documento
+            lookahead: Número máximo de flowables pendientes en la lista de reportlab
+            **kwargs: Argumentos de SimpleDocTemplate.build (onFirstPage, onLaterPages)
+        """
+        self._source = iter(flowables)
+        self._lookahead = max(2, lookahead)
+        self._story = []
+        self._refill()
+        self.build(self._story, **kwargs)
+
+    def handle_flowable(self, flowables):
+        super().handle_flowable(flowables)
+        # reportlab también maqueta así otras listas (p. ej. los flowables pendientes de una página)
+        if flowables is self._story:
+            self._refill()
+
+    def _refill(self):
+        """Completa la lista pendiente con flowables del iterador."""
+        story = self._story
+        while len(story) < self._lookahead - 1:
+            flowable = next(self._source, None)
+            if flowable is None:
+                break
+            story.append(flowable)
+
+
+class PdfReportWriter(ReportWriter):
+    """
+    Escritor incremental del informe PDF con reportlab.
+
+    Durante el análisis cada archivo se guarda como una línea JSON compacta
+    (valores ya recortados) en el archivo temporal '.part'. Al cerrar, el
+    cuerpo se lee línea a línea y se convierte en flowables a medida que
+    reportlab los maqueta página a página, sin pandoc ni LaTeX y sin cargar el
+    informe completo en memoria.
+    """
+
+    # Longitud máxima de los valores mostrados en las tablas
+    MAX_DISPLAY_LENGTH = 100
+
+    # Flowables pendientes como máximo en la lista de reportlab
+    LOOKAHEAD = 32
+
+    # Fuentes TrueType con soporte Unicode que se buscan si no se indica --pdf_font,
+    # como (normal, negrita); se usa la primera instalada
+    UNICODE_FONT_CANDIDATES = (
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+        ("/usr/share/fonts/dejavu/DejaVuSans.ttf", "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+        ("/usr/share/fonts/TTF/DejaVuSans.ttf", "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf"),
+        ("/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf", "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf"),
+        ("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", None),
+        ("/Library/Fonts/Arial Unicode.ttf", None),
+        (os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts', 'arial.ttf'),
+         os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts', 'arialbd.ttf')),
+    )
+
+    # Fuentes estándar de las celdas y cabeceras de las tablas
+    CELL_FONT = "Helvetica"
+    CELL_BOLD_FONT = "Helvetica-Bold"
+
+    COVER_COLOR = colors.HexColor("#2C3E50")
+    SENSITIVE_COLOR = colors.HexColor("#FDEDEC")
+
+    def __init__(self, reporter, path):
+        super().__init__(reporter, path)
+        self.font, self.bold_font = self._register_fonts()
+        self.styles = self._build_styles()
+        # Celdas con caracteres fuera de cp1252 escritas sin fuente Unicode
+        self._missing_glyphs = False
+
+    def _section(self, file_info):
+        rows = []
+        for metadata_entry in file_info.get('metadata', []):
+            value = str(metadata_entry.get('value', '')).replace('\n', ' ')
+            # Convertir rutas absolutas a relativas si es necesario
+            if os.path.isabs(value) and os.path.exists(value):
+                value = os.path.relpath(value, self.reporter.main.src_path)
+            if len(value) > self.MAX_DISPLAY_LENGTH:
+                value = value[:self.MAX_DISPLAY_LENGTH - 3] + "..."
+            rows.append([str(metadata_entry.get('key', '')), value,
+                         bool(metadata_entry.get('is_sensitive', False)),
+                         list(metadata_entry.get('matching_patterns', []))])
+        record = [file_info.get('file_path', ''), file_info.get('total_metadata', 0),
+                  bool(file_info.get('has_sensitive', False)), rows]
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def _compose(self, src_path, metadata_info):
+        self._title = self.reporter._report_title()
+        self._directory = os.path.relpath(src_path, self.reporter.output_path)
+        self._date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        doc = _StreamingDocTemplate(self.path, pagesize=A4, title=self._title, author="MetaInfo Tool",
+                                    leftMargin=2 * cm, rightMargin=2 * cm, topMargin=2 * cm, bottomMargin=2 * cm)
+        self._width = doc.width
+        doc.build_stream(self._iter_flowables(metadata_info), self.LOOKAHEAD,
+                         onFirstPage=self._draw_cover, onLaterPages=self._draw_footer)
+        if self._missing_glyphs:
+            Messages.print_warning(Messages.WARNING_PDF_NO_UNICODE_FONT, verbose=True)
+
+    def _iter_flowables(self, metadata_info):
+        """Genera los flowables del informe: portada, resumen, un bloque por archivo y pie."""
+        yield PageBreak()
+        yield from self._header_flowables(metadata_info)
+        if self._body is not None:
+            with open(self.body_path, 'r', encoding='utf-8') as body:
+                for line in body:
+                    yield from self._file_flowables(json.loads(line))
+        yield from self._trailer_flowables()
+
+    def _header_flowables(self, metadata_info):
+        styles = self.styles
+        yield Paragraph("Información General", styles['h2'])
+        for label, value in [("Directorio analizado", self._directory),
+                             ("Fecha del análisis", self._date),
+                             ("Total de archivos analizados", metadata_info.get('total_files', 0)),
+                             ("Archivos con metadatos", metadata_info.get('files_with_metadata', 0)),
+                             ("Archivos con información sensible", metadata_info.get('files_with_sensitive', 0))]:
+            yield Paragraph(f"<b>{label}</b>: {escape(str(value))}", styles['body'], bulletText="•")
+
+        yield Paragraph("Resumen por Tipo de Archivo", styles['h2'])
+        rows = [["Extensión", "Cantidad", "Con Metadatos", "Con Datos Sensibles"]]
+        for ext, stats in metadata_info.get('extensions_stats', {}).items():
+            rows.append([ext, stats['count'], stats['with_metadata'], stats['with_sensitive']])
+        yield self._table(rows, [0.25, 0.25, 0.25, 0.25])
+        yield Paragraph("Detalles por Archivo", styles['h2'])
+
+    def _file_flowables(self, record):
+        file_path, total_metadata, has_sensitive, rows = record
+        styles = self.styles
+        yield Paragraph(escape(os.path.basename(file_path)), styles['h3'])
+        yield Paragraph(f"<b>Ruta relativa</b>: {escape(file_path)}", styles['body'])
+        yield Paragraph(f"<b>Total de campos de metadatos</b>: {total_metadata}", styles['body'])
+        if has_sensitive:
+            yield Paragraph("<b>Estado de datos sensibles</b>: Se han encontrado coincidencias de datos sensibles",
+                            styles['body'])
+
+        table_rows = [["Campo", "Valor", "Sensible", "Patrón Coincidente"]]
+        sensitive_rows = []
+        for key, value, is_sensitive, patterns in rows:
+            if is_sensitive:
+                sensitive_rows.append(len(table_rows))
+            table_rows.append([key, value, "Sensible/Yes" if is_sensitive else "No",
+                               ", ".join(patterns) if patterns else "-"])
+        yield self._table(table_rows, [0.28, 0.42, 0.12, 0.18], sensitive_rows)
+        yield Spacer(1, 0.4 * cm)
+
+    def _trailer_flowables(self):
+        styles = self.styles
+        yield Paragraph("Recomendaciones de Seguridad", styles['h2'])
+        for number, (label, text) in enumerate([
+            ("Limpieza de Metadatos", "Considere limpiar los metadatos de archivos antes de compartirlos, especialmente aquellos marcados como sensibles."),
+            ("Revisión Manual", "Verifique manualmente los archivos con datos sensibles para confirmar que la información identificada es realmente sensible."),
+            ("Políticas de Seguridad", "Implemente políticas para la verificación rutinaria de metadatos antes de publicar o compartir archivos."),
+            ("Herramientas de Limpieza", "Utilice la funcionalidad de limpieza de esta herramienta ejecutando el comando con la opción --clean."),
+        ], 1):
+            yield Paragraph(f"<b>{label}</b>: {text}", styles['body'], bulletText=f"{number}.")
+
+        yield Paragraph("Patrones de Detección de Información Sensible", styles['h2'])
+        yield Paragraph("A continuación se muestran los patrones utilizados por MetaInfo para identificar "
+                        "potencialmente información sensible en los metadatos.", styles['body'])
+        for title, patterns, collapsed in self.reporter._pattern_groups():
+            yield Paragraph(escape(title), styles['h4'] if collapsed else styles['h3'])
+            yield Paragraph(escape(", ".join(patterns)), styles['body'])
+
+        yield Spacer(1, 0.5 * cm)
+        yield Paragraph("<i>Informe generado por MetaInfo Tool</i>", styles['body'])
+
+    def _table(self, rows, fractions, sensitive_rows=()):
+        """
+        Crea una tabla con la cabecera repetida en cada página.
+
+        Las celdas son texto plano partido en líneas según el ancho de la columna
+        (mucho más rápido que un Paragraph por celda en informes grandes) y se
+        escriben con Helvetica, que no se incrusta ni se mide glifo a glifo; solo
+        las celdas con caracteres fuera de cp1252 usan la fuente Unicode.
+        """
+        widths = [self._width * fraction for fraction in fractions]
+        size = self.styles['cell'].fontSize
+        data = [rows[0]]
+        unicode_cells = []
+        for row_index, row in enumerate(rows[1:], 1):
+            cells = []
+            for column, (cell, width) in enumerate(zip(row, widths)):
+                text = str(cell)
+                font = self.CELL_FONT
+                if not _is_cp1252(text):
+                    if self.font == self.CELL_FONT:
+                        self._missing_glyphs = True
+                    else:
+                        font = self.font
+                        unicode_cells.append((column, row_index))
+                cells.append(_split_cell(text, font, size, width - 8))
+            data.append(cells)
+
+        style = [
+            ('FONTNAME', (0, 0), (-1, -1), self.CELL_FONT),
+            ('FONTNAME', (0, 0), (-1, 0), self.CELL_BOLD_FONT),
+            ('FONTSIZE', (0, 0), (-1, -1), size),
+            ('LEADING', (0, 0), (-1, -1), size * 1.2),
+            ('BACKGROUND', (0, 0), (-1, 0), self.COVER_COLOR),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]
+        for row in sensitive_rows:
+            style.append(('BACKGROUND', (0, row), (-1, row), self.SENSITIVE_COLOR))
+        for cell in unicode_cells:
+            style.append(('FONTNAME', cell, cell, self.font))
+        return Table(data, colWidths=widths, repeatRows=1, style=TableStyle(style))
+
+    def _draw_cover(self, canvas, doc):
+        """Dibuja la portada con el título, el directorio analizado y la fecha."""
+        width, height = doc.pagesize
+        canvas.saveState()
+        canvas.setFillColor(self.COVER_COLOR)
+        canvas.rect(0, 0, width, height, stroke=0, fill=1)
+        canvas.setFillColor(colors.white)
+        canvas.setFont(self.bold_font, 22)
+        canvas.drawCentredString(width / 2, height * 0.62, self._title)
+        canvas.setFont(self.font, 12)
+        canvas.drawCentredString(width / 2, height * 0.56, f"Directorio analizado: {self._directory}")
+        canvas.drawCentredString(width / 2, height * 0.52, self._date)
+        canvas.drawCentredString(width / 2, height * 0.30, "MetaInfo Tool")
+        canvas.restoreState()
+
+    def _draw_footer(self, canvas, doc):
+        """Dibuja el número de página en el pie."""
+        canvas.saveState()
+        canvas.setFont(self.font, 8)
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, doc.bottomMargin / 2, str(doc.page))
+        canvas.restoreState()
+
+    def _build_styles(self):
+        """Estilos de párrafo basados en la hoja de estilos de reportlab con la fuente elegida."""
+        sample = getSampleStyleSheet()
+        styles = {
+            'body': ParagraphStyle('MetaInfoBody', parent=sample['BodyText'], fontName=self.font),
+            'cell': ParagraphStyle('MetaInfoCell', parent=sample['BodyText'], fontName=self.font, fontSize=7.5),
+        }
+        for name in ('h2', 'h3', 'h4'):
+            styles[name] = ParagraphStyle(f"MetaInfo{name}", parent=sample[name], fontName=self.bold_font,
+                                          keepWithNext=1)
+        styles['h2'].textColor = self.COVER_COLOR
+        return styles
+
+    def _register_fonts(self):
+        """
+        Registra la fuente TrueType de --pdf_font o, si no se indica, la primera fuente Unicode instalada.
+
+        Returns:
+            tuple: (fuente normal, fuente negrita); Helvetica si no hay ninguna fuente TrueType utilizable
+        """
+        configured = self.reporter.args.get('pdf_font')
+        if configured:
+            candidates = [(configured, None)]
+        else:
+            candidates = [(regular, bold) for regular, bold in self.UNICODE_FONT_CANDIDATES if os.path.exists(regular)]
+        for regular, bold in candidates:
+            try:
+                return self._register_font_pair(regular, bold)
+            except (OSError, TTFError) as e:
+                Messages.print_warning(Messages.WARNING_PDF_FONT, regular, str(e), verbose=True)
+        return self.CELL_FONT, self.CELL_BOLD_FONT
+
+    @staticmethod
+    def _register_font_pair(regular, bold):
+        """
+        Registra una fuente TrueType y su negrita (la normal si no hay negrita).
+
+        Returns:
+            tuple: Nombres registrados de la fuente normal y la negrita
+        """
+        name = f"MetaInfo-{os.path.splitext(os.path.basename(regular))[0]}"
+        if name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(name, regular))
+        if not bold or not os.path.exists(bold):
+            return name, name
+        bold_name = f"{name}-Bold"
+        if bold_name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(bold_name, bold))
+        return name, bold_name
@@ -0,0 +1,107 @@
+import queue
+import threading
+
+
+class ReportPipeline:
+    """
+    Canalización por etapas conectadas por colas acotadas.
+
+    Cada etapa se ejecuta en su propio hilo y transforma el iterable de la etapa
+    anterior (recorrido → extracción → clasificación); el consumidor final
+    (render) se ejecuta en el hilo que llama a run. Las colas tienen un tamaño
+    máximo, de modo que una etapa lenta frena a las anteriores y la memoria no
+    crece con el tamaño del árbol. El orden de los elementos se conserva.
+
+    Un error en cualquier etapa detiene la canalización y se relanza en el hilo
+    que llama a run.
+    """
+
+    # Elementos que puede haber en cada cola entre dos etapas
+    DEFAULT_QUEUE_SIZE = 4
+
+    # Segundos entre comprobaciones de parada mientras una etapa espera
+    POLL_INTERVAL = 0.1
+
+    _DONE = object()
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Inicializa la canalización.
+
+        Args:
+            queue_size: Número máximo de elementos en cada cola entre etapas
+        """
+        self.queue_size = max(1, int(queue_size or self.DEFAULT_QUEUE_SIZE))
+        self._stop = threading.Event()
+        self._errors = []
+
+    def run(self, source, stages, consume):
+        """
+        Ejecuta la canalización hasta agotar la fuente.
+
+        Args:
+            source: Iterable con los elementos de entrada (se recorre en un hilo propio)
+            stages: Lista de funciones que reciben un iterable y devuelven otro iterable
+            consume: Función llamada en este hilo con cada elemento de la última etapa
+        """
+        self._stop.clear()
+        self._errors = []
+        queues = [queue.Queue(self.queue_size) for _ in range(len(stages) + 1)]
+
+        threads = [threading.Thread(target=self._produce, args=(iter(source), queues[0]),
+                                    name="metainfo-pipeline-0", daemon=True)]
+        for position, stage in enumerate(stages):
+            threads.append(threading.Thread(target=self._produce,
+                                            args=(stage(self._drain(queues[position])), queues[position + 1]),
+                                            name=f"metainfo-pipeline-{position + 1}", daemon=True))
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in self._drain(queues[-1]):
+                consume(item)
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _produce(self, items, output):
+        """Recorre un iterable (fuente o etapa) y deja sus elementos en la cola de salida."""
+        try:
+            for item in items:
+                if not self._put(output, item):
+                    return
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._put(output, self._DONE)
+
+    def _put(self, output, item):
+        """Añade un elemento a una cola esperando hueco; devuelve False si la canalización se detuvo."""
+        while True:
+            try:
+                output.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
+
+    def _drain(self, source):
+        """Devuelve los elementos de una cola hasta el marcador de fin o la parada de la canalización."""
+        while True:
+            try:
+                item = source.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is self._DONE:
+                return
+            yield item
@@ -0,0 +1,54 @@
+from multiprocessing import util
+
+
+class ReportWorker:
+    """
+    Funciones ejecutadas en los procesos secundarios del escaneo paralelo de informes.
+
+    Cada proceso construye su propia instancia de Main (con su propio pool de
+    ExifTool persistente) una sola vez y la reutiliza para todos los lotes que
+    recibe, clasificando los metadatos localmente.
+    """
+
+    _main = None
+
+    @staticmethod
+    def initialize(args):
+        """
+        Inicializa el proceso secundario.
+
+        Args:
+            args: Diccionario de argumentos de la ejecución principal
+        """
+        # Importación local para evitar la dependencia circular con Main
+        from src.Main import Main
+
+        worker_args = dict(args)
+        worker_args['workers'] = 1
+        ReportWorker._main = Main(worker_args)
+        # Detener exiftool de forma ordenada cuando el proceso termine
+        util.Finalize(ReportWorker._main, ReportWorker._main.exiftool_pool.close, exitpriority=10)
+
+    @staticmethod
+    def scan_batch(batch):
+        """
+        Extrae y clasifica los metadatos de un lote de archivos.
+
+        Args:
+            batch: Lista de rutas de archivos
+
+        Returns:
+            dict: Estructura metadata_info parcial con los resultados del lote y, en
+                  'key_cache', los aciertos y fallos de la caché de claves durante el lote
+        """
+        main = ReportWorker._main
+        partial_info = main._initialize_metadata_info()
+        before = main.pattern_index.cache_stats()
+        main.reporter._process_report_batch(batch, partial_info)
+        after = main.pattern_index.cache_stats()
+        partial_info['key_cache'] = {
+            'hits': after['hits'] - before['hits'],
+            'misses': after['misses'] - before['misses'],
+            'size': after['size'],
+        }
+        return partial_info
@@ -0,0 +1,98 @@
+import os
+import shutil
+
+
+class ReportWriter:
+    """
+    Base de los escritores incrementales de informes.
+
+    La sección de cada archivo se escribe en cuanto el archivo se clasifica, en
+    un archivo temporal '.part' junto al informe. La cabecera y el resumen por
+    tipo de archivo dependen de los totales, así que se escriben al cerrar: el
+    informe final se compone con la cabecera, el cuerpo copiado por bloques
+    desde el archivo temporal y el pie. La memoria usada no depende del número
+    de archivos.
+
+    Las subclases definen el formato con _header, _section y _trailer, o
+    redefinen _compose si el formato final no es texto.
+    """
+
+    # Tamaño del búfer de escritura y de los bloques de copia del cuerpo
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, reporter, path):
+        """
+        Inicializa el escritor.
+
+        Args:
+            reporter: Instancia de Reporter que generó el análisis
+            path: Ruta del informe final
+        """
+        self.reporter = reporter
+        self.path = path
+        self.body_path = path + ".part"
+        self._body = None
+
+    def add_file(self, file_info):
+        """
+        Escribe la sección de un archivo clasificado.
+
+        Args:
+            file_info: Información del archivo (ver Reporter._add_file_to_report)
+        """
+        if self._body is None:
+            # El archivo temporal se crea con la primera sección
+            self._body = open(self.body_path, 'w', encoding='utf-8', buffering=self.BUFFER_SIZE)
+        self._body.write(self._section(file_info))
+
+    def close(self, src_path, metadata_info):
+        """
+        Compone el informe final con la cabecera, el cuerpo y el pie.
+
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con los contadores y estadísticas del análisis
+
+        Returns:
+            str: Ruta al informe generado
+        """
+        try:
+            if self._body is not None:
+                self._body.close()
+            self._compose(src_path, metadata_info)
+        finally:
+            self._remove_body()
+        return self.path
+
+    def abort(self):
+        """Descarta el informe a medio escribir."""
+        if self._body is not None:
+            self._body.close()
+        self._remove_body()
+
+    def _compose(self, src_path, metadata_info):
+        """Escribe el informe final: cabecera, cuerpo copiado por bloques y pie."""
+        with open(self.path, 'w', encoding='utf-8', buffering=self.BUFFER_SIZE) as f:
+            f.write(self._header(src_path, metadata_info))
+            if self._body is not None:
+                with open(self.body_path, 'r', encoding='utf-8') as body:
+                    shutil.copyfileobj(body, f, self.BUFFER_SIZE)
+            f.write(self._trailer())
+
+    def _header(self, src_path, metadata_info):
+        """Cabecera del informe, escrita al cerrar con los totales ya calculados."""
+        raise NotImplementedError
+
+    def _section(self, file_info):
+        """Sección de un archivo."""
+        raise NotImplementedError
+
+    def _trailer(self):
+        """Pie del informe."""
+        raise NotImplementedError
+
+    def _remove_body(self):
+        """Elimina el archivo temporal del cuerpo si existe."""
+        if self._body is not None and os.path.exists(self.body_path):
+            os.remove(self.body_path)
+        self._body = None
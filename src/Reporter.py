@@ -1,22 +1,30 @@
 import os
 import datetime
-import markdown
-import tempfile
-import subprocess
-import sys
-import pypandoc
 import re
+import concurrent.futures
+import collections
 
 from src.Messages import Messages
 from src.ParameterValidator import ParameterValidator
-from src.resources.templates import Templates
 from src.SensitivePatterns import SensitivePatterns
+from src.PatternIndex import PatternIndex
+from src.ReportWorker import ReportWorker
+from src.DirectoryWalker import DirectoryWalker
+from src.ReportPipeline import ReportPipeline
+from src.MarkdownReportWriter import MarkdownReportWriter
+from src.HtmlReportWriter import HtmlReportWriter
+from src.NdjsonReportWriter import NdjsonReportWriter
+from src.ResultStore import ResultStore
 
 class Reporter:
     """
     Clase para generar reportes de metadatos.
     """
     
+    # Tamaño por defecto de los lotes de extracción de metadatos
+    DEFAULT_BATCH_SIZE = 256
+    DEFAULT_BATCH_MB = 64
+    
     def __init__(self, main_instance):
         """
         Inicializa el Reporter con una referencia a la instancia principal.
@@ -28,32 +36,48 @@ class Reporter:
         self.args = main_instance.args
         self.output_path = self.args.get('output_path', "./")
         self.verbose = self.args.get('verbose', False)
+        # Estadísticas de la caché de claves acumuladas desde los procesos secundarios
+        self.worker_cache_stats = None
         
-    def generate_report(self, src_path, metadata_info):
+    def generate_report(self, src_path, metadata_info, writers=None):
         """
         Genera un informe de metadatos basado en la información recopilada.
         
         Args:
             src_path: Ruta al directorio procesado
             metadata_info: Diccionario con la información de metadatos recopilada
+            writers: Escritores de open_report_writers que ya recibieron los archivos
+                     durante el análisis (None para escribirlos desde metadata_info['files_info'])
             
         Returns:
-            tuple: (ruta al archivo markdown, ruta al archivo pdf) o (None, None) en caso de error
+            tuple: (ruta al archivo markdown, ruta al archivo pdf, ruta al archivo html) o
+                   (None, None, None) en caso de error
         """
         try:
-            pdf_enabled = self.args.get('pdf', False)
-            html_enabled = self.args.get('html', False)
-            md_path = self._generate_markdown_report(src_path, metadata_info)
+            if writers is None:
+                writers = self.open_report_writers()
+                for file_info in metadata_info.get('files_info', []):
+                    for writer in writers.values():
+                        writer.add_file(file_info)
+            
+            md_path = self._generate_markdown_report(src_path, metadata_info, writers['markdown'])
             
             html_path = None
-            if md_path and html_enabled:
-                html_path = self._generate_html_from_markdown(md_path, src_path)
-                if html_path:
-                    Messages.print_info(Messages.INFO_HTML_GENERATED, html_path)
+            if 'html' in writers:
+                html_path = self._generate_html_report(src_path, metadata_info, writers['html'])
+            
+            if 'ndjson' in writers:
+                self._generate_ndjson_report(src_path, metadata_info, writers['ndjson'])
+            
+            if 'parquet' in writers:
+                self._generate_parquet_report(src_path, metadata_info, writers['parquet'])
+            
+            if 'store' in writers:
+                self._save_to_store(src_path, metadata_info, writers['store'])
             
             pdf_path = None
-            if pdf_enabled and md_path:
-                pdf_path = self._generate_pdf_from_markdown(md_path)
+            if 'pdf' in writers:
+                pdf_path = self._generate_pdf_report(src_path, metadata_info, writers['pdf'])
                 if pdf_path is None and html_path:
                     Messages.print_info(Messages.INFO_HTML_ALTERNATIVE, html_path)
                     
@@ -65,380 +89,185 @@ class Reporter:
             traceback.print_exc()
             return None, None, None
     
-    def _generate_markdown_report(self, src_path, metadata_info):
+    def open_report_writers(self):
+        """
+        Crea los escritores incrementales de los informes en la carpeta de informes.
+        
+        Returns:
+            dict: Escritores por formato ('markdown' siempre, 'html' con --html, 'pdf' con --pdf,
+                  'ndjson' con --ndjson, 'parquet' con --parquet y 'store' (ResultStore)
+                  con --store) que
+                  reciben cada archivo con add_file
+        """
+        # Crear directorio de informes en la ruta de salida especificada
+        report_dir = os.path.join(self.output_path, "reports")
+        if not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+            
+        # Generar nombre de archivo basado en la fecha y hora actual
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_path = os.path.join(report_dir, f"metadata_report_{timestamp}")
+        
+        writers = {'markdown': MarkdownReportWriter(self, f"{base_path}.md")}
+        if self.args.get('html', False):
+            writers['html'] = HtmlReportWriter(self, f"{base_path}.html")
+        if self.args.get('pdf', False):
+            if ParameterValidator.check_dependency('reportlab'):
+                from src.PdfReportWriter import PdfReportWriter
+                writers['pdf'] = PdfReportWriter(self, f"{base_path}.pdf")
+            else:
+                Messages.print_warning(Messages.WARNING_MISSING_REPORTLAB, verbose=True)
+        if self.args.get('ndjson', False):
+            writers['ndjson'] = NdjsonReportWriter(self, f"{base_path}.ndjson", compress=self.args.get('gzip', False))
+        if self.args.get('parquet', False):
+            if ParameterValidator.check_dependency('pyarrow'):
+                from src.ParquetReportWriter import ParquetReportWriter
+                writers['parquet'] = ParquetReportWriter(self, f"{base_path}.parquet")
+            else:
+                Messages.print_warning(Messages.WARNING_MISSING_PYARROW, verbose=True)
+        if self.args.get('store'):
+            store = ResultStore(self.args['store'])
+            store.begin_run(self.main.src_path, ParameterValidator.safe_get(self.args, 'only_sensitive', False))
+            writers['store'] = store
+        return writers
+    
+    def _generate_markdown_report(self, src_path, metadata_info, markdown_writer):
         """
         Genera un informe en formato Markdown.
         
         Args:
             src_path: Ruta al directorio procesado
             metadata_info: Diccionario con la información de metadatos recopilada
+            markdown_writer: MarkdownReportWriter que ya recibió los archivos
             
         Returns:
             str: Ruta al archivo Markdown generado o None en caso de error
         """
         try:
-            # Crear directorio de informes en la ruta de salida especificada
-            report_dir = os.path.join(self.output_path, "reports")
-            if not os.path.exists(report_dir):
-                os.makedirs(report_dir)
-                
-            # Generar nombre de archivo basado en la fecha y hora actual
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_name = f"metadata_report_{timestamp}"
-            md_path = os.path.join(report_dir, f"{base_name}.md")
-            
-            # Generar contenido del informe
-            md_content = self._generate_markdown_content(src_path, metadata_info)
-            
-            # Escribir archivo Markdown
-            with open(md_path, 'w', encoding='utf-8') as f:
-                f.write(md_content)
-                
+            md_path = markdown_writer.close(src_path, metadata_info)
             Messages.print_info(Messages.INFO_MARKDOWN_GENERATED, md_path)
             return md_path
             
         except Exception as e:
+            markdown_writer.abort()
             Messages.print_error(f"Error al generar informe Markdown: {str(e)}")
             return None
     
-    def _generate_html_from_markdown(self, md_path, src_path):
+    def _generate_html_report(self, src_path, metadata_info, html_writer):
         """
-        Genera un informe en formato HTML a partir de un archivo Markdown.
+        Genera el informe HTML directamente desde los registros de los archivos.
         
         Args:
-            md_path: Ruta al archivo Markdown
-            src_path: Ruta al directorio analizado
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con la información de metadatos recopilada
+            html_writer: HtmlReportWriter que ya recibió los archivos
             
         Returns:
             str: Ruta al archivo HTML generado o None en caso de error
         """
-        if not md_path or not os.path.exists(md_path):
-            Messages.print_error("Error: No se puede generar HTML, el archivo Markdown no existe.")
-            return None
-            
-        # Generar nombre de archivo HTML basado en el nombre del archivo Markdown
-        report_dir = os.path.dirname(md_path)
-        base_name = os.path.splitext(os.path.basename(md_path))[0]
-        html_path = os.path.join(report_dir, f"{base_name}.html")
-        
         try:
-            # Leer el contenido del archivo Markdown
-            with open(md_path, 'r', encoding='utf-8') as f:
-                md_content = f.read()
-            
-            # Filtrar los metadatos YAML del contenido Markdown
-            lines = md_content.split('\n')
-            filtered_lines = []
-            in_yaml = False
-            
-            for line in lines:
-                if line.strip() == '---':
-                    in_yaml = not in_yaml
-                    continue
-                if not in_yaml:
-                    filtered_lines.append(line)
-            
-            filtered_content = '\n'.join(filtered_lines)
-            
-            # Convertir Markdown a HTML
-            html_content = markdown.markdown(filtered_content, extensions=['tables', 'toc', 'fenced_code', 'codehilite', 'attr_list'])
-            
-            # Extraer el título del informe del contenido Markdown
-            report_title = "Informe de Análisis de Metadatos"
-            if self.args.get('only_sensitive', False):
-                report_title += " (Datos Sensibles)"
-                
-            # Obtener la fecha y hora actual
-            current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Añadir estilos CSS para mejorar la apariencia
-            styled_html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{report_title}</title>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            color: #333;
-        }}
-        
-        .header {{
-            background-color: #2C3E50;
-            color: white;
-            padding: 2em;
-            margin: -20px -20px 2em -20px;
-            text-align: center;
-        }}
-        
-        .header h1 {{
-            margin: 0;
-            font-size: 2.5em;
-            color: white;
-        }}
-        
-        .header .subtitle {{
-            font-size: 1.2em;
-            margin-top: 0.5em;
-            color: #ecf0f1;
-        }}
-        
-        .header .meta {{
-            margin-top: 1em;
-            font-size: 0.9em;
-            color: #bdc3c7;
-        }}
-        
-        .header .meta span {{
-            margin: 0 1em;
-        }}
-        
-        h1, h2, h3, h4, h5, h6 {{
-            color: #2C3E50;
-            margin-top: 1.5em;
-            margin-bottom: 0.5em;
-        }}
-        
-        h1 {{ font-size: 2em; }}
-        h2 {{ font-size: 1.5em; }}
-        h3 {{ font-size: 1.2em; }}
-        
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            margin: 1em 0;
-        }}
-        
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }}
-        
-        th {{
-            background-color: #2C3E50;
-            color: white;
-        }}
-        
-        tr:nth-child(even) {{
-            background-color: #f9f9f9;
-        }}
-        
-        code {{
-            background-color: #f5f5f5;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-family: monospace;
-            font-size: 0.9em;
-        }}
-        
-        pre {{
-            background-color: #f5f5f5;
-            padding: 1em;
-            border-radius: 5px;
-            overflow-x: auto;
-        }}
-        
-        details {{
-            margin: 1em 0;
-            padding: 0.5em;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-        }}
-        
-        summary {{
-            cursor: pointer;
-            font-weight: bold;
-            padding: 0.5em;
-            background-color: #f5f5f5;
-            border-radius: 3px;
-        }}
-        
-        summary:hover {{
-            background-color: #e9e9e9;
-        }}
-        
-        footer {{
-            margin-top: 2em;
-            padding-top: 1em;
-            border-top: 1px solid #ddd;
-            text-align: center;
-            color: #666;
-            font-size: 0.9em;
-        }}
-        
-        a {{
-            color: #2980b9;
-            text-decoration: none;
-        }}
-        
-        a:hover {{
-            text-decoration: underline;
-        }}
-        
-        blockquote {{
-            border-left: 4px solid #2C3E50;
-            margin: 1em 0;
-            padding-left: 1em;
-            color: #666;
-        }}
-        
-        img {{
-            max-width: 100%;
-            height: auto;
-        }}
-        
-        hr {{
-            border: none;
-            border-top: 1px solid #ddd;
-            margin: 2em 0;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{report_title}</h1>
-        <div class="subtitle">Directorio analizado: {self._sanitize_text(os.path.relpath(src_path, self.output_path))}</div>
-        <div class="meta">
-            <span>Fecha: {current_time}</span>
-            <span>Autor: MetaInfo Tool</span>
-        </div>
-    </div>
-    {html_content}
-    <footer>
-        <p>Informe generado por MetaInfo Tool - {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-    </footer>
-</body>
-</html>"""            
-            # Escribir el archivo HTML
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(styled_html)
-                
+            html_path = html_writer.close(src_path, metadata_info)
+            Messages.print_info(Messages.INFO_HTML_GENERATED, html_path)
             return html_path
             
         except Exception as e:
+            html_writer.abort()
             Messages.print_error(f"Error al generar HTML: {str(e)}")
             return None
     
-    def _generate_pdf_from_markdown(self, md_path):
+    def _generate_ndjson_report(self, src_path, metadata_info, ndjson_writer):
         """
-        Genera un informe en formato PDF a partir de un archivo Markdown usando pandoc.
+        Completa el informe NDJSON con el objeto de resumen final.
         
         Args:
-            md_path: Ruta al archivo Markdown
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con la información de metadatos recopilada
+            ndjson_writer: NdjsonReportWriter que ya escribió un objeto por archivo
             
         Returns:
-            str: Ruta al archivo PDF generado o None en caso de error
+            str: Ruta al archivo NDJSON generado o None en caso de error
         """
-        Messages.print_info("Generando PDF...")
+        try:
+            ndjson_path = ndjson_writer.close(src_path, metadata_info)
+            Messages.print_info(Messages.INFO_NDJSON_GENERATED, ndjson_path)
+            return ndjson_path
+            
+        except Exception as e:
+            ndjson_writer.abort()
+            Messages.print_error(f"Error al generar informe NDJSON: {str(e)}")
+            return None
+    
+    def _generate_parquet_report(self, src_path, metadata_info, parquet_writer):
+        """
+        Completa la exportación Parquet con el último grupo de filas.
         
-        if not md_path or not os.path.exists(md_path):
-            Messages.print_error("Error: No se puede generar PDF, el archivo Markdown no existe.")
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con la información de metadatos recopilada
+            parquet_writer: ParquetReportWriter que ya recibió los archivos
+            
+        Returns:
+            str: Ruta al archivo Parquet generado o None en caso de error
+        """
+        try:
+            parquet_path = parquet_writer.close(src_path, metadata_info)
+            Messages.print_info(Messages.INFO_PARQUET_GENERATED, parquet_path)
+            return parquet_path
+            
+        except Exception as e:
+            parquet_writer.abort()
+            Messages.print_error(f"Error al generar la exportación Parquet: {str(e)}")
             return None
+    
+    def _save_to_store(self, src_path, metadata_info, store):
+        """
+        Completa la ejecución en el almacén SQLite con los totales del análisis.
+        
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con la información de metadatos recopilada
+            store: ResultStore que ya recibió los archivos
             
-        verbose = ParameterValidator.safe_get(self.args, 'verbose', False)
-        report_dir = os.path.dirname(md_path)
-        base_name = os.path.splitext(os.path.basename(md_path))[0]
-        pdf_path = os.path.join(report_dir, f"{base_name}.pdf")
+        Returns:
+            str: Ruta de la base de datos o None en caso de error
+        """
+        try:
+            db_path = store.close(src_path, metadata_info)
+            Messages.print_info(Messages.INFO_STORE_SAVED, store.run_id, db_path)
+            return db_path
+            
+        except Exception as e:
+            # La ejecución queda sin fecha de fin y las consultas la ignoran
+            Messages.print_error(f"Error al guardar los resultados en la base de datos: {str(e)}")
+            return None
+    
+    def _generate_pdf_report(self, src_path, metadata_info, pdf_writer):
+        """
+        Genera el informe PDF con reportlab directamente desde los registros de los archivos.
         
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con la información de metadatos recopilada
+            pdf_writer: PdfReportWriter que ya recibió los archivos
+            
+        Returns:
+            str: Ruta al archivo PDF generado o None en caso de error
+        """
+        Messages.print_info("Generando PDF...")
         try:
-            # Configurar argumentos básicos de pandoc con opciones más seguras
-            extra_args = [
-                '--pdf-engine=xelatex',
-                '--variable=geometry:margin=2cm',
-                '--variable=documentclass:article',
-                '--variable=colorlinks=true',
-                '--variable=linkcolor=blue',
-                '--variable=urlcolor=blue',
-                '--strip-comments',  # Eliminar comentarios LaTeX para evitar conflictos
-                '--no-highlight',  # Desactivar resaltado de sintaxis para evitar errores
-                '--toc'  # Tabla de contenidos
-            ]
-            
-            # Crear archivo temporal con encabezado LaTeX básico y mínimo
-            with tempfile.NamedTemporaryFile(suffix='.tex', delete=False, mode='w', encoding='utf-8') as temp_header:
-                temp_header.write("""\\usepackage{booktabs}
-\\usepackage{longtable}
-\\usepackage{array}
-\\usepackage{fontspec}
-
-% Configuración básica para tablas
-\\renewcommand{\\arraystretch}{1.2}
-\\setlength{\\tabcolsep}{8pt}
-""")
-                header_file = temp_header.name
-                extra_args.extend(['--include-in-header', header_file])
-            
-            # Leer y preparar contenido Markdown
-            with open(md_path, 'r', encoding='utf-8') as f:
-                md_content = f.read()
-            
-            # Limpiar caracteres problemáticos - sanitizar todo el contenido
-            sanitized_md_content = ""
-            lines = md_content.split('\n')
-            for line in lines:
-                # Mantener las líneas de YAML y Markdown intactas
-                if line.startswith('---') or line.startswith('#') or line.startswith('```') or line == '':
-                    sanitized_md_content += line + '\n'
-                else:
-                    # Sanitizar el contenido de texto
-                    sanitized_line = self._sanitize_text(line)
-                    sanitized_md_content += sanitized_line + '\n'
-            
-            # Guardar en un archivo temporal
-            with tempfile.NamedTemporaryFile(suffix='.md', delete=False, mode='w', encoding='utf-8') as temp_md:
-                temp_md.write(sanitized_md_content)
-                temp_md_path = temp_md.name
-            
-            # Agregar un tempfile para los mensajes de error
-            with tempfile.NamedTemporaryFile(suffix='.log', delete=False, mode='w', encoding='utf-8') as temp_log:
-                log_file = temp_log.name
-            
-            # Primero intentar la conversión directa a PDF
-            try:
-                Messages.print_info("Intentando conversión directa a PDF...")
-                output = pypandoc.convert_file(
-                    temp_md_path, 
-                    'pdf', 
-                    outputfile=pdf_path, 
-                    extra_args=extra_args
-                )
-                Messages.print_info("Conversión directa a PDF completada con éxito.")
-                success = True
-            except Exception as e:
-                Messages.print_error(f"Error en conversión directa a PDF: {str(e)}")
-                Messages.print_error(Messages.ERROR_PDF_CONVERSION_FAILED)
-                Messages.print_info(Messages.LATEX_RECOMMENDATIONS)
-                success = False
-            
-            # Limpiar archivos temporales
-            for temp_file in [temp_md_path, header_file, log_file]:
-                try:
-                    if os.path.exists(temp_file):
-                        os.unlink(temp_file)
-                except Exception as e:
-                    Messages.print_debug(f"Error al limpiar archivo temporal: {str(e)}", verbose=verbose)
-            
-            if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
-                Messages.print_info(Messages.INFO_PDF_GENERATED, pdf_path)
-                return pdf_path
-            else:
-                Messages.print_error("Error: No se pudo generar el archivo PDF o el archivo está vacío.")
-                return None
-                
+            pdf_path = pdf_writer.close(src_path, metadata_info)
+            Messages.print_info(Messages.INFO_PDF_GENERATED, pdf_path)
+            return pdf_path
+            
         except Exception as e:
+            pdf_writer.abort()
             Messages.print_error(f"Error general al generar PDF: {str(e)}")
-            Messages.print_info(Messages.LATEX_RECOMMENDATIONS)
             return None
         
     def _sanitize_text(self, text):
         """
         Limpia el texto de caracteres especiales y de control que podrían causar problemas
-        en la generación de PDF o HTML.
+        en el informe Markdown.
         
         Args:
             text: Texto a sanitizar
@@ -452,8 +281,7 @@ class Reporter:
         # Eliminar caracteres de control invisibles (excepto espacios en blanco comunes)
         text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', text)
         
-        # Para uso en Markdown que luego se convertirá a PDF, es mejor simplificar
-        # y eliminar caracteres problemáticos en lugar de escaparlos con comandos LaTeX
+        # Eliminar los caracteres con significado especial en lugar de escaparlos
         text = re.sub(r'[\\{}$&#^_~%]', ' ', text)
         
         # Reemplazar barras invertidas múltiples que podrían causar problemas
@@ -496,27 +324,25 @@ class Reporter:
         
         return text
         
-    def _generate_markdown_content(self, src_path, metadata_info):
+    def _markdown_header(self, src_path, metadata_info):
         """
-        Genera el contenido del informe en formato Markdown.
+        Genera la cabecera del informe Markdown: portada, información general y resumen.
         
         Args:
             src_path: Ruta al directorio procesado
-            metadata_info: Diccionario con la información de metadatos recopilada
+            metadata_info: Diccionario con los contadores y estadísticas del análisis
             
         Returns:
-            str: Contenido del informe en formato Markdown
+            str: Cabecera del informe, hasta el título de los detalles por archivo
         """
         # Información del sistema y fecha del análisis
         current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Comprobar si es un informe solo de datos sensibles
         only_sensitive = ParameterValidator.safe_get(self.args, 'only_sensitive', False)
-        report_title = "Informe de Análisis de Metadatos"
-        if only_sensitive:
-            report_title += " (Datos Sensibles)"
+        report_title = self._report_title()
         
-        # Añadir metadatos YAML para la generación de PDF con portada
+        # Metadatos YAML de la portada del documento
         yaml_header = f"""---
 title: "{report_title}"
 author: "MetaInfo Tool"
@@ -557,50 +383,72 @@ classoption: oneside
         # Añadir detalles de cada archivo con metadatos
         content += "\n## Detalles por Archivo\n\n"
         
-        for file_info in metadata_info.get('files_info', []):
-            file_path = file_info.get('file_path', '')
-            # La ruta ya es relativa desde _process_directory_for_report
-            rel_path = file_path
-            total_metadata = file_info.get('total_metadata', 0)
-            has_sensitive = file_info.get('has_sensitive', False)
-            
-            content += f"### {self._sanitize_text(os.path.basename(file_path))}\n\n"
-            content += f"**Ruta relativa**: `{self._sanitize_text(rel_path)}`\n\n"
-            content += f"**Total de campos de metadatos**: {total_metadata}\n\n"
-            if (has_sensitive):
-              content += f"**Estado de datos sensibles**: {'Se han encontrado coincidencias de datos sensibles'}\n\n"
-            
-            # Tabla de metadatos para este archivo
-            content += "| Campo | Valor | Sensible | Patrón Coincidente |\n"
-            content += "|-------|-------|----------|--------------------|\n"
-            
-            # Añadir cada campo de metadatos
-            for metadata_entry in file_info.get('metadata', []):
-                key = self._sanitize_text(metadata_entry.get('key', ''))
-                raw_value = str(metadata_entry.get('value', '')).replace('|', '\\|').replace('\n', ' ')
-                
-                # Convertir rutas absolutas a relativas si es necesario
-                if os.path.isabs(raw_value) and os.path.exists(raw_value):
-                    raw_value = os.path.relpath(raw_value, self.main.src_path)
-                
-                # Sanitizar el valor
-                value = self._sanitize_text(raw_value)
-                
-                is_sensitive = metadata_entry.get('is_sensitive', False)
-                patterns = metadata_entry.get('matching_patterns', [])
-                
-                # Acortar valores demasiado largos
-                if len(value) > 100:
-                    value = value[:97] + "..."
-                    
-                sensitive_status = "Sensible/Yes" if is_sensitive else "No"
-                patterns_str = ", ".join(self._sanitize_text(pattern) for pattern in patterns) if patterns else "-"
-                
-                # Añadir fila a la tabla
-                content += f"| {key} | {value} | {sensitive_status} | {patterns_str} |\n"
+        return content
+    
+    def _markdown_file_section(self, file_info):
+        """
+        Genera la sección Markdown de un archivo: datos generales y tabla de metadatos.
+        
+        Args:
+            file_info: Información del archivo (ver _add_file_to_report)
+            
+        Returns:
+            str: Sección del archivo
+        """
+        file_path = file_info.get('file_path', '')
+        # La ruta ya es relativa desde _process_directory_for_report
+        rel_path = file_path
+        total_metadata = file_info.get('total_metadata', 0)
+        has_sensitive = file_info.get('has_sensitive', False)
+        
+        parts = [
+            f"### {self._sanitize_text(os.path.basename(file_path))}\n\n",
+            f"**Ruta relativa**: `{self._sanitize_text(rel_path)}`\n\n",
+            f"**Total de campos de metadatos**: {total_metadata}\n\n",
+        ]
+        if has_sensitive:
+            parts.append("**Estado de datos sensibles**: Se han encontrado coincidencias de datos sensibles\n\n")
+        
+        # Tabla de metadatos para este archivo
+        parts.append("| Campo | Valor | Sensible | Patrón Coincidente |\n")
+        parts.append("|-------|-------|----------|--------------------|\n")
+        
+        # Añadir cada campo de metadatos
+        for metadata_entry in file_info.get('metadata', []):
+            key = self._sanitize_text(metadata_entry.get('key', ''))
+            raw_value = str(metadata_entry.get('value', '')).replace('|', '\\|').replace('\n', ' ')
+            
+            # Convertir rutas absolutas a relativas si es necesario
+            if os.path.isabs(raw_value) and os.path.exists(raw_value):
+                raw_value = os.path.relpath(raw_value, self.main.src_path)
+            
+            # Sanitizar el valor
+            value = self._sanitize_text(raw_value)
+            
+            is_sensitive = metadata_entry.get('is_sensitive', False)
+            patterns = metadata_entry.get('matching_patterns', [])
+            
+            # Acortar valores demasiado largos
+            if len(value) > 100:
+                value = value[:97] + "..."
                 
-            content += "\n---\n\n"
+            sensitive_status = "Sensible/Yes" if is_sensitive else "No"
+            patterns_str = ", ".join(self._sanitize_text(pattern) for pattern in patterns) if patterns else "-"
+            
+            # Añadir fila a la tabla
+            parts.append(f"| {key} | {value} | {sensitive_status} | {patterns_str} |\n")
             
+        parts.append("\n---\n\n")
+        return "".join(parts)
+    
+    def _markdown_trailer(self):
+        """
+        Genera el pie del informe Markdown: recomendaciones y patrones de detección.
+        
+        Returns:
+            str: Pie del informe
+        """
+        content = ""
         # Añadir recomendaciones
         content += """## Recomendaciones de Seguridad
 
@@ -617,50 +465,62 @@ classoption: oneside
 A continuación se muestran los patrones utilizados por MetaInfo para identificar potencialmente información sensible en los metadatos.
 
 """
-        # Añadir patrones en español
-        content += "### Español\n"
-        spanish_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.SPANISH)
-        content += f"{spanish_patterns}\n\n"
-        
-        # Añadir patrones en inglés
-        content += "### Inglés\n"
-        english_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.ENGLISH)
-        content += f"{english_patterns}\n\n"
-        
-        # Añadir patrones de dispositivos
-        content += "### Metadatos de Dispositivos\n"
-        device_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.DEVICE_METADATA)
-        content += f"{device_patterns}\n\n"
-        
-        # Añadir otros idiomas en sección contraída
-        content += "<details>\n<summary>Patrones en otros idiomas (Francés, Alemán, Italiano, Portugués)</summary>\n\n"
-        
-        # Francés
-        content += "#### Francés\n"
-        french_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.FRENCH)
-        content += f"{french_patterns}\n\n"
-        
-        # Alemán
-        content += "#### Alemán\n"
-        german_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.GERMAN)
-        content += f"{german_patterns}\n\n"
-        
-        # Italiano
-        content += "#### Italiano\n"
-        italian_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.ITALIAN)
-        content += f"{italian_patterns}\n\n"
-        
-        # Portugués
-        content += "#### Portugués\n"
-        portuguese_patterns = ", ".join(f"`{p}`" for p in self.main.sensitive_patterns if p in SensitivePatterns.PORTUGUESE)
-        content += f"{portuguese_patterns}\n\n"
-        
-        content += "</details>\n\n"
+        # Los idiomas menos habituales se muestran en una sección contraída
+        in_details = False
+        for title, patterns, collapsed in self._pattern_groups():
+            if collapsed and not in_details:
+                content += "<details>\n<summary>Patrones en otros idiomas (Francés, Alemán, Italiano, Portugués)</summary>\n\n"
+            elif not collapsed and in_details:
+                content += "</details>\n\n"
+            in_details = collapsed
+            heading = "####" if collapsed else "###"
+            content += f"{heading} {title}\n"
+            content += ", ".join(f"`{p}`" for p in patterns) + "\n\n"
+        if in_details:
+            content += "</details>\n\n"
         
         content += "---\n\n*Informe generado por MetaInfo Tool*\n"
         
         return content
-
+    
+    def _report_title(self):
+        """
+        Obtiene el título del informe según el modo (completo o solo datos sensibles).
+        
+        Returns:
+            str: Título del informe
+        """
+        report_title = "Informe de Análisis de Metadatos"
+        if ParameterValidator.safe_get(self.args, 'only_sensitive', False):
+            report_title += " (Datos Sensibles)"
+        return report_title
+    
+    def _pattern_groups(self):
+        """
+        Agrupa los patrones activos para la sección de patrones de los informes.
+        
+        Returns:
+            list: Tuplas (título, patrones, contraído) en el orden en que se muestran;
+                  los idiomas menos habituales van contraídos y los paquetes cargados
+                  desde YAML al final
+        """
+        groups = [
+            ("Español", SensitivePatterns.SPANISH, False),
+            ("Inglés", SensitivePatterns.ENGLISH, False),
+            ("Metadatos de Dispositivos", SensitivePatterns.DEVICE_METADATA, False),
+            ("Francés", SensitivePatterns.FRENCH, True),
+            ("Alemán", SensitivePatterns.GERMAN, True),
+            ("Italiano", SensitivePatterns.ITALIAN, True),
+            ("Portugués", SensitivePatterns.PORTUGUESE, True),
+        ]
+        result = []
+        for title, members, collapsed in groups:
+            members = set(members)
+            result.append((title, [p for p in self.main.sensitive_patterns if p in members], collapsed))
+        for pack_name, pack_patterns in self.main.pattern_packs.extra_packs().items():
+            result.append((f"Paquete {pack_name}", pack_patterns, False))
+        return result
+    
     def _check_sensitive_data(self, key, val):
         """
         Verifica si una clave o valor contiene datos sensibles.
@@ -674,140 +534,345 @@ A continuación se muestran los patrones utilizados por MetaInfo para identifica
                 - es_sensible: True si se encontró un patrón sensible
                 - patrones_coincidentes: Lista de patrones que coincidieron
         """
-        # Convertir clave y valor a string y normalizar (minúsculas y sin espacios)
-        key_str = str(key).lower().replace(' ', '')
-        val_str = str(val).lower().replace(' ', '')
+        # El índice normaliza y compila los patrones una sola vez al iniciar Main
+        return self.main.pattern_index.check(key, val)
+
+    def _check_sensitive_batch(self, keys, values):
+        """
+        Verifica en bloque columnas de claves y valores de metadatos.
         
-        # Hacer una excepción para ciertas claves
-        if key_str == 'author' and not any(pattern.lower().replace(' ', '') in val_str for pattern in self.main.sensitive_patterns):
-            return False, []
+        Args:
+            keys: Lista de claves de los metadatos
+            values: Lista de valores, alineada con keys
             
-        # Verificar si algún patrón sensible coincide con la clave o el valor
-        is_sensitive = False
-        matching_patterns = []
-
-        # Verificar patrones negativos (insensible a mayúsculas/minúsculas)
-        is_negative = False
-        for negative_pattern in self.main.negative_patterns:
-            # Normalizar el patrón negativo (minúsculas y sin espacios)
-            normalized_pattern = negative_pattern.lower().replace(' ', '')
-            
-            # Comparar versiones normalizadas
-            if normalized_pattern in key_str:
-                is_negative = True
-                break
-            
-        if is_negative:
-            return False, []
-        
-        for pattern in self.main.sensitive_patterns:
-            # Normalizar el patrón sensible (minúsculas y sin espacios)
-            pattern_lower = pattern.lower().replace(' ', '')
-            
-            # Si el patrón tiene 3 o menos caracteres, usar coincidencia exacta
-            if len(pattern_lower) <= 3:
-                if key_str == pattern_lower or val_str == pattern_lower:
-                    is_sensitive = True
-                    matching_patterns.append(pattern)
-            else:
-                if pattern_lower in key_str or pattern_lower in val_str:
-                    is_sensitive = True
-                    matching_patterns.append(pattern)
+        Returns:
+            list: Tupla (es_sensible, patrones_coincidentes) de cada par, en el mismo orden
+        """
+        return self.main.pattern_index.check_batch(keys, values)
+    
+    @staticmethod
+    def _metadata_columns(metadata_list):
+        """
+        Aplana los metadatos de varios archivos en columnas de claves y valores.
         
-        return is_sensitive, matching_patterns
+        Args:
+            metadata_list: Lista con los metadatos de cada archivo (en el formato de Main.inspect)
+            
+        Returns:
+            tuple: (claves, valores) en el orden en que se recorren los metadatos
+        """
+        keys = []
+        values = []
+        for metadata in metadata_list:
+            for data in metadata:
+                if hasattr(data, 'items') and callable(data.items):
+                    for key, val in data.items():
+                        keys.append(key)
+                        values.append(val)
+        return keys, values
 
-    def _process_directory_for_report(self, directory, metadata_info):
+    def _bounded_value(self, val):
+        """
+        Obtiene la versión del valor que se guarda en el informe, con memoria acotada.
+        
+        Los datos binarios se sustituyen por un marcador con su tamaño, los textos
+        más largos que --max_value_length se recortan y las listas se tratan
+        elemento a elemento.
+        
+        Args:
+            val: Valor del metadato
+            
+        Returns:
+            Valor acotado (mismo tipo que val salvo en binarios y textos recortados)
+        """
+        max_length = self.main.pattern_index.max_value_length
+        if isinstance(val, (list, tuple)):
+            return [self._bounded_value(item) for item in val]
+        if PatternIndex.is_binary_value(val):
+            if isinstance(val, str) and val.startswith("(Binary data "):
+                return val
+            size = len(val) * 3 // 4 if isinstance(val, str) and val.startswith("base64:") else len(val)
+            return f"(Binary data {size} bytes)"
+        if isinstance(val, str) and len(val) > max_length:
+            return val[:max_length] + "..."
+        return val
+    
+    def _process_directory_for_report(self, directory, metadata_info, on_file=None):
         """
         Procesa recursivamente un directorio recopilando información de metadatos.
         
+        El trabajo se organiza como una canalización de etapas conectadas por colas
+        acotadas (recorrido → extracción → clasificación → render): los archivos se
+        agrupan en lotes (por número de archivos y por tamaño), los metadatos de
+        cada lote se extraen con una única petición a exiftool y cada archivo
+        clasificado se entrega a on_file mientras el recorrido continúa. Con
+        --workers mayor que 1 la extracción y la clasificación de los lotes se
+        reparten entre varios procesos.
+        
         Args:
             directory: Ruta al directorio a procesar
-            metadata_info: Diccionario donde se almacena la información recopilada
+            metadata_info: Diccionario donde se acumulan los contadores y estadísticas
+            on_file: Función que recibe cada archivo clasificado, en el orden del
+                     recorrido (por defecto se añade a metadata_info['files_info'])
         """
-        lower_extensions = tuple(ext.lower() for ext in self.main.extensions)
-        upper_extensions = tuple(ext.upper() for ext in self.main.extensions)
         only_sensitive = ParameterValidator.safe_get(self.args, 'only_sensitive', False)
         verbose = ParameterValidator.safe_get(self.args, 'verbose', False)
+        workers = max(1, int(self.args.get('workers') or 1))
+        on_file = on_file or metadata_info['files_info'].append
         
         if only_sensitive and verbose:
             Messages.print_debug("Procesando directorio con filtro de solo datos sensibles", verbose=True)
         
-        for item in os.listdir(directory):
-            item_path = os.path.join(directory, item)
+        def render(partial_info):
+            self._merge_key_cache_stats(partial_info.pop('key_cache', {}))
+            files_info = partial_info.pop('files_info', [])
+            self._merge_metadata_info(metadata_info, partial_info)
+            for file_info in files_info:
+                on_file(file_info)
+        
+        batches = self._iter_report_batches(directory)
+        if workers <= 1:
+            ReportPipeline().run(batches, [self._extract_batches, self._classify_batches], render)
+            return
+        
+        Messages.print_debug(f"DEBUG-Reporter - Escaneo paralelo con {workers} procesos", verbose=self.verbose)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                    initializer=ReportWorker.initialize,
+                                                    initargs=(self.args,)) as executor:
+            # Crear los procesos antes de arrancar los hilos de la canalización
+            executor.submit(int).result()
+            ReportPipeline().run(batches, [lambda items: self._scan_batches_in_processes(executor, items, workers)],
+                                 render)
+    
+    def _extract_batches(self, batches):
+        """
+        Etapa de extracción: obtiene los metadatos de cada lote.
+        
+        Args:
+            batches: Iterable de lotes de rutas de archivos
             
-            if os.path.isfile(item_path):
-                # Verificar si el archivo tiene una extensión soportada
-                ext = os.path.splitext(item_path)[1].lower()
-                if ext and (item.lower().endswith(lower_extensions) or item.upper().endswith(upper_extensions)):
-                    metadata_info['total_files'] += 1
-                    Messages.print_debug(Messages.DEBUG_READING_FILE, item_path, verbose=verbose)
-                    
-                    # Actualizar estadísticas de extensiones
-                    if ext not in metadata_info['extensions_stats']:
-                        metadata_info['extensions_stats'][ext] = {
-                            'count': 0,
-                            'with_metadata': 0,
-                            'with_sensitive': 0
-                        }
-                    metadata_info['extensions_stats'][ext]['count'] += 1
-                    
-                    # Recopilar metadatos
-                    metadata = self.main.inspect(item_path)
-                    file_info = {
-                        'file_path': os.path.relpath(item_path, self.main.src_path),
-                        'total_metadata': 0,
-                        'has_sensitive': False,
-                        'metadata': []
-                    }
+        Yields:
+            tuple: (lote, metadatos de cada archivo del lote)
+        """
+        verbose = ParameterValidator.safe_get(self.args, 'verbose', False)
+        for batch in batches:
+            Messages.print_debug(f"DEBUG-Reporter - Extrayendo metadatos de un lote de {len(batch)} archivos", verbose=verbose)
+            yield batch, self.main.inspect_batch(batch)
+    
+    def _classify_batches(self, extracted):
+        """
+        Etapa de clasificación: clasifica los metadatos de cada lote extraído.
+        
+        Args:
+            extracted: Iterable de tuplas (lote, metadatos)
+            
+        Yields:
+            dict: Estructura metadata_info parcial con los resultados de cada lote
+        """
+        for batch, batch_metadata in extracted:
+            partial_info = self.main._initialize_metadata_info()
+            self._classify_report_batch(batch, batch_metadata, partial_info)
+            yield partial_info
+    
+    def _scan_batches_in_processes(self, executor, batches, workers):
+        """
+        Etapa de extracción y clasificación en un pool de procesos, cada uno con su propio exiftool.
+        
+        Como máximo hay workers * 2 lotes en curso, y los resultados se devuelven en el
+        orden de los lotes, de modo que el informe es idéntico al de una ejecución secuencial.
+        
+        Args:
+            executor: ProcessPoolExecutor inicializado con ReportWorker.initialize
+            batches: Iterable de lotes de rutas de archivos
+            workers: Número de procesos
+            
+        Yields:
+            dict: Estructura metadata_info parcial de cada lote (ver ReportWorker.scan_batch)
+        """
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(executor.submit(ReportWorker.scan_batch, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    
+    def _merge_key_cache_stats(self, batch_stats):
+        """
+        Acumula las estadísticas de la caché de claves de un lote procesado en otro proceso.
+        
+        Args:
+            batch_stats: Diccionario con 'hits', 'misses' y 'size' del lote
+        """
+        if not batch_stats:
+            return
+        if self.worker_cache_stats is None:
+            self.worker_cache_stats = {'hits': 0, 'misses': 0, 'size': 0}
+        self.worker_cache_stats['hits'] += batch_stats['hits']
+        self.worker_cache_stats['misses'] += batch_stats['misses']
+        # Cada proceso tiene su propia caché: se informa del tamaño mayor
+        self.worker_cache_stats['size'] = max(self.worker_cache_stats['size'], batch_stats['size'])
+    
+    def _merge_metadata_info(self, metadata_info, partial_info):
+        """
+        Añade los resultados parciales de un lote a la estructura global del informe.
+        
+        Args:
+            metadata_info: Diccionario global con la información recopilada
+            partial_info: Diccionario con la información de un lote
+        """
+        for counter in ('total_files', 'files_with_metadata', 'files_with_sensitive'):
+            metadata_info[counter] += partial_info.get(counter, 0)
+        
+        for ext, stats in partial_info.get('extensions_stats', {}).items():
+            total_stats = metadata_info['extensions_stats'].setdefault(ext, {
+                'count': 0,
+                'with_metadata': 0,
+                'with_sensitive': 0
+            })
+            for name, value in stats.items():
+                total_stats[name] += value
+        
+        metadata_info['files_info'].extend(partial_info.get('files_info', []))
+    
+    def _iter_report_batches(self, directory):
+        """
+        Agrupa los archivos soportados del directorio en lotes de extracción.
+        
+        Con --scan_threads mayor que 1 los subdirectorios se listan en paralelo y los
+        lotes se entregan mientras el recorrido continúa, en el mismo orden.
+        
+        Args:
+            directory: Ruta al directorio a recorrer
+            
+        Yields:
+            list: Lote de rutas limitado por --batch_size archivos y --batch_mb megabytes
+        """
+        batch_size = max(1, int(self.args.get('batch_size') or self.DEFAULT_BATCH_SIZE))
+        batch_bytes = max(1, int(self.args.get('batch_mb') or self.DEFAULT_BATCH_MB)) * 1024 * 1024
+        
+        batch = []
+        pending_bytes = 0
+        for entry in DirectoryWalker(self.main.extensions, workers=self.args.get('scan_threads')).iter_entries(directory):
+            batch.append(entry.path)
+            try:
+                # El DirEntry reutiliza la información de stat del recorrido
+                pending_bytes += entry.stat().st_size
+            except OSError:
+                pass
+            
+            if len(batch) >= batch_size or pending_bytes >= batch_bytes:
+                yield batch
+                batch = []
+                pending_bytes = 0
+        
+        if batch:
+            yield batch
+    
+    def _process_report_batch(self, batch, metadata_info):
+        """
+        Extrae los metadatos de un lote de archivos y los añade al informe.
+        
+        Args:
+            batch: Lista de rutas de archivos
+            metadata_info: Diccionario donde se almacena la información recopilada
+        """
+        for batch, batch_metadata in self._extract_batches([batch]):
+            self._classify_report_batch(batch, batch_metadata, metadata_info)
+    
+    def _classify_report_batch(self, batch, batch_metadata, metadata_info):
+        """
+        Clasifica los metadatos ya extraídos de un lote y los añade al informe.
+        
+        Todos los pares clave/valor del lote se clasifican juntos con
+        _check_sensitive_batch antes de repartirlos entre los archivos.
+        
+        Args:
+            batch: Lista de rutas de archivos
+            batch_metadata: Metadatos de cada archivo (en el formato de Main.inspect)
+            metadata_info: Diccionario donde se almacena la información recopilada
+        """
+        verdicts = iter(self._check_sensitive_batch(*self._metadata_columns(batch_metadata)))
+        for item_path, metadata in zip(batch, batch_metadata):
+            self._add_file_to_report(item_path, metadata, metadata_info, verdicts)
+    
+    def _add_file_to_report(self, item_path, metadata, metadata_info, verdicts=None):
+        """
+        Clasifica los metadatos de un archivo y actualiza las estadísticas del informe.
+        
+        Args:
+            item_path: Ruta al archivo
+            metadata: Metadatos devueltos por Main.inspect para el archivo
+            metadata_info: Diccionario donde se almacena la información recopilada
+            verdicts: Iterador con los veredictos ya calculados de cada par clave/valor,
+                      en el orden de _metadata_columns (None para clasificar aquí)
+        """
+        only_sensitive = ParameterValidator.safe_get(self.args, 'only_sensitive', False)
+        verbose = ParameterValidator.safe_get(self.args, 'verbose', False)
+        ext = os.path.splitext(item_path)[1].lower()
+        
+        metadata_info['total_files'] += 1
+        Messages.print_debug(Messages.DEBUG_READING_FILE, item_path, verbose=verbose)
+        
+        # Actualizar estadísticas de extensiones
+        if ext not in metadata_info['extensions_stats']:
+            metadata_info['extensions_stats'][ext] = {
+                'count': 0,
+                'with_metadata': 0,
+                'with_sensitive': 0
+            }
+        metadata_info['extensions_stats'][ext]['count'] += 1
+        
+        file_info = {
+            'file_path': os.path.relpath(item_path, self.main.src_path),
+            'total_metadata': 0,
+            'has_sensitive': False,
+            'metadata': []
+        }
+        
+        has_metadata = False
+        has_sensitive_data = False
+        sensitive_metadata_count = 0
+        
+        for data in metadata:
+            if hasattr(data, 'items') and callable(data.items):
+                for key, val in data.items():
+                    has_metadata = True
+                    file_info['total_metadata'] += 1
                     
-                    has_metadata = False
-                    has_sensitive_data = False
-                    sensitive_metadata_count = 0
+                    # Verificar si es sensible
+                    if verdicts is not None:
+                        is_sensitive, matching_patterns = next(verdicts)
+                    else:
+                        is_sensitive, matching_patterns = self._check_sensitive_data(key, val)
                     
-                    for data in metadata:
-                        if hasattr(data, 'items') and callable(data.items):
-                            for key, val in data.items():
-                                has_metadata = True
-                                file_info['total_metadata'] += 1
-                                
-                                # Sanitizar clave y valor para la verificación de datos sensibles
-                                clean_key = key
-                                clean_val = val
-                                
-                                # Verificar si es sensible
-                                is_sensitive, matching_patterns = self._check_sensitive_data(clean_key, clean_val)
-                                
-                                if is_sensitive:
-                                    has_sensitive_data = True
-                                    file_info['has_sensitive'] = True
-                                    sensitive_metadata_count += 1
-                                
-                                # Si solo queremos datos sensibles, solo añadir los que son sensibles
-                                if not only_sensitive or is_sensitive:
-                                    metadata_entry = {
-                                        'key': key,
-                                        'value': val,
-                                        'is_sensitive': is_sensitive,
-                                        'matching_patterns': matching_patterns
-                                    }
-                                    file_info['metadata'].append(metadata_entry)
+                    if is_sensitive:
+                        has_sensitive_data = True
+                        file_info['has_sensitive'] = True
+                        sensitive_metadata_count += 1
                     
-                    # Solo incluir archivos con metadatos
-                    if has_metadata:
-                        metadata_info['files_with_metadata'] += 1
-                        metadata_info['extensions_stats'][ext]['with_metadata'] += 1
-                        
-                        if has_sensitive_data:
-                            metadata_info['files_with_sensitive'] += 1
-                            metadata_info['extensions_stats'][ext]['with_sensitive'] += 1
-                            
-                            if only_sensitive and verbose:
-                                Messages.print_debug(f"Archivo {item_path} contiene {sensitive_metadata_count} metadatos sensibles", verbose=True)
-                        
-                        # Si solo queremos datos sensibles, solo incluir archivos que tengan datos sensibles
-                        if not only_sensitive or has_sensitive_data:
-                            metadata_info['files_info'].append(file_info)
-            
-            elif os.path.isdir(item_path):
-                # Procesar subdirectorios recursivamente
-                self._process_directory_for_report(item_path, metadata_info) 
\ No newline at end of file
+                    # Si solo queremos datos sensibles, solo añadir los que son sensibles
+                    if not only_sensitive or is_sensitive:
+                        metadata_entry = {
+                            'key': key,
+                            'value': self._bounded_value(val),
+                            'is_sensitive': is_sensitive,
+                            'matching_patterns': matching_patterns
+                        }
+                        file_info['metadata'].append(metadata_entry)
+        
+        # Solo incluir archivos con metadatos
+        if has_metadata:
+            metadata_info['files_with_metadata'] += 1
+            metadata_info['extensions_stats'][ext]['with_metadata'] += 1
+            
+            if has_sensitive_data:
+                metadata_info['files_with_sensitive'] += 1
+                metadata_info['extensions_stats'][ext]['with_sensitive'] += 1
+                
+                if only_sensitive and verbose:
+                    Messages.print_debug(f"Archivo {item_path} contiene {sensitive_metadata_count} metadatos sensibles", verbose=True)
+            
+            # Si solo queremos datos sensibles, solo incluir archivos que tengan datos sensibles
+            if not only_sensitive or has_sensitive_data:
+                metadata_info['files_info'].append(file_info)
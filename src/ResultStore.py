@@ -0,0 +1,301 @@
+import datetime
+import os
+import sqlite3
+
+
+class ResultStore:
+    """
+    Almacén SQLite de los resultados de los análisis.
+
+    Cada ejecución de --report con --store se guarda como una ejecución (run)
+    con sus archivos, sus campos de metadatos y los patrones que coincidieron
+    con cada campo. La base de datos usa el modo WAL y los registros se
+    insertan por lotes en una sola transacción, de modo que el almacén sigue
+    el ritmo del análisis. Hay índices por etiqueta, patrón, extensión y ruta,
+    así que las consultas habituales ("qué archivos tienen datos GPS") se
+    responden sin volver a analizar ni leer informes.
+
+    Durante el análisis se usa como los escritores de informes (add_file,
+    close y abort); después, query consulta los resultados guardados.
+    """
+
+    # Ubicación predeterminada de la base de datos
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "metainfo", "results.db")
+
+    # Campos de metadatos acumulados antes de escribir un lote
+    BATCH_SIZE = 5000
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            started TEXT NOT NULL,
+            finished TEXT,
+            directory TEXT NOT NULL,
+            only_sensitive INTEGER NOT NULL DEFAULT 0,
+            total_files INTEGER,
+            files_with_metadata INTEGER,
+            files_with_sensitive INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            run_id INTEGER NOT NULL REFERENCES runs(id),
+            path TEXT NOT NULL,
+            extension TEXT NOT NULL,
+            total_metadata INTEGER NOT NULL,
+            has_sensitive INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS fields (
+            id INTEGER PRIMARY KEY,
+            file_id INTEGER NOT NULL REFERENCES files(id),
+            grp TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            value,
+            is_sensitive INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS field_patterns (
+            field_id INTEGER NOT NULL REFERENCES fields(id),
+            pattern TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_files_run ON files(run_id);
+        CREATE INDEX IF NOT EXISTS idx_files_path ON files(path);
+        CREATE INDEX IF NOT EXISTS idx_files_extension ON files(extension);
+        CREATE INDEX IF NOT EXISTS idx_fields_file ON fields(file_id);
+        CREATE INDEX IF NOT EXISTS idx_fields_tag ON fields(tag);
+        CREATE INDEX IF NOT EXISTS idx_field_patterns_pattern ON field_patterns(pattern);
+        CREATE INDEX IF NOT EXISTS idx_field_patterns_field ON field_patterns(field_id);
+    """
+
+    def __init__(self, path=None):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            path: Ruta del archivo SQLite (None para la ubicación predeterminada)
+        """
+        self.path = os.path.abspath(os.path.expanduser(path or self.DEFAULT_PATH))
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Con WAL, NORMAL mantiene la base de datos consistente y evita un fsync por transacción
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.run_id = None
+        self._files = []
+        self._pending_fields = 0
+
+    @staticmethod
+    def split_key(key):
+        """
+        Separa una clave de exiftool en grupo y etiqueta.
+
+        Args:
+            key: Clave con la forma 'Grupo:Etiqueta' (p. ej. 'EXIF:GPSLatitude')
+
+        Returns:
+            tuple: (grupo, etiqueta); el grupo es '' si la clave no tiene grupo
+        """
+        group, _, tag = str(key).rpartition(':')
+        return group, tag
+
+    def begin_run(self, directory, only_sensitive=False):
+        """
+        Registra una nueva ejecución a la que se añadirán los archivos.
+
+        Args:
+            directory: Directorio analizado
+            only_sensitive: True si el análisis solo guarda los campos sensibles
+
+        Returns:
+            int: Identificador de la ejecución
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started, directory, only_sensitive) VALUES (?, ?, ?)",
+                (self._now(), os.path.abspath(directory), int(bool(only_sensitive))))
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def add_file(self, file_info):
+        """
+        Añade un archivo clasificado al lote pendiente.
+
+        Args:
+            file_info: Información del archivo (ver Reporter._add_file_to_report)
+        """
+        file_path = file_info.get('file_path', '')
+        fields = []
+        for metadata_entry in file_info.get('metadata', []):
+            group, tag = self.split_key(metadata_entry.get('key', ''))
+            fields.append((group, tag, self._column_value(metadata_entry.get('value')),
+                           int(bool(metadata_entry.get('is_sensitive', False))),
+                           metadata_entry.get('matching_patterns', [])))
+        self._files.append((file_path, os.path.splitext(file_path)[1].lower(),
+                            file_info.get('total_metadata', 0),
+                            int(bool(file_info.get('has_sensitive', False))), fields))
+        self._pending_fields += len(fields)
+        if self._pending_fields >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """Escribe los archivos pendientes en una sola transacción."""
+        if not self._files:
+            return
+        with self.connection:
+            # Los identificadores se asignan dentro de la transacción para no chocar con otra ejecución
+            self.connection.execute("BEGIN IMMEDIATE")
+            file_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM files").fetchone()[0]
+            field_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM fields").fetchone()[0]
+            file_rows, field_rows, pattern_rows = [], [], []
+            for path, extension, total_metadata, has_sensitive, fields in self._files:
+                file_id += 1
+                file_rows.append((file_id, self.run_id, path, extension, total_metadata, has_sensitive))
+                for group, tag, value, is_sensitive, patterns in fields:
+                    field_id += 1
+                    field_rows.append((field_id, file_id, group, tag, value, is_sensitive))
+                    pattern_rows.extend((field_id, pattern) for pattern in patterns)
+            self.connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", file_rows)
+            self.connection.executemany("INSERT INTO fields VALUES (?, ?, ?, ?, ?, ?)", field_rows)
+            self.connection.executemany("INSERT INTO field_patterns VALUES (?, ?)", pattern_rows)
+        self._files = []
+        self._pending_fields = 0
+
+    def close(self, src_path, metadata_info):
+        """
+        Escribe los archivos pendientes y los totales de la ejecución, y cierra la base de datos.
+
+        Args:
+            src_path: Ruta al directorio procesado
+            metadata_info: Diccionario con los contadores del análisis
+
+        Returns:
+            str: Ruta de la base de datos
+        """
+        try:
+            self.flush()
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE runs SET finished = ?, total_files = ?, files_with_metadata = ?, "
+                    "files_with_sensitive = ? WHERE id = ?",
+                    (self._now(), metadata_info.get('total_files', 0), metadata_info.get('files_with_metadata', 0),
+                     metadata_info.get('files_with_sensitive', 0), self.run_id))
+            # Actualiza las estadísticas del planificador si han cambiado lo suficiente
+            self.connection.execute("PRAGMA optimize")
+        finally:
+            self.connection.close()
+        return self.path
+
+    def abort(self):
+        """Descarta la ejecución en curso y cierra la base de datos."""
+        self._files = []
+        self._pending_fields = 0
+        try:
+            if self.run_id is not None:
+                with self.connection:
+                    self.connection.execute(
+                        "DELETE FROM field_patterns WHERE field_id IN (SELECT fields.id FROM fields "
+                        "JOIN files ON files.id = fields.file_id WHERE files.run_id = ?)", (self.run_id,))
+                    self.connection.execute(
+                        "DELETE FROM fields WHERE file_id IN (SELECT id FROM files WHERE run_id = ?)", (self.run_id,))
+                    self.connection.execute("DELETE FROM files WHERE run_id = ?", (self.run_id,))
+                    self.connection.execute("DELETE FROM runs WHERE id = ?", (self.run_id,))
+        finally:
+            self.connection.close()
+
+    def runs(self):
+        """
+        Lista las ejecuciones guardadas.
+
+        Returns:
+            list: Tuplas (id, inicio, fin, directorio, archivos, con metadatos, con datos sensibles)
+        """
+        return self.connection.execute(
+            "SELECT id, started, finished, directory, total_files, files_with_metadata, files_with_sensitive "
+            "FROM runs ORDER BY id").fetchall()
+
+    def latest_run(self):
+        """Devuelve el identificador de la última ejecución completada o None si no hay ninguna."""
+        row = self.connection.execute("SELECT MAX(id) FROM runs WHERE finished IS NOT NULL").fetchone()
+        return row[0]
+
+    def query(self, tag=None, group=None, pattern=None, extension=None, path=None, value=None,
+              sensitive=False, run_id=None, files_only=False, limit=None):
+        """
+        Busca campos (o archivos) guardados.
+
+        Los filtros de texto aceptan comodines GLOB ('*', '?') y distinguen
+        mayúsculas; un prefijo sin comodín inicial ('GPS*') usa los índices.
+
+        Args:
+            tag: Etiqueta del campo, sin grupo (p. ej. 'GPS*')
+            group: Grupo del campo (p. ej. 'EXIF')
+            pattern: Patrón sensible que coincidió (p. ej. 'gps' o 'valor:email')
+            extension: Extensión del archivo, con o sin punto
+            path: Ruta relativa del archivo
+            value: Valor del campo
+            sensitive: True para devolver solo campos sensibles
+            run_id: Ejecución consultada (None para la última completada)
+            files_only: True para devolver solo las rutas distintas de los archivos
+            limit: Número máximo de resultados
+
+        Returns:
+            list: Tuplas (ejecución, ruta) con files_only o (ejecución, ruta, grupo, etiqueta,
+                  valor, sensible, patrones) en caso contrario
+        """
+        if run_id is None:
+            run_id = self.latest_run()
+
+        # La tabla del filtro más selectivo encabeza la consulta (CROSS JOIN fija el orden en
+        # SQLite); el filtro por ejecución casi nunca es selectivo y solo se comprueba
+        conditions = ["files.run_id = ?"]
+        params = [run_id]
+        if pattern is not None:
+            source = ("field_patterns CROSS JOIN fields ON fields.id = field_patterns.field_id "
+                      "CROSS JOIN files ON files.id = fields.file_id")
+            conditions.append("field_patterns.pattern GLOB ?")
+            params.append(pattern)
+        elif tag is not None:
+            source = "fields CROSS JOIN files ON files.id = fields.file_id"
+        else:
+            source = "files CROSS JOIN fields ON fields.file_id = files.id"
+            if path is not None or extension is not None:
+                # El + impide usar el índice de la ejecución en lugar del de la ruta o la extensión
+                conditions[0] = "+files.run_id = ?"
+
+        for column, filter_value in (("fields.tag", tag), ("fields.grp", group),
+                                     ("files.path", path), ("fields.value", value)):
+            if filter_value is not None:
+                conditions.append(f"{column} GLOB ?")
+                params.append(filter_value)
+        if extension is not None:
+            conditions.append("files.extension = ?")
+            params.append('.' + extension.lower().lstrip('.'))
+        if sensitive:
+            conditions.append("fields.is_sensitive = 1")
+
+        if files_only:
+            sql = "SELECT DISTINCT files.run_id, files.path"
+        else:
+            sql = ("SELECT files.run_id, files.path, fields.grp, fields.tag, fields.value, fields.is_sensitive, "
+                   "(SELECT GROUP_CONCAT(pattern, ', ') FROM field_patterns WHERE field_id = fields.id)")
+        sql += f" FROM {source} WHERE " + " AND ".join(conditions) + " ORDER BY files.id, fields.id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self.connection.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _column_value(value):
+        """Convierte un valor de metadatos en un valor que SQLite puede guardar."""
+        if value is None or isinstance(value, (str, float)):
+            return value
+        # SQLite guarda enteros de 64 bits como máximo
+        if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            return value
+        return str(value)
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
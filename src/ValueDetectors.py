@@ -0,0 +1,152 @@
+import ipaddress
+import re
+
+
+class ValueDetectors:
+    """
+    Detectores de datos sensibles en el contenido de los valores.
+
+    Complementan a los patrones de SensitivePatterns, que solo buscan palabras:
+    un correo electrónico, un teléfono o unas coordenadas en una etiqueta de
+    nombre inocuo se reconocen por su forma. Todos los detectores se combinan
+    en una única expresión regular compilada, de modo que cada valor se recorre
+    una sola vez; las coincidencias se confirman después con validaciones
+    específicas (octetos IPv4 y contexto de versión, rangos GPS, dígito de control IBAN, algoritmo de
+    Luhn) para descartar falsos positivos.
+    """
+
+    # Nombres con los que se informan las coincidencias, en el orden en que se listan
+    DETECTORS = {
+        "email": "valor:email",
+        "phone": "valor:telefono",
+        "ipv4": "valor:ipv4",
+        "ipv6": "valor:ipv6",
+        "mac": "valor:mac",
+        "gps": "valor:gps",
+        "iban": "valor:iban",
+        "card": "valor:tarjeta",
+    }
+
+    # Alternativas con nombre; los grupos internos no capturan salvo el separador MAC.
+    # La parte local del correo solo empieza al principio de una secuencia de caracteres
+    # válidos: sin la aserción, un texto largo sin '@' se recorre de nuevo desde cada posición
+    PATTERN = re.compile(r"""
+        (?P<email>(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})
+      | (?P<mac>(?<![\w:-])[0-9A-Fa-f]{2}(?P<mac_sep>[:-])(?:[0-9A-Fa-f]{2}(?P=mac_sep)){4}[0-9A-Fa-f]{2}(?![\w:-]))
+      | (?P<ipv6>(?<![\w:.])(?=[0-9A-Fa-f]*:[0-9A-Fa-f]*:)[0-9A-Fa-f:]{2,39}(?:(?<=:)\d{1,3}(?:\.\d{1,3}){3})?(?![\w:.]))
+      | (?P<ipv4>(?<![\w.])(?:\d{1,3}\.){3}\d{1,3}(?![\w.]))
+      | (?P<gps>(?<![\w.])[-+]?\d{1,2}\.\d{4,}\s*,\s*[-+]?\d{1,3}\.\d{4,}(?![\w.])
+               |(?<![\w.])[-+]\d{2}(?:\.\d+)?[-+]\d{3}(?:\.\d+)?(?:[-+]\d+(?:\.\d+)?)?/
+               |\d{1,3}\s*(?:°|deg)\s*\d{1,2}\s*'\s*\d{1,2}(?:\.\d+)?\s*"?\s*[NSEW]\b)
+      | (?P<iban>\b[A-Z]{2}\d{2}(?:\ ?[A-Z0-9]{4}){2,7}(?:\ ?[A-Z0-9]{1,4})?\b)
+      | (?P<phone>(?<![\w+])\+\d{1,3}[\ .-]?(?:\(\d{1,4}\)[\ .-]?)?\d{2,4}(?:[\ .-]?\d{2,4}){1,4}(?!\d)
+                 |(?<![\w(])\(\d{2,4}\)\ ?\d{3,4}[\ .-]\d{3,4}(?!\d))
+      | (?P<card>(?<![\d-])\d(?:[\ -]?\d){12,18}(?![\d-]))
+    """, re.VERBOSE)
+
+    # Palabras tras las que una IPv4 es en realidad un número de versión: indicadores de
+    # versión ("Ver. 1.2.3.4", "build 1.0.2.4") y nombres de programas y sistemas
+    # ("Adobe Photoshop 5.1.2.3"). Tras cualquier otra palabra se trata como dirección
+    IPV4_VERSION_WORDS = frozenset([
+        "v", "ver", "version", "versión", "versao", "versão", "build", "firmware", "fw", "sw",
+        "release", "rel", "rev", "revision", "revisión", "update", "patch", "sdk",
+        "driver", "bios", "kernel", "software",
+        "adobe", "photoshop", "lightroom", "illustrator", "indesign", "acrobat",
+        "gimp", "exiftool", "windows", "android", "ios", "macos", "osx", "linux", "ubuntu",
+        "office", "word", "excel", "powerpoint", "libreoffice", "openoffice", "picasa",
+        "chrome", "firefox", "safari", "java", "python",
+    ])
+    PREVIOUS_WORD_RE = re.compile(r'(\w+)\s*[.(]?\s*$')
+
+    # Prefijos de las principales redes de tarjetas (Visa, Mastercard, Amex, Discover)
+    CARD_PREFIX_RE = re.compile(r'^(?:4|5[1-5]|2[2-7]|3[47]|6011|65)')
+
+    @classmethod
+    def detect(cls, text):
+        """
+        Busca datos sensibles en un texto con una única pasada de la expresión combinada.
+
+        Args:
+            text: Texto del valor (sin normalizar)
+
+        Returns:
+            list: Nombres de los detectores que coinciden ('valor:email', ...), en el orden de DETECTORS
+        """
+        found = set()
+        for match in cls.PATTERN.finditer(text):
+            name = match.lastgroup
+            if name == "mac_sep":
+                name = "mac"
+            if name not in found and cls._validate(name, match):
+                found.add(name)
+        return [label for name, label in cls.DETECTORS.items() if name in found]
+
+    @classmethod
+    def _validate(cls, name, match):
+        """Confirma una coincidencia con la validación propia de cada detector."""
+        value = match.group(name)
+        if name == "ipv4":
+            return cls._valid_ipv4(value, match.string[:match.start(name)])
+        if name == "ipv6":
+            if not any(char.isalnum() for char in value):
+                return False
+            try:
+                ipaddress.IPv6Address(value)
+            except ValueError:
+                return False
+            return True
+        if name == "gps":
+            return cls._valid_coordinates(value)
+        if name == "iban":
+            return cls._valid_iban(value)
+        if name == "card":
+            digits = re.sub(r'[ -]', '', value)
+            return 13 <= len(digits) <= 19 and bool(cls.CARD_PREFIX_RE.match(digits)) and cls._luhn(digits)
+        return True
+
+    @classmethod
+    def _valid_ipv4(cls, value, before):
+        """
+        Comprueba los octetos de una IPv4 y descarta las que parecen números de versión.
+
+        Se rechazan las direcciones de red con último octeto 0 (como "1.0.0.0") y las
+        que siguen a un indicador de versión o al nombre de un programa.
+        """
+        octets = [int(octet) for octet in value.split('.')]
+        if any(octet > 255 for octet in octets) or octets[0] == 0 or octets[3] == 0:
+            return False
+        previous = cls.PREVIOUS_WORD_RE.search(before[-40:])
+        return previous is None or previous.group(1).lower() not in cls.IPV4_VERSION_WORDS
+
+    @staticmethod
+    def _valid_coordinates(value):
+        """Comprueba que latitud y longitud estén en rango (formato decimal; DMS se acepta tal cual)."""
+        numbers = re.findall(r'[-+]?\d+(?:\.\d+)?', value)
+        if "°" in value or "deg" in value:
+            return True
+        if len(numbers) < 2:
+            return False
+        return abs(float(numbers[0])) <= 90 and abs(float(numbers[1])) <= 180
+
+    @staticmethod
+    def _valid_iban(value):
+        """Comprueba la longitud y el dígito de control (módulo 97) de un IBAN."""
+        iban = value.replace(' ', '')
+        if not 15 <= len(iban) <= 34:
+            return False
+        rearranged = iban[4:] + iban[:4]
+        digits = "".join(str(int(char, 36)) for char in rearranged)
+        return int(digits) % 97 == 1
+
+    @staticmethod
+    def _luhn(digits):
+        """Comprueba el dígito de control de Luhn de un número de tarjeta."""
+        total = 0
+        for position, char in enumerate(reversed(digits)):
+            digit = int(char)
+            if position % 2:
+                digit *= 2
+                if digit > 9:
+                    digit -= 9
+            total += digit
+        return total % 10 == 0
@@ -0,0 +1,63 @@
+import os
+import datetime
+
+
+class BaseReader:
+    """
+    Clase base de los lectores nativos de metadatos.
+
+    Cada lector declara las extensiones que entiende y devuelve un diccionario
+    con las mismas claves 'Grupo:Etiqueta' que exiftool -G -n, o None si el
+    archivo no tiene el formato esperado y debe leerse con exiftool.
+    """
+
+    # Extensiones (en minúsculas y sin punto) que el lector sabe interpretar
+    EXTENSIONS = ()
+
+    @classmethod
+    def read(cls, file_path):
+        """
+        Lee los metadatos de un archivo.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            dict: Metadatos del archivo o None si no se pudieron interpretar
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def file_metadata(file_path, file_type, extension, mime_type):
+        """
+        Obtiene los campos del grupo File que exiftool añade a todos los archivos.
+
+        Args:
+            file_path: Ruta al archivo
+            file_type: Tipo de archivo según exiftool (p. ej. 'JPEG')
+            extension: Extensión canónica del tipo (p. ej. 'JPG')
+            mime_type: Tipo MIME del archivo
+
+        Returns:
+            dict: Campos SourceFile y File:*
+        """
+        stat = os.stat(file_path)
+        return {
+            'SourceFile': file_path,
+            'File:FileName': os.path.basename(file_path),
+            'File:Directory': os.path.dirname(file_path) or '.',
+            'File:FileSize': stat.st_size,
+            'File:FileModifyDate': BaseReader._format_timestamp(stat.st_mtime),
+            'File:FileAccessDate': BaseReader._format_timestamp(stat.st_atime),
+            'File:FileInodeChangeDate': BaseReader._format_timestamp(stat.st_ctime),
+            'File:FilePermissions': int(oct(stat.st_mode)[2:]),
+            'File:FileType': file_type,
+            'File:FileTypeExtension': extension,
+            'File:MIMEType': mime_type,
+        }
+
+    @staticmethod
+    def _format_timestamp(timestamp):
+        """Formatea una marca de tiempo como exiftool ('AAAA:MM:DD HH:MM:SS+HH:MM')."""
+        value = datetime.datetime.fromtimestamp(timestamp).astimezone().strftime("%Y:%m:%d %H:%M:%S%z")
+        return value[:-2] + ':' + value[-2:]
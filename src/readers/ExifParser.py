@@ -0,0 +1,237 @@
+import struct
+
+
+class ExifParser:
+    """
+    Intérprete de bloques EXIF (estructura TIFF) sin dependencias externas.
+
+    Devuelve los valores con las mismas claves 'EXIF:Etiqueta' y el mismo formato
+    numérico que exiftool -G -n. Las etiquetas desconocidas, la miniatura (IFD1)
+    y las MakerNotes propietarias no se interpretan.
+    """
+
+    # Etiquetas de IFD0 y de la subIFD Exif
+    EXIF_TAGS = {
+        0x010e: "ImageDescription",
+        0x010f: "Make",
+        0x0110: "Model",
+        0x0112: "Orientation",
+        0x011a: "XResolution",
+        0x011b: "YResolution",
+        0x0128: "ResolutionUnit",
+        0x0131: "Software",
+        0x0132: "ModifyDate",
+        0x013b: "Artist",
+        0x013c: "HostComputer",
+        0x0213: "YCbCrPositioning",
+        0x8298: "Copyright",
+        0x829a: "ExposureTime",
+        0x829d: "FNumber",
+        0x8822: "ExposureProgram",
+        0x8827: "ISO",
+        0x9000: "ExifVersion",
+        0x9003: "DateTimeOriginal",
+        0x9004: "CreateDate",
+        0x9010: "OffsetTime",
+        0x9011: "OffsetTimeOriginal",
+        0x9012: "OffsetTimeDigitized",
+        0x9201: "ShutterSpeedValue",
+        0x9202: "ApertureValue",
+        0x9204: "ExposureCompensation",
+        0x9207: "MeteringMode",
+        0x9209: "Flash",
+        0x920a: "FocalLength",
+        0x9286: "UserComment",
+        0x9290: "SubSecTime",
+        0x9291: "SubSecTimeOriginal",
+        0x9292: "SubSecTimeDigitized",
+        0x9c9b: "XPTitle",
+        0x9c9c: "XPComment",
+        0x9c9d: "XPAuthor",
+        0x9c9e: "XPKeywords",
+        0x9c9f: "XPSubject",
+        0xa001: "ColorSpace",
+        0xa002: "ExifImageWidth",
+        0xa003: "ExifImageHeight",
+        0xa402: "ExposureMode",
+        0xa403: "WhiteBalance",
+        0xa405: "FocalLengthIn35mmFormat",
+        0xa406: "SceneCaptureType",
+        0xa420: "ImageUniqueID",
+        0xa430: "OwnerName",
+        0xa431: "SerialNumber",
+        0xa432: "LensInfo",
+        0xa433: "LensMake",
+        0xa434: "LensModel",
+        0xa435: "LensSerialNumber",
+    }
+
+    # Etiquetas de la subIFD GPS
+    GPS_TAGS = {
+        0x0000: "GPSVersionID",
+        0x0001: "GPSLatitudeRef",
+        0x0002: "GPSLatitude",
+        0x0003: "GPSLongitudeRef",
+        0x0004: "GPSLongitude",
+        0x0005: "GPSAltitudeRef",
+        0x0006: "GPSAltitude",
+        0x0007: "GPSTimeStamp",
+        0x000c: "GPSSpeedRef",
+        0x000d: "GPSSpeed",
+        0x0010: "GPSImgDirectionRef",
+        0x0011: "GPSImgDirection",
+        0x0012: "GPSMapDatum",
+        0x001b: "GPSProcessingMethod",
+        0x001d: "GPSDateStamp",
+    }
+
+    EXIF_IFD_POINTER = 0x8769
+    GPS_IFD_POINTER = 0x8825
+
+    # Tamaño en bytes de cada tipo TIFF
+    TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8}
+
+    @classmethod
+    def parse(cls, data):
+        """
+        Interpreta un bloque TIFF/EXIF.
+
+        Args:
+            data: Bytes que empiezan por la cabecera TIFF ('II' o 'MM')
+
+        Returns:
+            dict: Metadatos con claves 'EXIF:Etiqueta'
+        """
+        if len(data) < 8 or data[:2] not in (b'II', b'MM'):
+            return {}
+
+        endian = '<' if data[:2] == b'II' else '>'
+        ifd0_offset = struct.unpack(endian + 'I', data[4:8])[0]
+        metadata = {}
+        visited = set()
+
+        ifd0 = cls._read_ifd(data, ifd0_offset, endian, visited)
+        cls._add_tags(metadata, ifd0, cls.EXIF_TAGS)
+
+        if cls.EXIF_IFD_POINTER in ifd0:
+            exif_ifd = cls._read_ifd(data, cls._first(ifd0[cls.EXIF_IFD_POINTER]), endian, visited)
+            cls._add_tags(metadata, exif_ifd, cls.EXIF_TAGS)
+
+        if cls.GPS_IFD_POINTER in ifd0:
+            gps_ifd = cls._read_ifd(data, cls._first(ifd0[cls.GPS_IFD_POINTER]), endian, visited)
+            cls._add_gps_tags(metadata, gps_ifd)
+
+        return metadata
+
+    @classmethod
+    def _read_ifd(cls, data, offset, endian, visited):
+        """Lee las entradas de un IFD como diccionario {etiqueta: (tipo, valor)}."""
+        entries = {}
+        if offset in visited or offset + 2 > len(data):
+            return entries
+        visited.add(offset)
+
+        count = struct.unpack(endian + 'H', data[offset:offset + 2])[0]
+        for i in range(count):
+            entry_offset = offset + 2 + i * 12
+            if entry_offset + 12 > len(data):
+                break
+            tag, tag_type, value_count = struct.unpack(endian + 'HHI', data[entry_offset:entry_offset + 8])
+            size = cls.TYPE_SIZES.get(tag_type)
+            if size is None:
+                continue
+
+            total = size * value_count
+            if total <= 4:
+                raw = data[entry_offset + 8:entry_offset + 8 + total]
+            else:
+                value_offset = struct.unpack(endian + 'I', data[entry_offset + 8:entry_offset + 12])[0]
+                if value_offset + total > len(data):
+                    continue
+                raw = data[value_offset:value_offset + total]
+
+            entries[tag] = (tag_type, cls._decode(raw, tag_type, value_count, endian))
+        return entries
+
+    @classmethod
+    def _decode(cls, raw, tag_type, count, endian):
+        """Convierte el valor bruto de una entrada al tipo Python correspondiente."""
+        if tag_type == 2:
+            return raw.split(b'\x00', 1)[0].decode('utf-8', errors='replace').strip()
+        if tag_type in (1, 6, 7):
+            return raw
+        if tag_type in (5, 10):
+            fmt = 'I' if tag_type == 5 else 'i'
+            values = []
+            for i in range(count):
+                num, den = struct.unpack(endian + fmt * 2, raw[i * 8:i * 8 + 8])
+                values.append(num / den if den else 0)
+            return values
+
+        fmt = {3: 'H', 4: 'I', 8: 'h', 9: 'i', 11: 'f', 12: 'd'}[tag_type]
+        return list(struct.unpack(endian + fmt * count, raw))
+
+    @classmethod
+    def _add_tags(cls, metadata, entries, names):
+        """Añade al resultado las etiquetas conocidas de un IFD."""
+        for tag, (tag_type, value) in entries.items():
+            name = names.get(tag)
+            if name is None:
+                continue
+            if name.startswith('XP'):
+                value = bytes(value).decode('utf-16-le', errors='replace').rstrip('\x00')
+            elif name == 'UserComment':
+                value = cls._decode_user_comment(value)
+            elif tag_type == 7:
+                value = value.decode('ascii', errors='replace').rstrip('\x00')
+            else:
+                value = cls._format(value)
+            if value != '':
+                metadata[f"EXIF:{name}"] = value
+
+    @classmethod
+    def _add_gps_tags(cls, metadata, entries):
+        """Añade las etiquetas GPS con las conversiones numéricas de exiftool -n."""
+        for tag, (tag_type, value) in entries.items():
+            name = cls.GPS_TAGS.get(tag)
+            if name is None:
+                continue
+            if name in ('GPSLatitude', 'GPSLongitude') and len(value) == 3:
+                value = round(value[0] + value[1] / 60 + value[2] / 3600, 10)
+            elif name == 'GPSTimeStamp' and len(value) == 3:
+                value = "%d:%d:%s" % (value[0], value[1], cls._format(value[2]))
+            elif name == 'GPSVersionID':
+                value = " ".join(str(b) for b in bytes(value))
+            elif name == 'GPSAltitudeRef':
+                value = bytes(value)[0] if value else 0
+            elif name == 'GPSProcessingMethod':
+                value = cls._decode_user_comment(value)
+            else:
+                value = cls._format(value)
+            metadata[f"EXIF:{name}"] = value
+
+    @staticmethod
+    def _decode_user_comment(value):
+        """Decodifica un UserComment quitando el prefijo de 8 bytes del juego de caracteres."""
+        prefix, text = bytes(value[:8]), bytes(value[8:])
+        if prefix.startswith(b'UNICODE'):
+            return text.decode('utf-16', errors='replace').rstrip('\x00').strip()
+        return text.decode('utf-8', errors='replace').rstrip('\x00').strip()
+
+    @staticmethod
+    def _format(value):
+        """Formatea una lista de valores como lo hace exiftool -n (separados por espacios)."""
+        if isinstance(value, (bytes, bytearray)):
+            return " ".join(str(b) for b in value)
+        if isinstance(value, list):
+            values = [int(v) if isinstance(v, float) and v.is_integer() else v for v in value]
+            if len(values) == 1:
+                return values[0]
+            return " ".join(str(v) for v in values)
+        return value
+
+    @staticmethod
+    def _first(entry):
+        """Obtiene el primer valor numérico de una entrada (punteros a subIFD)."""
+        value = entry[1]
+        return value[0] if isinstance(value, list) and value else 0
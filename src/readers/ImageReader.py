@@ -0,0 +1,262 @@
+import re
+import struct
+import zlib
+
+from src.readers.BaseReader import BaseReader
+from src.readers.ExifParser import ExifParser
+from src.readers.XmpParser import XmpParser
+
+
+class ImageReader(BaseReader):
+    """
+    Lector nativo de metadatos de imágenes JPEG y PNG.
+
+    Solo recorre los segmentos APPn/COM/SOF de los JPEG y los fragmentos
+    auxiliares de los PNG, saltando los datos de imagen con seek sin
+    decodificar ningún píxel.
+    """
+
+    EXTENSIONS = ("jpg", "jpeg", "png")
+
+    JPEG_SIGNATURE = b'\xff\xd8'
+    PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+    XMP_HEADER = b'http://ns.adobe.com/xap/1.0/\x00'
+    PHOTOSHOP_HEADER = b'Photoshop 3.0\x00'
+
+    # Marcadores SOF con las dimensiones de la imagen (excluye DHT, JPG y DAC)
+    SOF_MARKERS = frozenset(range(0xc0, 0xd0)) - {0xc4, 0xc8, 0xcc}
+
+    # Fragmentos PNG que contienen metadatos
+    PNG_METADATA_CHUNKS = (b'IHDR', b'tEXt', b'zTXt', b'iTXt', b'eXIf', b'pHYs', b'tIME')
+
+    # Tamaño máximo descomprimido de un fragmento de texto PNG
+    MAX_TEXT_SIZE = 1024 * 1024
+
+    # Conjuntos de datos IPTC del registro 2 (Application Record)
+    IPTC_TAGS = {
+        5: "ObjectName",
+        25: "Keywords",
+        55: "DateCreated",
+        60: "TimeCreated",
+        80: "By-line",
+        85: "By-lineTitle",
+        90: "City",
+        92: "Sub-location",
+        95: "Province-State",
+        101: "Country-PrimaryLocationName",
+        105: "Headline",
+        110: "Credit",
+        115: "Source",
+        116: "CopyrightNotice",
+        118: "Contact",
+        120: "Caption-Abstract",
+        122: "Writer-Editor",
+    }
+
+    @classmethod
+    def read(cls, file_path):
+        """
+        Lee los metadatos de una imagen JPEG o PNG.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            dict: Metadatos de la imagen o None si no es un JPEG/PNG válido
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                signature = f.read(8)
+                if signature.startswith(cls.JPEG_SIGNATURE):
+                    f.seek(2)
+                    return cls._read_jpeg(f, file_path)
+                if signature == cls.PNG_SIGNATURE:
+                    return cls._read_png(f, file_path)
+        except (OSError, struct.error, ValueError, zlib.error):
+            return None
+        return None
+
+    @classmethod
+    def _read_jpeg(cls, f, file_path):
+        """Recorre los segmentos de un JPEG hasta el inicio de los datos de imagen (SOS)."""
+        metadata = cls.file_metadata(file_path, 'JPEG', 'JPG', 'image/jpeg')
+
+        while True:
+            byte = f.read(1)
+            if byte != b'\xff':
+                break
+            marker = f.read(1)
+            while marker == b'\xff':
+                marker = f.read(1)
+            if not marker:
+                break
+
+            code = marker[0]
+            if code == 0x01 or 0xd0 <= code <= 0xd8:
+                # Marcadores sin longitud
+                continue
+            if code in (0xd9, 0xda):
+                # Fin de imagen o inicio de los datos comprimidos
+                break
+
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                break
+            length = struct.unpack('>H', length_bytes)[0] - 2
+            if length < 0:
+                return None
+
+            if code in (0xe0, 0xe1, 0xed, 0xfe) or code in cls.SOF_MARKERS:
+                segment = f.read(length)
+                cls._parse_jpeg_segment(code, segment, metadata)
+            else:
+                f.seek(length, 1)
+
+        return metadata
+
+    @classmethod
+    def _parse_jpeg_segment(cls, code, segment, metadata):
+        """Interpreta un segmento JPEG con metadatos."""
+        if code == 0xe0 and segment.startswith(b'JFIF\x00') and len(segment) >= 12:
+            major, minor, unit, x_res, y_res = struct.unpack('>BBBHH', segment[5:12])
+            metadata['JFIF:JFIFVersion'] = f"{major} {minor}"
+            metadata['JFIF:ResolutionUnit'] = unit
+            metadata['JFIF:XResolution'] = x_res
+            metadata['JFIF:YResolution'] = y_res
+        elif code == 0xe1 and segment.startswith(b'Exif\x00\x00'):
+            metadata.update(ExifParser.parse(segment[6:]))
+        elif code == 0xe1 and segment.startswith(cls.XMP_HEADER):
+            metadata.update(XmpParser.parse(segment[len(cls.XMP_HEADER):]))
+        elif code == 0xed and segment.startswith(cls.PHOTOSHOP_HEADER):
+            metadata.update(cls._parse_photoshop(segment[len(cls.PHOTOSHOP_HEADER):]))
+        elif code == 0xfe:
+            metadata['File:Comment'] = segment.decode('utf-8', errors='replace').rstrip('\x00')
+        elif code in cls.SOF_MARKERS and len(segment) >= 6:
+            bits, height, width, components = struct.unpack('>BHHB', segment[:6])
+            metadata['File:ImageWidth'] = width
+            metadata['File:ImageHeight'] = height
+            metadata['File:BitsPerSample'] = bits
+            metadata['File:ColorComponents'] = components
+
+    @classmethod
+    def _parse_photoshop(cls, data):
+        """Busca el bloque IPTC (recurso 0x0404) dentro de los recursos de Photoshop."""
+        pos = 0
+        while pos + 12 <= len(data) and data[pos:pos + 4] == b'8BIM':
+            resource_id = struct.unpack('>H', data[pos + 4:pos + 6])[0]
+            name_length = data[pos + 6]
+            pos += 7 + name_length
+            if (name_length + 1) % 2:
+                pos += 1
+            size = struct.unpack('>I', data[pos:pos + 4])[0]
+            pos += 4
+            if resource_id == 0x0404:
+                return cls._parse_iptc(data[pos:pos + size])
+            pos += size + (size % 2)
+        return {}
+
+    @classmethod
+    def _parse_iptc(cls, data):
+        """Interpreta los conjuntos de datos IPTC del registro 2."""
+        metadata = {}
+        pos = 0
+        while pos + 5 <= len(data) and data[pos] == 0x1c:
+            record, dataset, size = struct.unpack('>BBH', data[pos + 1:pos + 5])
+            pos += 5
+            if size & 0x8000:
+                # Conjunto de datos extendido, no utilizado en metadatos de texto
+                break
+            value = data[pos:pos + size].decode('utf-8', errors='replace')
+            pos += size
+
+            name = cls.IPTC_TAGS.get(dataset) if record == 2 else None
+            if name is None:
+                continue
+            key = f"IPTC:{name}"
+            if key in metadata:
+                previous = metadata[key] if isinstance(metadata[key], list) else [metadata[key]]
+                metadata[key] = previous + [value]
+            else:
+                metadata[key] = value
+        return metadata
+
+    @classmethod
+    def _read_png(cls, f, file_path):
+        """Recorre los fragmentos de un PNG leyendo solo los que contienen metadatos."""
+        metadata = cls.file_metadata(file_path, 'PNG', 'PNG', 'image/png')
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, chunk_type = struct.unpack('>I4s', header)
+
+            if chunk_type in cls.PNG_METADATA_CHUNKS:
+                data = f.read(length)
+                f.seek(4, 1)
+                cls._parse_png_chunk(chunk_type, data, metadata)
+            else:
+                # Saltar datos de imagen y CRC sin leerlos
+                f.seek(length + 4, 1)
+
+            if chunk_type == b'IEND':
+                break
+
+        return metadata
+
+    @classmethod
+    def _parse_png_chunk(cls, chunk_type, data, metadata):
+        """Interpreta un fragmento PNG con metadatos."""
+        if chunk_type == b'IHDR' and len(data) >= 13:
+            width, height, depth, color, compression, filter_method, interlace = struct.unpack('>IIBBBBB', data[:13])
+            metadata.update({
+                'PNG:ImageWidth': width,
+                'PNG:ImageHeight': height,
+                'PNG:BitDepth': depth,
+                'PNG:ColorType': color,
+                'PNG:Compression': compression,
+                'PNG:Filter': filter_method,
+                'PNG:Interlace': interlace,
+            })
+        elif chunk_type == b'pHYs' and len(data) >= 9:
+            x, y, unit = struct.unpack('>IIB', data[:9])
+            metadata.update({'PNG:PixelsPerUnitX': x, 'PNG:PixelsPerUnitY': y, 'PNG:PixelUnits': unit})
+        elif chunk_type == b'tIME' and len(data) >= 7:
+            metadata['PNG:ModifyDate'] = "%04d:%02d:%02d %02d:%02d:%02d" % struct.unpack('>HBBBBB', data[:7])
+        elif chunk_type == b'eXIf':
+            metadata.update(ExifParser.parse(data))
+        elif chunk_type in (b'tEXt', b'zTXt', b'iTXt'):
+            keyword, text = cls._decode_png_text(chunk_type, data)
+            if keyword == 'XML:com.adobe.xmp':
+                metadata.update(XmpParser.parse(text))
+            elif keyword:
+                metadata[f"PNG:{cls._png_tag_name(keyword)}"] = text
+
+    @classmethod
+    def _decode_png_text(cls, chunk_type, data):
+        """Obtiene la palabra clave y el texto de un fragmento tEXt, zTXt o iTXt."""
+        keyword, _, rest = data.partition(b'\x00')
+        keyword = keyword.decode('latin-1')
+
+        if chunk_type == b'tEXt':
+            return keyword, rest.decode('latin-1')
+        if chunk_type == b'zTXt':
+            return keyword, cls._inflate(rest[1:]).decode('latin-1')
+
+        # iTXt: indicador de compresión, método, idioma y palabra clave traducida
+        compressed = rest[:1] == b'\x01'
+        _, _, rest = rest[2:].partition(b'\x00')
+        _, _, text = rest.partition(b'\x00')
+        if compressed:
+            text = cls._inflate(text)
+        return keyword, text.decode('utf-8', errors='replace')
+
+    @classmethod
+    def _inflate(cls, data):
+        """Descomprime un texto zlib limitando el tamaño del resultado."""
+        return zlib.decompressobj().decompress(data, cls.MAX_TEXT_SIZE)
+
+    @staticmethod
+    def _png_tag_name(keyword):
+        """Convierte una palabra clave PNG ('Creation Time') en nombre de etiqueta ('CreationTime')."""
+        return "".join(word[:1].upper() + word[1:] for word in re.split(r'[^A-Za-z0-9]+', keyword))
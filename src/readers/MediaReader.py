@@ -0,0 +1,334 @@
+import datetime
+import re
+import struct
+
+from src.readers.BaseReader import BaseReader
+
+
+class MediaReader(BaseReader):
+    """
+    Lector nativo de metadatos de archivos ISO-BMFF (MP4, MOV, M4A).
+
+    Recorre las cajas (átomos) del nivel superior con seek, de modo que mdat
+    nunca se lee, y dentro de moov solo lee mvhd, la tkhd de cada pista y las
+    cajas udta/meta con los metadatos de usuario. Las claves siguen el grupo
+    QuickTime de exiftool.
+    """
+
+    EXTENSIONS = ("mp4", "mov", "m4a")
+
+    # Tipo de archivo y MIME de cada extensión
+    FILE_TYPES = {
+        "mp4": ("MP4", "MP4", "video/mp4"),
+        "mov": ("MOV", "MOV", "video/quicktime"),
+        "m4a": ("M4A", "M4A", "audio/mp4"),
+    }
+
+    # Cajas de moov que se recorren para llegar a las cajas de metadatos
+    CONTAINERS = (b'moov', b'trak', b'udta')
+
+    # Tamaño máximo de una caja de metadatos que se lee completa
+    MAX_BOX_SIZE = 4 * 1024 * 1024
+
+    # Número máximo de cajas recorridas por nivel (protege frente a archivos corruptos)
+    MAX_BOXES = 4096
+
+    # Segundos entre la época de QuickTime (1904-01-01) y la época Unix
+    EPOCH_OFFSET = 2082844800
+
+    # Etiquetas de texto de udta y de ilst (iTunes)
+    ITEM_TAGS = {
+        b'\xa9nam': "Title",
+        b'\xa9ART': "Artist",
+        b'aART': "AlbumArtist",
+        b'\xa9alb': "Album",
+        b'\xa9day': "ContentCreateDate",
+        b'\xa9too': "Encoder",
+        b'\xa9cmt': "Comment",
+        b'\xa9des': "Description",
+        b'\xa9gen': "Genre",
+        b'\xa9wrt': "Composer",
+        b'\xa9aut': "Author",
+        b'\xa9cpy': "Copyright",
+        b'\xa9mak': "Make",
+        b'\xa9mod': "Model",
+        b'\xa9swr': "SoftwareVersion",
+        b'\xa9xyz': "GPSCoordinates",
+        b'\xa9inf': "Information",
+        b'\xa9req': "Requirements",
+        b'\xa9fmt': "Format",
+        b'\xa9src': "Source",
+        b'desc': "Description",
+        b'ldes': "LongDescription",
+        b'cprt': "Copyright",
+        b'auth': "Author",
+        b'titl': "Title",
+        b'perf': "Performer",
+        b'tvsh': "TVShow",
+        b'purl': "PodcastURL",
+        b'ownr': "Owner",
+    }
+
+    # Claves mdta (metadatos de Apple) y su nombre en exiftool
+    MDTA_TAGS = {
+        "com.apple.quicktime.make": "Make",
+        "com.apple.quicktime.model": "Model",
+        "com.apple.quicktime.software": "Software",
+        "com.apple.quicktime.creationdate": "CreationDate",
+        "com.apple.quicktime.location.ISO6709": "GPSCoordinates",
+        "com.apple.quicktime.author": "Author",
+        "com.apple.quicktime.artist": "Artist",
+        "com.apple.quicktime.title": "Title",
+        "com.apple.quicktime.description": "Description",
+        "com.apple.quicktime.comment": "Comment",
+        "com.apple.quicktime.copyright": "Copyright",
+        "com.apple.quicktime.displayname": "DisplayName",
+        "com.android.version": "AndroidVersion",
+        "com.android.capture.fps": "AndroidCaptureFPS",
+    }
+
+    ISO6709_RE = re.compile(r'^([+-]\d+(?:\.\d+)?)([+-]\d+(?:\.\d+)?)([+-]\d+(?:\.\d+)?)?')
+
+    @classmethod
+    def read(cls, file_path):
+        """
+        Lee los metadatos de un archivo MP4, MOV o M4A.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            dict: Metadatos del archivo o None si no tiene estructura ISO-BMFF
+        """
+        ext = file_path.rsplit('.', 1)[-1].lower()
+        file_type, extension, mime_type = cls.FILE_TYPES[ext]
+
+        try:
+            with open(file_path, 'rb') as f:
+                f.seek(0, 2)
+                file_size = f.tell()
+                f.seek(0)
+
+                boxes = list(cls._iter_boxes(f, 0, file_size))
+                if not boxes or boxes[0][0] not in (b'ftyp', b'moov', b'wide', b'free', b'mdat', b'skip'):
+                    return None
+
+                metadata = cls.file_metadata(file_path, file_type, extension, mime_type)
+                for box_type, start, end in boxes:
+                    if box_type == b'ftyp':
+                        cls._parse_ftyp(cls._read_box(f, start, end), metadata)
+                    elif box_type == b'moov':
+                        cls._parse_container(f, start, end, metadata)
+        except (OSError, struct.error, ValueError):
+            return None
+        return metadata
+
+    @classmethod
+    def _iter_boxes(cls, f, start, end):
+        """
+        Recorre las cajas entre start y end sin leer su contenido.
+
+        Yields:
+            tuple: (tipo, inicio del contenido, fin de la caja)
+        """
+        position = start
+        for _ in range(cls.MAX_BOXES):
+            if position + 8 > end:
+                return
+            f.seek(position)
+            header = f.read(8)
+            if len(header) < 8:
+                return
+            size, box_type = struct.unpack('>I4s', header)
+            content = position + 8
+            if size == 1:
+                size = struct.unpack('>Q', f.read(8))[0]
+                content += 8
+            elif size == 0:
+                size = end - position
+            if size < content - position or position + size > end:
+                raise ValueError(f"Caja {box_type!r} con tamaño no válido")
+            yield box_type, content, position + size
+            position += size
+
+    @classmethod
+    def _read_box(cls, f, start, end):
+        """Lee el contenido de una caja de metadatos comprobando su tamaño."""
+        if end - start > cls.MAX_BOX_SIZE:
+            raise ValueError("Caja de metadatos demasiado grande")
+        f.seek(start)
+        return f.read(end - start)
+
+    @classmethod
+    def _parse_container(cls, f, start, end, metadata):
+        """Recorre moov, trak o udta leyendo solo las cajas con metadatos."""
+        for box_type, child_start, child_end in list(cls._iter_boxes(f, start, end)):
+            if box_type == b'mvhd':
+                cls._parse_mvhd(cls._read_box(f, child_start, child_end), metadata)
+            elif box_type == b'tkhd':
+                cls._parse_tkhd(cls._read_box(f, child_start, child_end), metadata)
+            elif box_type == b'meta':
+                cls._parse_meta(cls._read_box(f, child_start, child_end), metadata)
+            elif box_type in cls.CONTAINERS:
+                cls._parse_container(f, child_start, child_end, metadata)
+            elif box_type in cls.ITEM_TAGS:
+                cls._parse_udta_text(box_type, cls._read_box(f, child_start, child_end), metadata)
+
+    @staticmethod
+    def _parse_ftyp(data, metadata):
+        """Interpreta la caja ftyp (marca principal y compatibles)."""
+        if len(data) < 8:
+            return
+        metadata['QuickTime:MajorBrand'] = data[:4].decode('latin-1').strip()
+        metadata['QuickTime:MinorVersion'] = ".".join(str(b) for b in (data[5], data[6], data[7])) if data[4] == 0 else struct.unpack('>I', data[4:8])[0]
+        brands = [data[i:i + 4].decode('latin-1').strip() for i in range(8, len(data) - 3, 4)]
+        brands = [brand for brand in brands if brand]
+        if brands:
+            metadata['QuickTime:CompatibleBrands'] = brands if len(brands) > 1 else brands[0]
+
+    @classmethod
+    def _parse_mvhd(cls, data, metadata):
+        """Interpreta la cabecera de la película (fechas, escala de tiempo y duración)."""
+        version = data[0]
+        if version == 1:
+            created, modified, time_scale, duration = struct.unpack('>QQIQ', data[4:32])
+        else:
+            created, modified, time_scale, duration = struct.unpack('>IIII', data[4:20])
+        metadata['QuickTime:MovieHeaderVersion'] = version
+        metadata['QuickTime:CreateDate'] = cls._format_date(created)
+        metadata['QuickTime:ModifyDate'] = cls._format_date(modified)
+        metadata['QuickTime:TimeScale'] = time_scale
+        if time_scale:
+            metadata['QuickTime:Duration'] = round(duration / time_scale, 6)
+
+    @classmethod
+    def _parse_tkhd(cls, data, metadata):
+        """Interpreta la cabecera de pista; las dimensiones se toman de la primera pista con imagen."""
+        version = data[0]
+        if version == 1:
+            created, modified = struct.unpack('>QQ', data[4:20])
+            width, height = struct.unpack('>II', data[88:96])
+        else:
+            created, modified = struct.unpack('>II', data[4:12])
+            width, height = struct.unpack('>II', data[76:84])
+        metadata.setdefault('QuickTime:TrackHeaderVersion', version)
+        metadata.setdefault('QuickTime:TrackCreateDate', cls._format_date(created))
+        metadata.setdefault('QuickTime:TrackModifyDate', cls._format_date(modified))
+        if width and height and 'QuickTime:ImageWidth' not in metadata:
+            metadata['QuickTime:ImageWidth'] = width >> 16
+            metadata['QuickTime:ImageHeight'] = height >> 16
+
+    @classmethod
+    def _parse_udta_text(cls, box_type, data, metadata):
+        """Interpreta una cadena de udta ('©nam': tamaño, idioma y texto; 3GPP: versión, idioma y texto)."""
+        if box_type[0] == 0xa9:
+            size = struct.unpack('>H', data[:2])[0]
+            text = data[4:4 + size]
+        else:
+            text = data[6:]
+        value = cls._decode_text(text)
+        if value:
+            cls._set(metadata, cls.ITEM_TAGS[box_type], value)
+
+    @classmethod
+    def _parse_meta(cls, data, metadata):
+        """Interpreta una caja meta (hdlr + keys + ilst) en formato MP4 o QuickTime."""
+        # En MP4 meta es una FullBox (4 bytes de versión/flags); en QuickTime no
+        offset = 0 if data[4:8] == b'hdlr' else 4
+        children = {}
+        position = offset
+        while position + 8 <= len(data):
+            size, box_type = struct.unpack('>I4s', data[position:position + 8])
+            if size < 8:
+                break
+            children[box_type] = data[position + 8:position + size]
+            position += size
+
+        keys = cls._parse_keys(children.get(b'keys', b''))
+        cls._parse_ilst(children.get(b'ilst', b''), keys, metadata)
+
+    @staticmethod
+    def _parse_keys(data):
+        """Interpreta la caja keys de los metadatos mdta (índices 1..n)."""
+        keys = {}
+        if len(data) < 8:
+            return keys
+        count = struct.unpack('>I', data[4:8])[0]
+        position = 8
+        for index in range(1, count + 1):
+            if position + 8 > len(data):
+                break
+            size = struct.unpack('>I', data[position:position + 4])[0]
+            if size < 8:
+                break
+            keys[index] = data[position + 8:position + size].decode('utf-8', errors='replace')
+            position += size
+        return keys
+
+    @classmethod
+    def _parse_ilst(cls, data, keys, metadata):
+        """Interpreta la lista de elementos ilst (etiquetas iTunes o claves mdta)."""
+        position = 0
+        while position + 8 <= len(data):
+            size, item_type = struct.unpack('>I4s', data[position:position + 8])
+            if size < 8:
+                break
+            item = data[position + 8:position + size]
+            position += size
+
+            index = struct.unpack('>I', item_type)[0]
+            if index in keys:
+                key = keys[index]
+                last = key.rsplit('.', 1)[-1]
+                name = cls.MDTA_TAGS.get(key) or last[:1].upper() + last[1:]
+            elif item_type in cls.ITEM_TAGS:
+                name = cls.ITEM_TAGS[item_type]
+            else:
+                continue
+
+            value = cls._parse_data_box(item)
+            if value is not None and value != '':
+                cls._set(metadata, name, value)
+
+    @classmethod
+    def _parse_data_box(cls, item):
+        """Obtiene el valor de la caja 'data' de un elemento de ilst."""
+        if len(item) < 16 or item[4:8] != b'data':
+            return None
+        size = struct.unpack('>I', item[:4])[0]
+        data_type = struct.unpack('>I', item[8:12])[0] & 0xffffff
+        payload = item[16:size]
+        if data_type in (1, 4):
+            return cls._decode_text(payload)
+        if data_type == 2:
+            return payload.decode('utf-16-be', errors='replace').rstrip('\x00')
+        if data_type in (21, 22) and len(payload) in (1, 2, 4, 8):
+            return int.from_bytes(payload, 'big', signed=data_type == 21)
+        if data_type == 23 and len(payload) == 4:
+            return struct.unpack('>f', payload)[0]
+        return None
+
+    @classmethod
+    def _set(cls, metadata, name, value):
+        """Guarda una etiqueta QuickTime; las coordenadas ISO 6709 se convierten a 'lat lon alt' como exiftool -n."""
+        if name == "GPSCoordinates" and isinstance(value, str):
+            match = cls.ISO6709_RE.match(value)
+            if match:
+                numbers = [float(part) for part in match.groups() if part is not None]
+                value = " ".join(str(int(n)) if n.is_integer() else str(n) for n in numbers)
+        metadata[f"QuickTime:{name}"] = value
+
+    @staticmethod
+    def _decode_text(data):
+        """Decodifica un texto UTF-8 (con o sin BOM UTF-16) quitando nulos finales."""
+        if data.startswith(b'\xfe\xff'):
+            return data[2:].decode('utf-16-be', errors='replace').rstrip('\x00').strip()
+        return data.decode('utf-8', errors='replace').rstrip('\x00').strip()
+
+    @classmethod
+    def _format_date(cls, seconds):
+        """Convierte segundos desde 1904 al formato de fecha de exiftool (UTC)."""
+        if seconds == 0:
+            return "0000:00:00 00:00:00"
+        moment = datetime.datetime.fromtimestamp(seconds - cls.EPOCH_OFFSET, tz=datetime.timezone.utc)
+        return moment.strftime("%Y:%m:%d %H:%M:%S")
@@ -0,0 +1,44 @@
+import os
+
+from src.readers.ImageReader import ImageReader
+from src.readers.MediaReader import MediaReader
+from src.readers.OfficeReader import OfficeReader
+from src.readers.PdfReader import PdfReader
+
+
+class NativeReader:
+    """
+    Selecciona el lector nativo adecuado según la extensión del archivo.
+    """
+
+    # Lectores disponibles, consultados en orden
+    READERS = [ImageReader, OfficeReader, PdfReader, MediaReader]
+
+    @classmethod
+    def read(cls, file_path):
+        """
+        Lee los metadatos de un archivo con el lector nativo correspondiente.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            dict: Metadatos con claves 'Grupo:Etiqueta' o None si el archivo debe
+                  leerse con exiftool (formato no soportado o no reconocido)
+        """
+        reader = cls._reader_for(file_path)
+        if reader is None:
+            return None
+        try:
+            return reader.read(file_path)
+        except Exception:
+            return None
+
+    @classmethod
+    def _reader_for(cls, file_path):
+        """Obtiene el lector que declara la extensión del archivo."""
+        ext = os.path.splitext(file_path)[1].lower().lstrip('.')
+        for reader in cls.READERS:
+            if ext in reader.EXTENSIONS:
+                return reader
+        return None
@@ -0,0 +1,202 @@
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+from src.readers.BaseReader import BaseReader
+
+
+class OfficeReader(BaseReader):
+    """
+    Lector nativo de metadatos de documentos Office Open XML y OpenDocument.
+
+    Abre el directorio central del zip y lee únicamente los miembros con
+    metadatos (docProps/core.xml, app.xml y custom.xml en OOXML; meta.xml en
+    ODF), sin descomprimir el contenido del documento. Igual que exiftool, los
+    campos OOXML se devuelven en el grupo XML y los de ODF en el grupo XMP.
+    """
+
+    EXTENSIONS = ("docx", "xlsx", "pptx", "odt", "ods", "odp")
+
+    # Tipo de archivo y MIME de cada extensión
+    FILE_TYPES = {
+        "docx": ("DOCX", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+        "xlsx": ("XLSX", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+        "pptx": ("PPTX", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+        "odt": ("ODT", "application/vnd.oasis.opendocument.text"),
+        "ods": ("ODS", "application/vnd.oasis.opendocument.spreadsheet"),
+        "odp": ("ODP", "application/vnd.oasis.opendocument.presentation"),
+    }
+
+    OOXML_MEMBERS = ("docProps/core.xml", "docProps/app.xml", "docProps/custom.xml")
+    ODF_MEMBER = "meta.xml"
+
+    # Nombres de exiftool para las propiedades de core.xml que no coinciden con el nombre local
+    CORE_TAGS = {
+        "revision": "RevisionNumber",
+        "created": "CreateDate",
+        "modified": "ModifyDate",
+    }
+
+    # Propiedades ODF con fecha, que exiftool convierte al formato 'AAAA:MM:DD HH:MM:SS'
+    ODF_DATES = ("Creation-date", "Date", "Print-date")
+
+    # Tamaño máximo descomprimido de un miembro de metadatos
+    MAX_MEMBER_SIZE = 4 * 1024 * 1024
+
+    @classmethod
+    def read(cls, file_path):
+        """
+        Lee los metadatos de un documento OOXML u ODF.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            dict: Metadatos del documento o None si no es un zip OOXML/ODF válido
+        """
+        ext = file_path.rsplit('.', 1)[-1].lower()
+        file_type, mime_type = cls.FILE_TYPES[ext]
+
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                names = set(archive.namelist())
+                if '[Content_Types].xml' in names:
+                    metadata = cls.file_metadata(file_path, file_type, file_type, mime_type)
+                    cls._add_zip_fields(metadata, archive)
+                    for member in cls.OOXML_MEMBERS:
+                        if member in names:
+                            cls._parse_ooxml(cls._read_member(archive, member), metadata)
+                elif 'mimetype' in names:
+                    mime_type = cls._read_member(archive, 'mimetype').decode('ascii', errors='replace').strip() or mime_type
+                    metadata = cls.file_metadata(file_path, file_type, file_type, mime_type)
+                    cls._add_zip_fields(metadata, archive)
+                    if cls.ODF_MEMBER in names:
+                        cls._parse_odf(cls._read_member(archive, cls.ODF_MEMBER), metadata)
+                else:
+                    return None
+        except (OSError, zipfile.BadZipFile, ET.ParseError, ValueError):
+            return None
+        return metadata
+
+    @classmethod
+    def _read_member(cls, archive, name):
+        """Lee un miembro del zip comprobando antes su tamaño descomprimido."""
+        info = archive.getinfo(name)
+        if info.file_size > cls.MAX_MEMBER_SIZE:
+            raise ValueError(f"Miembro demasiado grande: {name}")
+        with archive.open(info) as member:
+            return member.read(cls.MAX_MEMBER_SIZE)
+
+    @staticmethod
+    def _add_zip_fields(metadata, archive):
+        """Añade los campos ZIP que exiftool obtiene del primer miembro del archivo."""
+        members = archive.infolist()
+        if not members:
+            return
+        first = members[0]
+        metadata.update({
+            'ZIP:ZipRequiredVersion': first.extract_version,
+            'ZIP:ZipBitFlag': first.flag_bits,
+            'ZIP:ZipCompression': first.compress_type,
+            'ZIP:ZipModifyDate': "%04d:%02d:%02d %02d:%02d:%02d" % first.date_time,
+            'ZIP:ZipCRC': first.CRC,
+            'ZIP:ZipCompressedSize': first.compress_size,
+            'ZIP:ZipUncompressedSize': first.file_size,
+            'ZIP:ZipFileName': first.filename,
+        })
+
+    @classmethod
+    def _parse_ooxml(cls, data, metadata):
+        """Interpreta core.xml, app.xml o custom.xml añadiendo claves 'XML:Propiedad'."""
+        root = ET.fromstring(data)
+        for element in root:
+            local = cls._local(element.tag)
+            if local == "property":
+                # custom.xml: <property name="..."><vt:lpwstr>valor</vt:lpwstr></property>
+                name = element.get("name")
+                values = cls._leaf_texts(element)
+                if name and values:
+                    cls._set(metadata, f"XML:{cls._tag_name(name)}", values[0] if len(values) == 1 else values)
+                continue
+
+            name = cls.CORE_TAGS.get(local, local[:1].upper() + local[1:])
+            values = cls._leaf_texts(element)
+            if not values:
+                continue
+            if local in ("created", "modified", "lastPrinted"):
+                values = [cls._format_date(v) for v in values]
+            else:
+                values = [cls._number(v) for v in values]
+            cls._set(metadata, f"XML:{name}", values[0] if len(values) == 1 else values)
+
+    @classmethod
+    def _parse_odf(cls, data, metadata):
+        """Interpreta meta.xml añadiendo claves 'XMP:Propiedad' como exiftool."""
+        root = ET.fromstring(data)
+        office_meta = next((c for c in root if cls._local(c.tag) == "meta"), None)
+        if office_meta is None:
+            return
+
+        for element in office_meta:
+            local = cls._local(element.tag)
+            name = local[:1].upper() + local[1:]
+            if local == "user-defined":
+                user_name = element.get(next((a for a in element.attrib if cls._local(a) == "name"), ""))
+                if user_name and element.text and element.text.strip():
+                    cls._set(metadata, f"XMP:{cls._tag_name(user_name)}", element.text.strip())
+                continue
+
+            for attr, value in element.attrib.items():
+                attr_local = cls._local(attr)
+                cls._set(metadata, f"XMP:{name}{attr_local[:1].upper() + attr_local[1:]}", cls._number(value))
+
+            if element.text and element.text.strip():
+                value = element.text.strip()
+                if name in cls.ODF_DATES:
+                    value = cls._format_date(value)
+                cls._set(metadata, f"XMP:{name}", cls._number(value))
+
+    @classmethod
+    def _leaf_texts(cls, element):
+        """Obtiene los textos de los nodos hoja (incluidos los vectores vt:vector)."""
+        if len(element) == 0:
+            return [element.text.strip()] if element.text and element.text.strip() else []
+        texts = []
+        for child in element:
+            texts.extend(cls._leaf_texts(child))
+        return texts
+
+    @staticmethod
+    def _set(metadata, key, value):
+        """Guarda un valor, acumulando en lista si la propiedad ya existe."""
+        if key in metadata:
+            previous = metadata[key] if isinstance(metadata[key], list) else [metadata[key]]
+            metadata[key] = previous + (value if isinstance(value, list) else [value])
+        else:
+            metadata[key] = value
+
+    @staticmethod
+    def _format_date(value):
+        """Convierte una fecha ISO 8601 ('2024-01-31T10:00:00Z') al formato de exiftool."""
+        match = re.match(r'^(\d{4})-(\d{2})-(\d{2})(?:T(\d{2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?)?(.*)$', value)
+        if not match:
+            return value
+        year, month, day, hour, minute, second, zone = match.groups()
+        if hour is None:
+            return f"{year}:{month}:{day}"
+        return f"{year}:{month}:{day} {hour}:{minute}:{second or '00'}{zone}"
+
+    @staticmethod
+    def _number(value):
+        """Convierte a entero los valores numéricos, como hace exiftool -n."""
+        return int(value) if value.isdigit() else value
+
+    @staticmethod
+    def _tag_name(name):
+        """Convierte un nombre libre ('Nombre del cliente') en nombre de etiqueta ('NombreDelCliente')."""
+        return "".join(word[:1].upper() + word[1:] for word in re.split(r'[^\w]+', name) if word)
+
+    @staticmethod
+    def _local(tag):
+        """Obtiene el nombre local de una etiqueta o atributo XML."""
+        return tag.rsplit('}', 1)[-1]
@@ -0,0 +1,407 @@
+import re
+import zlib
+from collections import namedtuple
+
+
+# Referencia indirecta 'num gen R'
+PdfRef = namedtuple('PdfRef', 'num gen')
+
+
+class PdfDocument:
+    """
+    Acceso de solo lectura a los objetos de un PDF a partir de su tabla xref.
+
+    Trabaja sobre cualquier buffer indexable (normalmente un mmap), por lo que
+    solo se leen de disco el final del archivo, las tablas xref y los objetos que
+    se resuelven. Soporta tablas xref clásicas, flujos xref (PDF 1.5), flujos
+    de objetos y actualizaciones incrementales (/Prev). Los nombres se devuelven
+    como str, las cadenas como bytes y las referencias como PdfRef.
+    """
+
+    WHITESPACE = b' \t\r\n\x0c\x00'
+
+    # Tamaño máximo descomprimido de un flujo
+    MAX_STREAM_SIZE = 16 * 1024 * 1024
+
+    # Bytes del final del archivo en los que se busca 'startxref'
+    TAIL_SIZE = 2048
+
+    STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+    REF_RE = re.compile(rb'(\d+)\s+(\d+)\s+R')
+    NUMBER_RE = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)')
+    NAME_RE = re.compile(rb'/([^\s()<>\[\]{}/%]*)')
+    KEYWORD_RE = re.compile(rb'[A-Za-z]+')
+    OBJ_RE = re.compile(rb'\s*(\d+)\s+(\d+)\s+obj')
+    SUBSECTION_RE = re.compile(rb'\s*(\d+)\s+(\d+)')
+    ENTRY_RE = re.compile(rb'\s*(\d{1,10})\s+(\d{1,5})\s+([nf])')
+    STREAM_RE = re.compile(rb'\s*stream\r?\n')
+
+    def __init__(self, buffer):
+        """
+        Lee la cadena de tablas xref del documento.
+
+        Args:
+            buffer: Contenido del PDF (bytes o mmap)
+
+        Raises:
+            ValueError: Si no se encuentra 'startxref' o la tabla xref no es válida
+        """
+        self.buffer = buffer
+        self.xref = {}
+        self.trailer = {}
+        self._cache = {}
+        self._object_streams = {}
+
+        tail_start = max(0, len(buffer) - self.TAIL_SIZE)
+        position = buffer.rfind(b'startxref', tail_start)
+        match = self.STARTXREF_RE.match(buffer, position) if position >= 0 else None
+        if not match:
+            raise ValueError("No se encontró 'startxref'")
+        self._read_xref_chain(int(match.group(1)))
+
+    def get_object(self, num):
+        """
+        Obtiene un objeto indirecto por su número.
+
+        Args:
+            num: Número del objeto
+
+        Returns:
+            Valor del objeto o None si no existe
+        """
+        if num in self._cache:
+            return self._cache[num]
+
+        entry = self.xref.get(num)
+        value = None
+        if entry is not None and entry[0] == 'n':
+            value, _ = self._parse_indirect(entry[1])
+        elif entry is not None and entry[0] == 'c':
+            value = self._get_compressed_object(entry[1], entry[2])
+        self._cache[num] = value
+        return value
+
+    def resolve(self, value):
+        """Resuelve una referencia indirecta (los demás valores se devuelven sin cambios)."""
+        depth = 0
+        while isinstance(value, PdfRef) and depth < 32:
+            value = self.get_object(value.num)
+            depth += 1
+        return value
+
+    def get_stream(self, ref):
+        """
+        Obtiene el diccionario y los datos decodificados de un flujo.
+
+        Args:
+            ref: Referencia indirecta al flujo
+
+        Returns:
+            tuple: (diccionario, bytes) o (None, None) si el objeto no es un flujo
+
+        Raises:
+            ValueError: Si el flujo usa un filtro no soportado
+        """
+        entry = self.xref.get(ref.num)
+        if entry is None or entry[0] != 'n':
+            return None, None
+        dictionary, position = self._parse_indirect(entry[1])
+        match = self.STREAM_RE.match(self.buffer, position)
+        if not isinstance(dictionary, dict) or not match:
+            return None, None
+
+        length = self.resolve(dictionary.get('Length'))
+        if not isinstance(length, int) or length < 0:
+            raise ValueError("Longitud de flujo no válida")
+        start = match.end()
+        return dictionary, self._decode_stream(dictionary, self.buffer[start:start + length])
+
+    # ===== Tablas xref =====
+
+    def _read_xref_chain(self, offset):
+        """Lee la tabla xref en offset y las anteriores (/Prev), sin sobrescribir las entradas más nuevas."""
+        pending = [offset]
+        visited = set()
+        while pending:
+            offset = pending.pop(0)
+            if offset in visited or not 0 <= offset < len(self.buffer):
+                continue
+            visited.add(offset)
+
+            if self.buffer[offset:offset + 4] == b'xref':
+                trailer = self._read_xref_table(offset + 4)
+            else:
+                trailer = self._read_xref_stream(offset)
+
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+
+            # Archivos híbridos: el flujo XRefStm tiene prioridad sobre /Prev
+            if isinstance(trailer.get('XRefStm'), int):
+                pending.insert(0, trailer['XRefStm'])
+            if isinstance(trailer.get('Prev'), int):
+                pending.append(trailer['Prev'])
+
+        if not self.trailer:
+            raise ValueError("Tabla xref no válida")
+
+    def _read_xref_table(self, position):
+        """Lee una tabla xref clásica y devuelve su diccionario trailer."""
+        buffer = self.buffer
+        while True:
+            position = self._skip_whitespace(buffer, position)
+            if buffer[position:position + 7] == b'trailer':
+                trailer, _ = self._parse_value(buffer, position + 7)
+                return trailer if isinstance(trailer, dict) else {}
+
+            match = self.SUBSECTION_RE.match(buffer, position)
+            if not match:
+                raise ValueError("Subsección xref no válida")
+            first, count = int(match.group(1)), int(match.group(2))
+            position = match.end()
+            for num in range(first, first + count):
+                entry = self.ENTRY_RE.match(buffer, position)
+                if not entry:
+                    raise ValueError("Entrada xref no válida")
+                position = entry.end()
+                if entry.group(3) == b'n' and num not in self.xref:
+                    self.xref[num] = ('n', int(entry.group(1)))
+                elif num not in self.xref:
+                    self.xref[num] = ('f',)
+
+    def _read_xref_stream(self, offset):
+        """Lee un flujo xref (PDF 1.5) y devuelve su diccionario, que hace de trailer."""
+        dictionary, position = self._parse_indirect(offset)
+        match = self.STREAM_RE.match(self.buffer, position)
+        if not isinstance(dictionary, dict) or dictionary.get('Type') != 'XRef' or not match:
+            raise ValueError("Flujo xref no válido")
+
+        length = dictionary.get('Length')
+        if not isinstance(length, int):
+            raise ValueError("Longitud de flujo xref no válida")
+        data = self._decode_stream(dictionary, self.buffer[match.end():match.end() + length])
+
+        widths = dictionary.get('W', [])
+        if len(widths) != 3:
+            raise ValueError("Campo /W no válido")
+        index = dictionary.get('Index', [0, dictionary.get('Size', 0)])
+        entry_size = sum(widths)
+
+        position = 0
+        for first, count in zip(index[0::2], index[1::2]):
+            for num in range(first, first + count):
+                if position + entry_size > len(data):
+                    break
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[position:position + width], 'big'))
+                    position += width
+                entry_type = fields[0] if widths[0] else 1
+                if num in self.xref:
+                    continue
+                if entry_type == 1:
+                    self.xref[num] = ('n', fields[1])
+                elif entry_type == 2:
+                    self.xref[num] = ('c', fields[1], fields[2])
+                else:
+                    self.xref[num] = ('f',)
+        return dictionary
+
+    def _get_compressed_object(self, stream_num, index):
+        """Obtiene un objeto guardado dentro de un flujo de objetos (ObjStm)."""
+        if stream_num not in self._object_streams:
+            dictionary, data = self.get_stream(PdfRef(stream_num, 0))
+            if dictionary is None:
+                self._object_streams[stream_num] = None
+            else:
+                count, first = dictionary.get('N', 0), dictionary.get('First', 0)
+                numbers = data[:first].split()
+                offsets = [int(numbers[i]) for i in range(1, min(len(numbers), count * 2), 2)]
+                self._object_streams[stream_num] = (data, first, offsets)
+
+        stream = self._object_streams[stream_num]
+        if stream is None or index >= len(stream[2]):
+            return None
+        data, first, offsets = stream
+        value, _ = self._parse_value(data, first + offsets[index])
+        return value
+
+    # ===== Flujos =====
+
+    def _decode_stream(self, dictionary, data):
+        """Aplica los filtros de un flujo (solo FlateDecode, con o sin predictor PNG)."""
+        filters = self.resolve(dictionary.get('Filter'))
+        filters = filters if isinstance(filters, list) else [filters] if filters else []
+        params = self.resolve(dictionary.get('DecodeParms'))
+        params = params[0] if isinstance(params, list) and params else params
+
+        for name in filters:
+            if name not in ('FlateDecode', 'Fl'):
+                raise ValueError(f"Filtro no soportado: {name}")
+            data = zlib.decompressobj().decompress(bytes(data), self.MAX_STREAM_SIZE)
+            if isinstance(params, dict) and params.get('Predictor', 1) >= 10:
+                data = self._undo_png_predictor(data, params)
+        return bytes(data)
+
+    @staticmethod
+    def _undo_png_predictor(data, params):
+        """Deshace el predictor PNG (Predictor >= 10) aplicado por fila."""
+        colors = params.get('Colors', 1)
+        bits = params.get('BitsPerComponent', 8)
+        columns = params.get('Columns', 1)
+        bpp = max(1, colors * bits // 8)
+        row_size = (columns * colors * bits + 7) // 8
+
+        output = bytearray()
+        previous = bytearray(row_size)
+        for start in range(0, len(data) - row_size, row_size + 1):
+            filter_type = data[start]
+            row = bytearray(data[start + 1:start + 1 + row_size])
+            for i in range(row_size):
+                left = row[i - bpp] if i >= bpp else 0
+                up = previous[i]
+                if filter_type == 1:
+                    row[i] = (row[i] + left) & 0xff
+                elif filter_type == 2:
+                    row[i] = (row[i] + up) & 0xff
+                elif filter_type == 3:
+                    row[i] = (row[i] + (left + up) // 2) & 0xff
+                elif filter_type == 4:
+                    up_left = previous[i - bpp] if i >= bpp else 0
+                    p = left + up - up_left
+                    pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+                    predictor = left if pa <= pb and pa <= pc else up if pb <= pc else up_left
+                    row[i] = (row[i] + predictor) & 0xff
+            output += row
+            previous = row
+        return bytes(output)
+
+    # ===== Sintaxis de objetos =====
+
+    def _parse_indirect(self, offset):
+        """Interpreta 'num gen obj valor' y devuelve (valor, posición tras el valor)."""
+        match = self.OBJ_RE.match(self.buffer, offset)
+        if not match:
+            raise ValueError(f"Objeto no encontrado en la posición {offset}")
+        return self._parse_value(self.buffer, match.end())
+
+    @classmethod
+    def _skip_whitespace(cls, buffer, position):
+        """Avanza sobre espacios y comentarios."""
+        length = len(buffer)
+        while position < length:
+            byte = buffer[position:position + 1]
+            if byte and byte in cls.WHITESPACE:
+                position += 1
+            elif byte == b'%':
+                while position < length and buffer[position:position + 1] not in (b'\r', b'\n'):
+                    position += 1
+            else:
+                break
+        return position
+
+    @classmethod
+    def _parse_value(cls, buffer, position):
+        """Interpreta un objeto PDF directo y devuelve (valor, posición siguiente)."""
+        position = cls._skip_whitespace(buffer, position)
+        head = buffer[position:position + 2]
+
+        if head == b'<<':
+            return cls._parse_dictionary(buffer, position + 2)
+        if head[:1] == b'<':
+            end = buffer.find(b'>', position)
+            if end < 0:
+                raise ValueError("Cadena hexadecimal sin cerrar")
+            hex_digits = re.sub(rb'\s', b'', bytes(buffer[position + 1:end]))
+            if len(hex_digits) % 2:
+                hex_digits += b'0'
+            return bytes.fromhex(hex_digits.decode('ascii')), end + 1
+        if head[:1] == b'[':
+            return cls._parse_array(buffer, position + 1)
+        if head[:1] == b'(':
+            return cls._parse_literal_string(buffer, position + 1)
+        if head[:1] == b'/':
+            match = cls.NAME_RE.match(buffer, position)
+            name = re.sub(rb'#([0-9A-Fa-f]{2})', lambda m: bytes([int(m.group(1), 16)]), match.group(1))
+            return name.decode('latin-1'), match.end()
+
+        match = cls.REF_RE.match(buffer, position)
+        if match:
+            return PdfRef(int(match.group(1)), int(match.group(2))), match.end()
+        match = cls.NUMBER_RE.match(buffer, position)
+        if match:
+            text = match.group(0)
+            return (float(text) if b'.' in text else int(text)), match.end()
+        match = cls.KEYWORD_RE.match(buffer, position)
+        if match:
+            keyword = match.group(0)
+            return {b'true': True, b'false': False}.get(keyword), match.end()
+        raise ValueError(f"Sintaxis PDF no válida en la posición {position}")
+
+    @classmethod
+    def _parse_dictionary(cls, buffer, position):
+        """Interpreta el contenido de un diccionario tras '<<'."""
+        dictionary = {}
+        while True:
+            position = cls._skip_whitespace(buffer, position)
+            if buffer[position:position + 2] == b'>>':
+                return dictionary, position + 2
+            if position >= len(buffer):
+                raise ValueError("Diccionario sin cerrar")
+            key, position = cls._parse_value(buffer, position)
+            value, position = cls._parse_value(buffer, position)
+            if isinstance(key, str):
+                dictionary[key] = value
+
+    @classmethod
+    def _parse_array(cls, buffer, position):
+        """Interpreta el contenido de un array tras '['."""
+        items = []
+        while True:
+            position = cls._skip_whitespace(buffer, position)
+            if buffer[position:position + 1] == b']':
+                return items, position + 1
+            if position >= len(buffer):
+                raise ValueError("Array sin cerrar")
+            value, position = cls._parse_value(buffer, position)
+            items.append(value)
+
+    @staticmethod
+    def _parse_literal_string(buffer, position):
+        """Interpreta una cadena literal tras '(' con paréntesis anidados y escapes."""
+        escapes = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f'}
+        output = bytearray()
+        depth = 1
+        length = len(buffer)
+        while position < length:
+            byte = buffer[position]
+            position += 1
+            if byte == 0x5c:  # '\'
+                if position >= length:
+                    break
+                byte = buffer[position]
+                position += 1
+                if byte in escapes:
+                    output += escapes[byte]
+                elif 0x30 <= byte <= 0x37:
+                    digits = bytes([byte])
+                    while len(digits) < 3 and position < length and 0x30 <= buffer[position] <= 0x37:
+                        digits += bytes([buffer[position]])
+                        position += 1
+                    output.append(int(digits, 8) & 0xff)
+                elif byte == 0x0d:
+                    if position < length and buffer[position] == 0x0a:
+                        position += 1
+                elif byte != 0x0a:
+                    output.append(byte)
+            elif byte == 0x28:  # '('
+                depth += 1
+                output.append(byte)
+            elif byte == 0x29:  # ')'
+                depth -= 1
+                if depth == 0:
+                    return bytes(output), position
+                output.append(byte)
+            else:
+                output.append(byte)
+        raise ValueError("Cadena literal sin cerrar")
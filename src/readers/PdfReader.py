@@ -0,0 +1,119 @@
+import mmap
+import re
+import zlib
+
+from src.readers.BaseReader import BaseReader
+from src.readers.PdfDocument import PdfDocument, PdfRef
+from src.readers.XmpParser import XmpParser
+
+
+class PdfReader(BaseReader):
+    """
+    Lector nativo de metadatos de documentos PDF.
+
+    Proyecta el archivo en memoria (mmap) y localiza mediante 'startxref' el
+    trailer, el diccionario Info y el flujo XMP del catálogo, de modo que en
+    PDF de cientos de MB solo se leen de disco unas pocas páginas. Los PDF
+    cifrados se dejan para exiftool.
+    """
+
+    EXTENSIONS = ("pdf",)
+
+    # Nombres de exiftool para las entradas de Info que no coinciden con la clave
+    INFO_TAGS = {
+        "CreationDate": "CreateDate",
+        "ModDate": "ModifyDate",
+    }
+
+    DATE_RE = re.compile(r"^D:(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?([Zz+-])?(\d{2})?'?(\d{2})?'?")
+
+    @classmethod
+    def read(cls, file_path):
+        """
+        Lee los metadatos de un PDF.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            dict: Metadatos del PDF o None si no es un PDF que se pueda interpretar
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return cls._read_pdf(buffer, file_path)
+        except (OSError, ValueError, IndexError, KeyError, TypeError, zlib.error):
+            return None
+
+    @classmethod
+    def _read_pdf(cls, buffer, file_path):
+        """Extrae la versión, el diccionario Info, el número de páginas y el XMP."""
+        header = buffer.find(b'%PDF-', 0, 1024)
+        if header < 0:
+            return None
+        version = re.match(rb'%PDF-(\d+\.\d+)', buffer[header:header + 16])
+
+        document = PdfDocument(buffer)
+        if 'Encrypt' in document.trailer:
+            return None
+
+        metadata = cls.file_metadata(file_path, 'PDF', 'PDF', 'application/pdf')
+        if version:
+            metadata['PDF:PDFVersion'] = float(version.group(1))
+        metadata['PDF:Linearized'] = 'true' if cls._is_linearized(buffer) else 'false'
+
+        info = document.resolve(document.trailer.get('Info'))
+        if isinstance(info, dict):
+            for key, value in info.items():
+                value = cls._to_text(document.resolve(value))
+                if value is None or value == '':
+                    continue
+                if key in ('CreationDate', 'ModDate'):
+                    value = cls._format_date(value)
+                metadata[f"PDF:{cls.INFO_TAGS.get(key, key)}"] = value
+
+        root = document.resolve(document.trailer.get('Root'))
+        if isinstance(root, dict):
+            pages = document.resolve(root.get('Pages'))
+            if isinstance(pages, dict) and isinstance(document.resolve(pages.get('Count')), int):
+                metadata['PDF:PageCount'] = document.resolve(pages.get('Count'))
+
+            metadata_ref = root.get('Metadata')
+            if isinstance(metadata_ref, PdfRef):
+                _, xmp = document.get_stream(metadata_ref)
+                if xmp:
+                    metadata.update(XmpParser.parse(xmp))
+
+        return metadata
+
+    @staticmethod
+    def _is_linearized(buffer):
+        """Indica si el primer objeto del archivo es un diccionario de linealización."""
+        return b'/Linearized' in buffer[:1024]
+
+    @staticmethod
+    def _to_text(value):
+        """Convierte un valor de Info en texto (UTF-16 con BOM o PDFDocEncoding)."""
+        if isinstance(value, bytes):
+            if value.startswith(b'\xfe\xff'):
+                return value[2:].decode('utf-16-be', errors='replace').rstrip('\x00')
+            if value.startswith(b'\xef\xbb\xbf'):
+                return value[3:].decode('utf-8', errors='replace')
+            return value.decode('latin-1').rstrip('\x00')
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return value
+        return None
+
+    @classmethod
+    def _format_date(cls, value):
+        """Convierte una fecha PDF ('D:20240131100000+01'00'') al formato de exiftool."""
+        match = cls.DATE_RE.match(value) if isinstance(value, str) else None
+        if not match:
+            return value
+        year, month, day, hour, minute, second, sign, tz_hour, tz_minute = match.groups()
+        text = f"{year}:{month or '01'}:{day or '01'} {hour or '00'}:{minute or '00'}:{second or '00'}"
+        if sign in ('Z', 'z'):
+            text += 'Z'
+        elif sign:
+            text += f"{sign}{tz_hour or '00'}:{tz_minute or '00'}"
+        return text
@@ -0,0 +1,119 @@
+import xml.etree.ElementTree as ET
+
+
+class XmpParser:
+    """
+    Intérprete de paquetes XMP (RDF/XML) sin dependencias externas.
+
+    Cada propiedad se devuelve como 'XMP:Propiedad', con el nombre local en
+    mayúscula inicial igual que exiftool. Las listas rdf:Seq/Bag/Alt de un solo
+    elemento se devuelven como texto y las de varios como lista; las estructuras
+    anidadas se aplanan concatenando los nombres.
+    """
+
+    RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+    XML_NS = "http://www.w3.org/XML/1998/namespace"
+    CONTAINERS = ("Seq", "Bag", "Alt")
+
+    @classmethod
+    def parse(cls, data):
+        """
+        Interpreta un paquete XMP.
+
+        Args:
+            data: Bytes o texto con el paquete XMP
+
+        Returns:
+            dict: Metadatos con claves 'XMP:Propiedad' (vacío si el XML no es válido)
+        """
+        if isinstance(data, (bytes, bytearray)):
+            data = bytes(data).decode('utf-8', errors='replace')
+
+        start = data.find('<x:xmpmeta')
+        if start < 0:
+            start = data.find('<rdf:RDF')
+        end_tag = '</x:xmpmeta>' if data.startswith('<x:xmpmeta', max(start, 0)) else '</rdf:RDF>'
+        end = data.find(end_tag)
+        if start < 0 or end < 0:
+            return {}
+
+        try:
+            root = ET.fromstring(data[start:end + len(end_tag)])
+        except ET.ParseError:
+            return {}
+
+        metadata = {}
+        rdf_roots = [root] if root.tag == f"{{{cls.RDF_NS}}}RDF" else root.iter(f"{{{cls.RDF_NS}}}RDF")
+        for rdf in rdf_roots:
+            for description in rdf.findall(f"{{{cls.RDF_NS}}}Description"):
+                cls._add_properties(metadata, description, "")
+        return metadata
+
+    @classmethod
+    def _add_properties(cls, metadata, element, prefix):
+        """Añade los atributos y elementos hijos de un rdf:Description."""
+        for attr, value in element.attrib.items():
+            if cls._is_syntax_attribute(attr):
+                continue
+            cls._set(metadata, prefix + cls._tag_name(attr), value.strip())
+
+        for child in element:
+            name = prefix + cls._tag_name(child.tag)
+            cls._add_value(metadata, name, child)
+
+    @classmethod
+    def _add_value(cls, metadata, name, element):
+        """Añade el valor de una propiedad, sea simple, contenedor o estructura."""
+        containers = [c for c in element if cls._local(c.tag) in cls.CONTAINERS and c.tag.startswith(f"{{{cls.RDF_NS}}}")]
+        if containers:
+            items = []
+            for item in containers[0]:
+                if len(item) or any(not cls._is_syntax_attribute(a) for a in item.attrib):
+                    description = item.find(f"{{{cls.RDF_NS}}}Description")
+                    cls._add_properties(metadata, description if description is not None else item, name)
+                elif item.text and item.text.strip():
+                    items.append(item.text.strip())
+            if items:
+                cls._set(metadata, name, items[0] if len(items) == 1 else items)
+            return
+
+        nested = [c for c in element if c.tag == f"{{{cls.RDF_NS}}}Description"]
+        if nested:
+            for struct in nested:
+                cls._add_properties(metadata, struct, name)
+            return
+        if element.get(f"{{{cls.RDF_NS}}}parseType") == "Resource":
+            cls._add_properties(metadata, element, name)
+            return
+
+        resource = element.get(f"{{{cls.RDF_NS}}}resource")
+        if resource is not None:
+            cls._set(metadata, name, resource)
+        elif element.text and element.text.strip():
+            cls._set(metadata, name, element.text.strip())
+
+    @classmethod
+    def _is_syntax_attribute(cls, attr):
+        """Indica si un atributo pertenece a la sintaxis RDF/XML (rdf:*, xml:lang) y no es una propiedad."""
+        return attr.startswith(f"{{{cls.RDF_NS}}}") or attr.startswith(f"{{{cls.XML_NS}}}")
+
+    @staticmethod
+    def _set(metadata, name, value):
+        """Guarda un valor, acumulando en lista si la propiedad ya existe."""
+        key = f"XMP:{name}"
+        if key in metadata:
+            previous = metadata[key] if isinstance(metadata[key], list) else [metadata[key]]
+            metadata[key] = previous + (value if isinstance(value, list) else [value])
+        else:
+            metadata[key] = value
+
+    @classmethod
+    def _tag_name(cls, tag):
+        """Convierte '{ns}localName' en el nombre de etiqueta de exiftool."""
+        local = cls._local(tag)
+        return local[:1].upper() + local[1:]
+
+    @staticmethod
+    def _local(tag):
+        """Obtiene el nombre local de una etiqueta o atributo XML."""
+        return tag.rsplit('}', 1)[-1]
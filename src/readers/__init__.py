@@ -0,0 +1,5 @@
+"""
+Paquete de lectores nativos de metadatos para la aplicación MetaInfo.
+Contiene extractores en Python puro que leen solo las estructuras de metadatos
+de los formatos más comunes, como alternativa rápida a ExifTool.
+"""
@@ -9,214 +9,205 @@ class Templates:
     """
     
     @staticmethod
-    def get_html_style():
+    def get_html_report_style():
         """
-        Obtiene el estilo CSS para informes HTML.
+        Obtiene el estilo CSS del informe HTML generado directamente desde los resultados.
         
         Returns:
-            str: Código CSS para estilizar informes HTML
+            str: Código CSS (sin la etiqueta style)
         """
         return """
-<style>
-    body { 
-        font-family: Arial, sans-serif; 
-        line-height: 1.6; 
-        margin: 0; 
+    body {
+        font-family: Arial, sans-serif;
+        line-height: 1.6;
+        margin: 0;
         padding: 20px;
         color: #333;
-        max-width: 1200px;
-        margin: 0 auto;
-    }
-    h1, h2, h3 { color: #2c3e50; }
-    h1 { 
-        border-bottom: 2px solid #3498db; 
-        padding-bottom: 10px; 
-        margin-top: 30px;
-    }
-    h2 { 
-        border-bottom: 1px solid #bdc3c7; 
-        padding-bottom: 5px; 
-        margin-top: 25px; 
-    }
-    h3 {
-        margin-top: 20px;
-        background-color: #f8f9fa;
-        padding: 8px;
-        border-radius: 4px;
     }
-    table { 
-        border-collapse: collapse; 
-        width: 100%; 
-        margin: 20px 0;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    
+    .header {
+        background-color: #2C3E50;
+        color: white;
+        padding: 2em;
+        margin: -20px -20px 2em -20px;
+        text-align: center;
     }
-    th, td { 
-        text-align: left; 
-        padding: 12px; 
-        border: 1px solid #ddd; 
+    
+    .header h1 {
+        margin: 0;
+        font-size: 2.5em;
+        color: white;
     }
-    th { 
-        background-color: #f2f2f2; 
-        color: #333;
-        position: sticky;
-        top: 0;
-    }
-    tr:nth-child(even) { background-color: #f9f9f9; }
-    tr:hover { background-color: #f1f1f1; }
-    code, .file-path { 
-        font-family: Consolas, monospace; 
-        background-color: #f8f8f8; 
-        padding: 2px 5px;
-        border-radius: 3px;
+    
+    .header .subtitle {
+        font-size: 1.2em;
+        margin-top: 0.5em;
+        color: #ecf0f1;
+    }
+    
+    .header .meta {
+        margin-top: 1em;
         font-size: 0.9em;
+        color: #bdc3c7;
+    }
+    
+    .header .meta span {
+        margin: 0 1em;
+    }
+    
+    h1, h2, h3, h4, h5, h6 {
+        color: #2C3E50;
+        margin-top: 1.5em;
+        margin-bottom: 0.5em;
+    }
+    
+    h1 { font-size: 2em; }
+    h2 { font-size: 1.5em; }
+    h3 { font-size: 1.2em; }
+    
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        margin: 1em 0;
+    }
+    
+    th, td {
+        border: 1px solid #ddd;
+        padding: 8px;
+        text-align: left;
+    }
+    
+    th {
+        background-color: #2C3E50;
+        color: white;
     }
-    .sensitive { 
-        color: #e74c3c; 
-        font-weight: bold; 
+    
+    tr:nth-child(even) {
+        background-color: #f9f9f9;
     }
-    .metadata-key { 
-        font-weight: bold; 
-        color: #2980b9; 
+    
+    code {
+        background-color: #f5f5f5;
+        padding: 2px 4px;
+        border-radius: 3px;
+        font-family: monospace;
+        font-size: 0.9em;
     }
-    pre { 
-        background-color: #f8f8f8; 
-        padding: 15px; 
-        border-radius: 5px; 
+    
+    pre {
+        background-color: #f5f5f5;
+        padding: 1em;
+        border-radius: 5px;
         overflow-x: auto;
+    }
+    
+    details {
+        margin: 1em 0;
+        padding: 0.5em;
         border: 1px solid #ddd;
+        border-radius: 4px;
     }
+    
+    summary {
+        cursor: pointer;
+        font-weight: bold;
+        padding: 0.5em;
+        background-color: #f5f5f5;
+        border-radius: 3px;
+    }
+    
+    summary:hover {
+        background-color: #e9e9e9;
+    }
+    
     footer {
-        margin-top: 50px;
-        padding-top: 20px;
-        border-top: 1px solid #eee;
+        margin-top: 2em;
+        padding-top: 1em;
+        border-top: 1px solid #ddd;
         text-align: center;
+        color: #666;
         font-size: 0.9em;
-        color: #777;
     }
-</style>
+    
+    a {
+        color: #2980b9;
+        text-decoration: none;
+    }
+    
+    a:hover {
+        text-decoration: underline;
+    }
+    
+    blockquote {
+        border-left: 4px solid #2C3E50;
+        margin: 1em 0;
+        padding-left: 1em;
+        color: #666;
+    }
+    
+    img {
+        max-width: 100%;
+        height: auto;
+    }
+    
+    hr {
+        border: none;
+        border-top: 1px solid #ddd;
+        margin: 2em 0;
+    }
+    
+    td.sensitive {
+        color: #e74c3c;
+        font-weight: bold;
+    }
 """
 
     @staticmethod
-    def get_latex_header():
+    def get_html_report_start(title, directory, date):
         """
-        Obtiene el preámbulo LaTeX para informes PDF.
+        Obtiene el inicio del documento HTML del informe, con la cabecera de portada.
         
+        Args:
+            title: Título del informe (ya escapado)
+            directory: Directorio analizado (ya escapado)
+            date: Fecha del análisis
+            
         Returns:
-            str: Preámbulo LaTeX para personalizar informes PDF
+            str: HTML desde la declaración del documento hasta la cabecera incluida
         """
-        return r"""
-\usepackage{titling}
-\usepackage{titlesec}
-\usepackage{fancyhdr}
-\usepackage{xcolor}
-\usepackage{graphicx}
-\usepackage{booktabs}
-\usepackage{array}
-\usepackage{colortbl}
-\usepackage{hyperref}
-\usepackage{etoolbox}
-
-% Personalización de cabecera y pie de página
-\pagestyle{fancy}
-\fancyhf{}
-\fancyhead[L]{MetaInfo Tool}
-\fancyhead[R]{\thepage}
-\fancyfoot[C]{Informe de Metadatos}
-
-% Formato de tabla mejorado
-\renewcommand{\arraystretch}{1.3}
-\definecolor{table-row-color}{RGB}{242, 242, 242}
-\definecolor{table-header-color}{RGB}{44, 62, 80}
-
-% Comando para portada personalizada si no se usa Eisvogel
-\AtBeginDocument{
-  \ifdefined\eisvogeltitlepage
-  \else
-    \begin{titlepage}
-      \centering
-      \vspace*{3cm}
-      \includegraphics[width=0.3\textwidth]{example-image}
-      \vspace{1cm}
-      
-      \textcolor{teal}{\rule{\linewidth}{0.5mm}}
-      \vspace{0.5cm}
-      
-      {\Huge\bfseries\thetitle\par}
-      \vspace{0.5cm}
-      
-      {\Large\theauthor\par}
-      \vspace{0.5cm}
-      
-      {\large\thedate\par}
-      \vspace{0.5cm}
-      
-      \textcolor{teal}{\rule{\linewidth}{0.5mm}}
-      \vfill
-      
-      {\large Generado automáticamente\par}
-      \vspace{1cm}
-    \end{titlepage}
-    \newpage
-    \tableofcontents
-    \newpage
-  \fi
-}
-
-% Modificar el entorno longtable para aplicar colores alternativos a las filas de manera segura
-\AtBeginEnvironment{longtable}{%
-  \rowcolors{2}{white}{table-row-color}%
-}
-
-\let\oldtoprule\toprule
-\renewcommand{\toprule}{
-  \arrayrulecolor{table-header-color}
-  \oldtoprule
-  \arrayrulecolor{black}
-}
+        return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>{Templates.get_html_report_style()}    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{title}</h1>
+        <div class="subtitle">Directorio analizado: {directory}</div>
+        <div class="meta">
+            <span>Fecha: {date}</span>
+            <span>Autor: MetaInfo Tool</span>
+        </div>
+    </div>
 """
 
     @staticmethod
-    def get_latex_table_style():
+    def get_html_report_end(date):
         """
-        Obtiene el estilo LaTeX para tablas cuando se usa el método de dos pasos.
+        Obtiene el final del documento HTML del informe, con el pie de página.
         
+        Args:
+            date: Fecha de generación
+            
         Returns:
-            str: Código LaTeX para estilizar tablas
+            str: HTML del pie y cierre del documento
         """
-        return r"""
-\usepackage{booktabs}
-\usepackage{array}
-\usepackage{longtable}
-\usepackage{colortbl}
-\usepackage{xcolor}
-\usepackage{etoolbox}
-\definecolor{table-header-color}{RGB}{44, 62, 80}
-\definecolor{table-row-color}{RGB}{242, 242, 242}
-
-\renewcommand{\arraystretch}{1.3}
-
-% Definir colores para filas de tabla de manera segura
-\AtBeginEnvironment{longtable}{%
-  \rowcolors{2}{white}{table-row-color}%
-}
-
-% Aplicar estilo a las cabeceras
-\let\oldhead\head
-\renewcommand{\head}[1]{\rowcolor{table-header-color}\color{white}\bfseries #1}
+        return f"""    <footer>
+        <p>Informe generado por MetaInfo Tool - {date}</p>
+    </footer>
+</body>
+</html>
 """
-
-    @staticmethod
-    def get_basic_pandoc_args():
-        """
-        Obtiene los argumentos básicos para pandoc que funcionan en la mayoría de sistemas.
-        
-        Returns:
-            list: Lista de argumentos para pandoc
-        """
-        return [
-            '--pdf-engine=xelatex',
-            '--variable=geometry:margin=2cm',
-            '--toc',
-            '--toc-depth=2',
-            '-V', 'lang=es'
-        ] 
\ No newline at end of file
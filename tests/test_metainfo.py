@@ -6,6 +6,13 @@ import os
 import sys
 import tempfile
 import shutil
+import multiprocessing
+import threading
+import io
+import time
+import gzip
+import json
+from contextlib import redirect_stdout
 from unittest.mock import patch, MagicMock, mock_open
 
 # Añadir la ruta raíz del proyecto al path para poder importar los módulos
@@ -16,6 +23,16 @@ from src.SensitivePatterns import SensitivePatterns
 from src.SupportedExtensions import SupportedExtensions
 from src.Cleaner import Cleaner
 from src.Reporter import Reporter
+from src.ExifToolPool import ExifToolPool
+from src.PatternIndex import PatternIndex
+from src.PatternPacks import PatternPacks
+from src.DirectoryWalker import DirectoryWalker
+from src.ReportPipeline import ReportPipeline
+from src.HtmlReportWriter import HtmlReportWriter
+from src.NdjsonReportWriter import NdjsonReportWriter
+from src.ResultStore import ResultStore
+from src.Messages import Messages
+from src.ParameterValidator import ParameterValidator
 
 class TestMetaInfo(unittest.TestCase):
     
@@ -64,6 +81,100 @@ class TestMetaInfo(unittest.TestCase):
         # Verificar resultado
         self.assertEqual(result, [{'SourceFile': 'test.jpg', 'EXIF:Make': 'Canon'}])
         
+    @patch('exiftool.ExifToolHelper')
+    def test_exiftool_pool_reuse_and_restart(self, mock_exiftool):
+        """Probar que el pool reutiliza el proceso exiftool y lo reinicia si muere"""
+        mock_instance = mock_exiftool.return_value.__enter__.return_value
+        mock_instance.get_metadata.return_value = [{'SourceFile': 'test.jpg'}]
+        
+        pool = ExifToolPool()
+        pool.get_metadata('a.jpg')
+        pool.get_metadata('b.jpg')
+        self.assertEqual(mock_exiftool.call_count, 1)
+        
+        # Simular la muerte del proceso: la petición se reintenta con uno nuevo
+        mock_instance.get_metadata.side_effect = [BrokenPipeError(), [{'SourceFile': 'c.jpg'}]]
+        result = pool.get_metadata('c.jpg')
+        self.assertEqual(result, [{'SourceFile': 'c.jpg'}])
+        self.assertEqual(mock_exiftool.call_count, 2)
+        
+        pool.close()
+        self.assertEqual(mock_exiftool.return_value.__exit__.call_count, 2)
+
+    @patch('exiftool.ExifToolHelper')
+    def test_exiftool_pool_wakes_waiters(self, mock_exiftool):
+        """Probar que los hilos que esperan un proceso se despiertan al descartar uno o cerrar el pool"""
+        mock_exiftool.return_value.__enter__.return_value.get_metadata.return_value = [{'SourceFile': 'a.jpg'}]
+        pool = ExifToolPool(size=1)
+
+        for wake in (pool._discard, lambda worker: pool.close()):
+            busy = pool._acquire()
+            results = []
+            waiter = threading.Thread(target=lambda: results.append(pool.get_metadata('a.jpg')))
+            waiter.start()
+            waiter.join(0.2)
+            self.assertTrue(waiter.is_alive())
+
+            # El hilo en espera arranca un proceso sustituto en lugar de quedarse bloqueado
+            wake(busy)
+            waiter.join(5)
+            self.assertFalse(waiter.is_alive())
+            self.assertEqual(results, [[{'SourceFile': 'a.jpg'}]])
+            pool._release(busy)
+        pool.close()
+
+    @patch('exiftool.ExifToolHelper')
+    def test_inspect_batch_maps_and_isolates(self, mock_exiftool):
+        """Probar la extracción por lotes y el aislamiento de archivos que fallan"""
+        mock_instance = mock_exiftool.return_value.__enter__.return_value
+        jpg = os.path.join(self.test_dir, 'image.jpg')
+        pdf = os.path.join(self.test_dir, 'document.pdf')
+        
+        # La respuesta del lote se asocia a cada archivo por 'SourceFile'
+        mock_instance.get_metadata.return_value = [{'SourceFile': pdf, 'PDF:Author': 'Ana'},
+                                                   {'SourceFile': jpg, 'EXIF:Make': 'Canon'}]
+        result = self.main.inspect_batch([jpg, pdf])
+        self.assertEqual(result, [[{'SourceFile': jpg, 'EXIF:Make': 'Canon'}],
+                                  [{'SourceFile': pdf, 'PDF:Author': 'Ana'}]])
+        
+        # Si el lote falla, se inspecciona archivo a archivo
+        def fake_get_metadata(files, params=None):
+            if isinstance(files, list):
+                raise ValueError("lote fallido")
+            if files == pdf:
+                raise ValueError("archivo corrupto")
+            return [{'SourceFile': files}]
+        mock_instance.get_metadata.side_effect = fake_get_metadata
+        result = self.main.inspect_batch([jpg, pdf])
+        self.assertEqual(result[0], [{'SourceFile': jpg}])
+        self.assertIn('error', result[1])
+        
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "Requiere procesos creados con fork")
+    @patch('exiftool.ExifToolHelper')
+    def test_parallel_report_matches_serial(self, mock_exiftool):
+        """Probar que el escaneo con varios procesos produce el mismo resultado que el secuencial"""
+        os.makedirs(os.path.join(self.test_dir, 'sub'))
+        for i in range(5):
+            with open(os.path.join(self.test_dir, 'sub', f'photo{i}.jpg'), 'wb') as f:
+                f.write(b'\xff\xd8')
+        
+        def fake_get_metadata(files, params=None):
+            files = files if isinstance(files, list) else [files]
+            return [{'SourceFile': fn, 'EXIF:Artist': os.path.basename(fn)} for fn in files]
+        mock_exiftool.return_value.__enter__.return_value.get_metadata.side_effect = fake_get_metadata
+        
+        self.main.args.update({'batch_size': 2, 'workers': 1})
+        serial_info = self.main._initialize_metadata_info()
+        self.main.reporter._process_directory_for_report(self.test_dir, serial_info)
+        
+        self.main.args['workers'] = 3
+        parallel_info = self.main._initialize_metadata_info()
+        self.main.reporter._process_directory_for_report(self.test_dir, parallel_info)
+        
+        self.assertEqual(serial_info['total_files'], 8)
+        self.assertEqual(serial_info, parallel_info)
+        self.assertEqual(list(serial_info['extensions_stats']), list(parallel_info['extensions_stats']))
+        
     def test_supported_extensions(self):
         """Probar la obtención de extensiones soportadas"""
         # Verificar que las extensiones comunes están incluidas
@@ -83,6 +194,424 @@ class TestMetaInfo(unittest.TestCase):
             self.assertTrue(any(pattern.lower() in p.lower() for p in patterns),
                            f"No se encontró el patrón '{pattern}' en los patrones sensibles")
     
+    def test_markdown_writer_streams_report(self):
+        """Probar que el informe Markdown se escribe archivo a archivo y se completa al cerrarlo"""
+        metadata_info = self.main._initialize_metadata_info()
+        metadata_info.update({'total_files': 2, 'files_with_metadata': 2, 'files_with_sensitive': 1,
+                              'extensions_stats': {'.jpg': {'count': 2, 'with_metadata': 2, 'with_sensitive': 1}}})
+        files = [
+            {'file_path': 'a.jpg', 'total_metadata': 1, 'has_sensitive': True,
+             'metadata': [{'key': 'EXIF:Artist', 'value': 'Ana | B', 'is_sensitive': True, 'matching_patterns': ['artist']}]},
+            {'file_path': 'sub/b.jpg', 'total_metadata': 1, 'has_sensitive': False,
+             'metadata': [{'key': 'EXIF:Make', 'value': 'Canon', 'is_sensitive': False, 'matching_patterns': []}]},
+        ]
+        
+        writer = self.main.reporter.open_report_writers()['markdown']
+        writer.add_file(files[0])
+        # La sección de cada archivo está en disco antes de terminar el análisis
+        self.assertTrue(os.path.exists(writer.body_path))
+        writer.add_file(files[1])
+        md_path = writer.close(self.test_dir, metadata_info)
+        self.assertFalse(os.path.exists(writer.body_path))
+        
+        with open(md_path, encoding='utf-8') as f:
+            streamed = f.read()
+        # Cabecera con el resumen, una sección por archivo en orden de llegada y el pie
+        reporter = self.main.reporter
+        self.assertTrue(streamed.startswith('---\n'))
+        self.assertIn('| .jpg | 2 | 2 | 1 |', streamed)
+        sections = [reporter._markdown_file_section(file_info) for file_info in files]
+        self.assertIn("".join(sections), streamed)
+        self.assertTrue(streamed.endswith(reporter._markdown_trailer()))
+        self.assertLess(streamed.index('Resumen por Tipo de Archivo'), streamed.index('### a.jpg'))
+        self.assertLess(streamed.index('### a.jpg'), streamed.index('### b.jpg'))
+        
+        writer = self.main.reporter.open_report_writers()['markdown']
+        writer.add_file(files[0])
+        writer.abort()
+        self.assertFalse(os.path.exists(writer.body_path))
+    
+    def test_html_writer_renders_records(self):
+        """Probar que el informe HTML se genera directamente desde los registros"""
+        metadata_info = self.main._initialize_metadata_info()
+        metadata_info.update({'total_files': 1, 'files_with_metadata': 1, 'files_with_sensitive': 1,
+                              'extensions_stats': {'.jpg': {'count': 1, 'with_metadata': 1, 'with_sensitive': 1}}})
+        file_info = {'file_path': 'a.jpg', 'total_metadata': 2, 'has_sensitive': True,
+                     'metadata': [{'key': 'EXIF:Artist', 'value': '<script>x</script>', 'is_sensitive': True,
+                                   'matching_patterns': ['artist']},
+                                  {'key': 'EXIF:Comment', 'value': 'z' * 300, 'is_sensitive': False,
+                                   'matching_patterns': []}]}
+        
+        writer = HtmlReportWriter(self.main.reporter, os.path.join(self.test_dir, 'report.html'))
+        writer.add_file(file_info)
+        html_path = writer.close(self.test_dir, metadata_info)
+        self.assertFalse(os.path.exists(writer.body_path))
+        
+        with open(html_path, encoding='utf-8') as f:
+            content = f.read()
+        # Los valores se escapan, se recortan y los sensibles se marcan con su clase
+        self.assertIn('&lt;script&gt;x&lt;/script&gt;', content)
+        self.assertNotIn('<script>', content)
+        self.assertNotIn('z' * 101, content)
+        self.assertIn('<td class="sensitive">', content)
+        self.assertLess(content.index('Resumen por Tipo de Archivo'), content.index('<h3>a.jpg</h3>'))
+        self.assertTrue(content.rstrip().endswith('</html>'))
+    
+    def test_report_falls_back_to_html_when_pdf_fails(self):
+        """Probar que un fallo del PDF no impide entregar el Markdown y el HTML"""
+        metadata_info = self.main._initialize_metadata_info()
+        self.main.reporter.args['html'] = True
+        writers = self.main.reporter.open_report_writers()
+        pdf_writer = MagicMock()
+        pdf_writer.close.side_effect = RuntimeError("fallo de maquetación")
+        writers['pdf'] = pdf_writer
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            md_path, pdf_path, html_path = self.main.reporter.generate_report(self.test_dir, metadata_info, writers)
+        
+        self.assertIsNone(pdf_path)
+        self.assertTrue(os.path.exists(md_path))
+        self.assertTrue(os.path.exists(html_path))
+        pdf_writer.abort.assert_called_once()
+        self.assertIn(Messages.INFO_HTML_ALTERNATIVE.format(html_path), output.getvalue())
+    
+    @unittest.skipUnless(ParameterValidator.check_dependency('reportlab'), "reportlab no está instalado")
+    def test_pdf_writer_renders_records(self):
+        """Probar que el informe PDF se maqueta desde los registros con memoria acotada"""
+        from src.PdfReportWriter import PdfReportWriter, _StreamingDocTemplate
+        
+        metadata_info = self.main._initialize_metadata_info()
+        metadata_info.update({'total_files': 60, 'files_with_metadata': 60, 'files_with_sensitive': 30,
+                              'extensions_stats': {'.jpg': {'count': 60, 'with_metadata': 60, 'with_sensitive': 30}}})
+        writer = PdfReportWriter(self.main.reporter, os.path.join(self.test_dir, 'report.pdf'))
+        for i in range(60):
+            writer.add_file({'file_path': f'dir/foto_{i}.jpg', 'total_metadata': 2, 'has_sensitive': i % 2 == 0,
+                             'metadata': [{'key': 'EXIF:Artist', 'value': 'Ana <María> & José ' * 10,
+                                           'is_sensitive': i % 2 == 0, 'matching_patterns': ['artist']},
+                                          {'key': 'EXIF:Make', 'value': '日本', 'is_sensitive': False,
+                                           'matching_patterns': []}]})
+        
+        # reportlab nunca tiene más de LOOKAHEAD flowables pendientes y el iterador se agota
+        writer.LOOKAHEAD = 8
+        pending = []
+        exhausted = []
+        handle_flowable = _StreamingDocTemplate.handle_flowable
+        iter_flowables = writer._iter_flowables
+        
+        def spy_handle(doc, flowables):
+            if flowables is doc._story:
+                pending.append(len(flowables))
+            return handle_flowable(doc, flowables)
+        
+        def spy_iter(info):
+            yield from iter_flowables(info)
+            exhausted.append(True)
+        
+        with patch.object(_StreamingDocTemplate, 'handle_flowable', spy_handle), \
+             patch.object(writer, '_iter_flowables', spy_iter):
+            pdf_path = writer.close(self.test_dir, metadata_info)
+        self.assertGreater(len(pending), 60 * 3)
+        self.assertLessEqual(max(pending), writer.LOOKAHEAD)
+        self.assertEqual(exhausted, [True])
+        self.assertFalse(os.path.exists(writer.body_path))
+        with open(pdf_path, 'rb') as f:
+            self.assertEqual(f.read(5), b'%PDF-')
+        
+        # Los valores fuera de cp1252 usan la fuente de --pdf_font; si no se puede cargar se avisa
+        import reportlab
+        record = {'file_path': 'a.jpg', 'total_metadata': 1, 'has_sensitive': False,
+                  'metadata': [{'key': 'EXIF:Make', 'value': 'Ωmega', 'is_sensitive': False, 'matching_patterns': []}]}
+        for font, embedded in ((os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf'), True),
+                               (os.path.join(self.test_dir, 'no_existe.ttf'), False)):
+            self.main.reporter.args['pdf_font'] = font
+            output = io.StringIO()
+            with redirect_stdout(output):
+                writer = PdfReportWriter(self.main.reporter, os.path.join(self.test_dir, 'unicode.pdf'))
+                writer.add_file(record)
+                pdf_path = writer.close(self.test_dir, metadata_info)
+            with open(pdf_path, 'rb') as f:
+                self.assertEqual(b'BitstreamVeraSans' in f.read(), embedded)
+            self.assertEqual('--pdf_font' in output.getvalue(), not embedded)
+    
+    def test_ndjson_writer_streams_records(self):
+        """Probar que el informe NDJSON escribe un objeto por archivo y un resumen final"""
+        metadata_info = self.main._initialize_metadata_info()
+        metadata_info.update({'total_files': 1, 'files_with_metadata': 1, 'files_with_sensitive': 1,
+                              'extensions_stats': {'.jpg': {'count': 1, 'with_metadata': 1, 'with_sensitive': 1}}})
+        file_info = {'file_path': 'sub/a.JPG', 'total_metadata': 1, 'has_sensitive': True,
+                     'metadata': [{'key': 'EXIF:Artist', 'value': 'Ana "B"\nC', 'is_sensitive': True,
+                                   'matching_patterns': ['artist']}]}
+        
+        for compress, opener in ((False, open), (True, gzip.open)):
+            writer = NdjsonReportWriter(self.main.reporter, os.path.join(self.test_dir, 'report.ndjson'), compress)
+            writer.add_file(file_info)
+            path = writer.close(self.test_dir, metadata_info)
+            self.assertEqual(path.endswith('.gz'), compress)
+            
+            with opener(path, 'rt', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([r['type'] for r in records], ['file', 'summary'])
+            self.assertEqual(records[0]['extension'], '.jpg')
+            self.assertEqual(records[0]['metadata'], file_info['metadata'])
+            self.assertEqual(records[1]['extensions_stats'], metadata_info['extensions_stats'])
+        
+        writer = NdjsonReportWriter(self.main.reporter, os.path.join(self.test_dir, 'aborted.ndjson'))
+        writer.add_file(file_info)
+        writer.abort()
+        self.assertFalse(os.path.exists(writer.path))
+    
+    def test_result_store_queries_runs(self):
+        """Probar que el almacén SQLite guarda las ejecuciones y responde a las consultas"""
+        db_path = os.path.join(self.test_dir, 'results.db')
+        files = [
+            {'file_path': 'fotos/a.JPG', 'total_metadata': 2, 'has_sensitive': True,
+             'metadata': [{'key': 'EXIF:GPSLatitude', 'value': 40.4, 'is_sensitive': True,
+                           'matching_patterns': ['gps', 'latitude']},
+                          {'key': 'EXIF:Make', 'value': 'Canon', 'is_sensitive': False, 'matching_patterns': []}]},
+            {'file_path': 'docs/b.pdf', 'total_metadata': 1, 'has_sensitive': False,
+             'metadata': [{'key': 'Title', 'value': ['x', 'y'], 'is_sensitive': False, 'matching_patterns': []}]},
+        ]
+        metadata_info = {'total_files': 2, 'files_with_metadata': 2, 'files_with_sensitive': 1}
+        
+        store = ResultStore(db_path)
+        store.BATCH_SIZE = 1
+        first_run = store.begin_run(self.test_dir)
+        for file_info in files:
+            store.add_file(file_info)
+        store.close(self.test_dir, metadata_info)
+        
+        # Una ejecución interrumpida no deja registros
+        store = ResultStore(db_path)
+        store.begin_run(self.test_dir)
+        store.add_file(files[0])
+        store.flush()
+        store.abort()
+        
+        store = ResultStore(db_path)
+        try:
+            self.assertEqual(store.connection.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertEqual([run[0] for run in store.runs()], [first_run])
+            self.assertEqual(store.query(tag='GPS*', files_only=True), [(first_run, 'fotos/a.JPG')])
+            self.assertEqual(store.query(pattern='latitude'),
+                             [(first_run, 'fotos/a.JPG', 'EXIF', 'GPSLatitude', 40.4, 1, 'gps, latitude')])
+            self.assertEqual([row[3] for row in store.query(extension='JPG')], ['GPSLatitude', 'Make'])
+            self.assertEqual(store.query(path='docs/*')[0][2:5], ('', 'Title', "['x', 'y']"))
+            self.assertEqual(len(store.query(sensitive=True)), 1)
+            self.assertEqual(store.query(tag='gps*'), [])
+        finally:
+            store.connection.close()
+    
+    @unittest.skipUnless(ParameterValidator.check_dependency('pyarrow'), "pyarrow no está instalado")
+    def test_parquet_writer_row_groups(self):
+        """Probar que la exportación Parquet escribe un campo por fila en grupos de filas"""
+        import pyarrow.parquet as pq
+        from src.ParquetReportWriter import ParquetReportWriter
+        
+        writer = ParquetReportWriter(self.main.reporter, os.path.join(self.test_dir, 'fields.parquet'))
+        writer.ROW_GROUP_SIZE = 4
+        for i in range(5):
+            writer.add_file({'file_path': f'fotos/{i}.JPG', 'total_metadata': 2, 'has_sensitive': True,
+                             'metadata': [{'key': 'EXIF:GPSLatitude', 'value': 40.4, 'is_sensitive': True,
+                                           'matching_patterns': ['gps']},
+                                          {'key': 'Title', 'value': None, 'is_sensitive': False,
+                                           'matching_patterns': []}]})
+        path = writer.close(self.test_dir, self.main._initialize_metadata_info())
+        
+        parquet_file = pq.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_rows, 10)
+        self.assertGreater(parquet_file.metadata.num_row_groups, 1)
+        rows = parquet_file.read().to_pylist()
+        self.assertEqual(rows[0], {'path': 'fotos/0.JPG', 'extension': '.jpg', 'group': 'EXIF', 'tag': 'GPSLatitude',
+                                   'value': '40.4', 'sensitive': True, 'patterns': ['gps']})
+        self.assertEqual((rows[1]['group'], rows[1]['tag'], rows[1]['value']), ('', 'Title', None))
+    
+    def test_report_pipeline(self):
+        """Probar la canalización por etapas: orden, contrapresión y propagación de errores"""
+        produced = []
+        
+        def source():
+            for i in range(50):
+                produced.append(i)
+                yield i
+        
+        def consume(item):
+            # Las colas acotadas impiden que la fuente se adelante más de unos pocos elementos
+            self.assertLessEqual(len(produced) - item, 4 * 3 + 3)
+            results.append(item)
+        
+        results = []
+        pipeline = ReportPipeline(queue_size=4)
+        pipeline.run(source(), [lambda items: (i * 2 for i in items), lambda items: (i // 2 for i in items)], consume)
+        self.assertEqual(results, list(range(50)))
+        
+        def failing(items):
+            for i in items:
+                if i == 3:
+                    raise ValueError("fallo en la etapa")
+                yield i
+        results = []
+        with self.assertRaises(ValueError):
+            pipeline.run(range(1000), [failing], results.append)
+        self.assertEqual(results, [0, 1, 2])
+    
+    def test_directory_walker(self):
+        """Probar el recorrido iterativo con scandir: orden, sufijos, enlaces y árboles profundos"""
+        root = os.path.join(self.test_dir, 'walk')
+        os.makedirs(os.path.join(root, 'b', 'c'))
+        for name in ('a.JPG', 'b/x.pdf', 'b/c/y.Png', 'b/notes.txt', 'b/fakejpg', 'z.jpeg'):
+            open(os.path.join(root, name), 'wb').close()
+        walker = DirectoryWalker(['jpg', 'jpeg', 'pdf', 'png'])
+        found = [os.path.relpath(path, root).replace(os.sep, '/') for path in walker.iter_files(root)]
+        self.assertEqual(sorted(found), ['a.JPG', 'b/c/y.Png', 'b/x.pdf', 'z.jpeg'])
+        # Un subdirectorio se recorre completo en la posición en que aparece en el listado
+        subtree = [i for i, path in enumerate(found) if path.startswith('b/')]
+        self.assertEqual(subtree, list(range(subtree[0], subtree[0] + 2)))
+        
+        # Los enlaces a un directorio ancestro no provocan un recorrido infinito
+        if hasattr(os, 'symlink'):
+            os.symlink(root, os.path.join(root, 'b', 'loop'))
+            self.assertEqual(len(list(walker.iter_files(root))), 4)
+        
+        # La profundidad no está limitada por el límite de recursión
+        deep = os.path.join(self.test_dir, 'deep')
+        path = deep
+        for _ in range(300):
+            path = os.path.join(path, 'd')
+        os.makedirs(path)
+        open(os.path.join(path, 'bottom.jpg'), 'wb').close()
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            self.assertEqual([os.path.basename(p) for p in walker.iter_files(deep)], ['bottom.jpg'])
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+        
+        # El recorrido con varios hilos devuelve los archivos en el mismo orden
+        for year in range(3):
+            for month in range(6):
+                month_dir = os.path.join(root, f'{year}', f'{month}')
+                os.makedirs(month_dir)
+                open(os.path.join(month_dir, f'{year}-{month}.jpg'), 'wb').close()
+        serial = list(walker.iter_files(root))
+        self.assertEqual(list(DirectoryWalker(['jpg', 'jpeg', 'pdf', 'png'], workers=4).iter_files(root)), serial)
+        
+        errors = []
+        self.assertEqual(list(DirectoryWalker(['jpg'], on_error=lambda d, e: errors.append(d)).iter_files(
+            os.path.join(self.test_dir, 'missing'))), [])
+        self.assertEqual(list(DirectoryWalker(['jpg'], on_error=lambda d, e: errors.append(d), workers=2).iter_files(
+            os.path.join(self.test_dir, 'missing'))), [])
+        self.assertEqual(len(errors), 2)
+    
+    def test_pattern_packs(self):
+        """Probar la selección de paquetes de patrones, los paquetes YAML y la caché del índice"""
+        packs = PatternPacks()
+        self.assertEqual(packs.select(), SensitivePatterns.get_all_patterns())
+        self.assertEqual(packs.select('english, device'), SensitivePatterns.ENGLISH + SensitivePatterns.DEVICE_METADATA)
+        with self.assertRaises(ValueError):
+            packs.select('klingon')
+        
+        pack_file = os.path.join(self.test_dir, 'medical.yaml')
+        with open(pack_file, 'w', encoding='utf-8') as f:
+            f.write("medical:\n  - patient\n  - diagnosis\nnegative:\n  - patientcount\n")
+        packs = PatternPacks([pack_file])
+        self.assertEqual(packs.select('device,medical')[-2:], ['patient', 'diagnosis'])
+        self.assertEqual(packs.extra_packs(), {'medical': ['patient', 'diagnosis']})
+        self.assertIn('patientcount', packs.negative_patterns)
+        
+        # La segunda construcción con los mismos patrones carga el índice de la caché
+        cache_dir = os.path.join(self.output_dir, 'cache')
+        first = PatternIndex(['patient'], ['patientcount'], cache_dir=cache_dir)
+        second = PatternIndex(['patient'], ['patientcount'], cache_dir=cache_dir)
+        self.assertFalse(first.loaded_from_cache)
+        self.assertTrue(second.loaded_from_cache)
+        self.assertEqual(second.check('XMP:PatientName', 'x'), (True, ['patient']))
+        self.assertEqual(second.check('XMP:PatientCount', 'x'), (False, []))
+        self.assertFalse(PatternIndex(['diagnosis'], [], cache_dir=cache_dir).loaded_from_cache)
+        # La caché no se carga si otros usuarios pueden modificarla o si está dañada
+        cache_path = second._cache_path(cache_dir)
+        os.chmod(cache_path, 0o666)
+        self.assertFalse(PatternIndex(['patient'], ['patientcount'], cache_dir=cache_dir).loaded_from_cache)
+        with open(cache_path, 'wb') as f:
+            f.write(b'\x00roto')
+        os.chmod(cache_path, 0o600)
+        self.assertFalse(PatternIndex(['patient'], ['patientcount'], cache_dir=cache_dir).loaded_from_cache)
+        
+        main = Main({'input_path': self.test_dir, 'output_path': self.output_dir,
+                     'pattern_file': [pack_file], 'patterns': 'medical'})
+        self.assertEqual(main.sensitive_patterns, ['patient', 'diagnosis'])
+        self.assertEqual(main.pattern_index.check('XMP:Author', 'x'), (False, []))
+        # --show_sensitive lista solo los paquetes seleccionados
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main.show_sensitive_patterns()
+        self.assertIn("MEDICAL:\npatient, diagnosis", output.getvalue())
+        self.assertIn("patientcount", output.getvalue())
+        self.assertNotIn("ESPAÑOL", output.getvalue())
+    
+    def test_pattern_index(self):
+        """Probar la detección de patrones con el índice precompilado"""
+        index = PatternIndex(['Email', 'Latitude', 'mail', 'Phone Number', 'IP'], ['file:filename'])
+        
+        # Subcadenas en clave y valor, devueltas en el orden de la lista de patrones
+        self.assertEqual(index.check('EXIF:GPSLatitude', 'x'), (True, ['Latitude']))
+        self.assertEqual(index.check('XMP:Contact', 'user@mail.com'), (True, ['mail', 'valor:email']))
+        self.assertEqual(index.check('PNG:Email', 'phone number'), (True, ['Email', 'mail', 'Phone Number']))
+        # Los patrones cortos solo coinciden de forma exacta
+        self.assertEqual(index.check('IP', 'x'), (True, ['IP']))
+        self.assertEqual(index.check('XMP:Description', 'ZIP'), (False, []))
+        # Los patrones negativos excluyen la clave y 'author' necesita un valor sensible
+        self.assertEqual(index.check('File:FileName', 'email.jpg'), (False, []))
+        self.assertEqual(index.check('Author', 'Juan'), (False, []))
+        self.assertEqual(index.check('Author', 'juan@mail.com'), (True, ['mail', 'valor:email']))
+        # El veredicto de cada clave se calcula una vez y se reutiliza con otros valores
+        misses = index.cache_stats()['misses']
+        self.assertEqual(index.check('PNG:Email', 'otro'), (True, ['Email', 'mail']))
+        self.assertEqual(index.cache_stats()['misses'], misses)
+        self.assertGreaterEqual(index.cache_stats()['hits'], 1)
+        # Valores binarios omitidos, valores largos recortados y listas analizadas elemento a elemento
+        self.assertEqual(index.check('EXIF:ThumbnailImage', '(Binary data 5120 bytes, use -b option to extract)'), (False, []))
+        self.assertEqual(index.check('XMP:Preview', b'\xff\xd8 email'), (False, []))
+        short_index = PatternIndex(['Email'], [], max_value_length=10)
+        self.assertEqual(short_index.check('XMP:Notes', 'x' * 20 + 'email'), (False, []))
+        self.assertEqual(short_index.check('XMP:Notes', ['x' * 20, 'email']), (True, ['Email']))
+        self.assertEqual(index.check('XMP:Subject', ['foo', 'IP']), (True, ['IP']))
+        # Detectores de valor: datos reconocidos por su forma en etiquetas de nombre inocuo
+        self.assertEqual(index.check('XMP:Notes', 'Llamar al +34 612 345 678'), (True, ['valor:telefono']))
+        self.assertEqual(index.check('XMP:Notes', 'Pago ES91 2100 0418 4502 0005 1332'), (True, ['valor:iban']))
+        self.assertEqual(index.check('XMP:Notes', '4111 1111 1111 1111'), (True, ['valor:tarjeta']))
+        self.assertEqual(index.check('XMP:Notes', '4111 1111 1111 1112'), (False, []))
+        self.assertEqual(index.check('XMP:Location', '40.416775, -3.703790'), (True, ['valor:gps']))
+        self.assertEqual(index.check('XMP:Host', ['192.168.1.10', 'fe80::1', '00:1A:2B:3C:4D:5E']),
+                         (True, ['valor:ipv4', 'valor:ipv6', 'valor:mac']))
+        self.assertEqual(index.check('XMP:Version', '999.1.2.3'), (False, []))
+        # Los números de versión con forma de IPv4 no son direcciones
+        self.assertEqual(index.check('EXIF:Software', 'Adobe Photoshop 5.1.2.3'), (False, []))
+        self.assertEqual(index.check('XMP:Notes', 'Version 2.3.4.5'), (False, []))
+        self.assertEqual(index.check('XMP:Notes', 'Ver. 1.2.3.4'), (False, []))
+        self.assertEqual(index.check('XMP:Notes', '1.0.0.0'), (False, []))
+        self.assertEqual(index.check('XMP:Notes', 'Subido desde 81.45.2.10'), (True, ['valor:ipv4']))
+        self.assertEqual(index.check('XMP:Notes', 'IP: 81.45.2.10'), (True, ['valor:ipv4']))
+        self.assertEqual(index.check('XMP:Notes', 'Firmware v 3.10.2.7'), (False, []))
+        self.assertEqual(index.check('XMP:Notes', 'build 1.0.2.4'), (False, []))
+        self.assertEqual(index.check('XMP:Notes', 'Windows 6.1.7.1'), (False, []))
+        for text in ('Connected to 192.168.1.5', 'user 203.0.113.7 uploaded', 'Camera 192.168.1.20',
+                     'Broadcast 10.0.0.255'):
+            self.assertEqual(index.check('XMP:Notes', text), (True, ['valor:ipv4']), text)
+        self.assertEqual(index.check('EXIF:ModifyDate', '2024:01:31 10:00:00'), (False, []))
+        self.assertEqual(index.check('Author', 'ana@empresa.es'), (True, ['valor:email']))
+        # La verificación en bloque deduplica claves y valores sin cambiar los veredictos
+        keys = ['PNG:Email', 'XMP:Notes', 'File:FileName', 'XMP:Notes', 'Author', 'XMP:Subject', 'EXIF:Flag']
+        values = ['otro', '+34 612 345 678', 'email.jpg', '+34 612 345 678', 'Juan', ['foo', 'IP'], {'a': 1}]
+        self.assertEqual(index.check_batch(keys, values), [index.check(k, v) for k, v in zip(keys, values)])
+        self.assertEqual(index.check_batch(['XMP:A', 'XMP:B'], [1, True]), [(False, []), (False, [])])
+        # Reporter delega en el índice de Main
+        self.assertEqual(self.main.reporter._check_sensitive_data('PNG:Email', 'a@b.c'),
+                         self.main.pattern_index.check('PNG:Email', 'a@b.c'))
+        # El informe guarda los binarios como marcador y los textos largos recortados
+        self.assertEqual(self.main.reporter._bounded_value(b'\x00' * 16), '(Binary data 16 bytes)')
+        self.assertEqual(len(self.main.reporter._bounded_value('a' * 10000)), PatternIndex.MAX_VALUE_LENGTH + 3)
+    
     @patch('src.Reporter.Reporter._process_directory_for_report')
     @patch('src.Reporter.Reporter.generate_report')
     def test_report_generation(self, mock_generate_report, mock_process_directory):
@@ -129,6 +658,114 @@ class TestMetaInfo(unittest.TestCase):
         self.assertTrue(result)
         mock_process_directory.assert_called_once()
 
+    def test_parallel_wipe_isolates_failures_and_keeps_order(self):
+        """Probar la limpieza paralela: aislamiento de errores, salida ordenada y resumen"""
+        def fake_clean(file_path):
+            # Los primeros archivos tardan más para forzar un orden de finalización distinto
+            time.sleep(0.05 if file_path.endswith('document.pdf') else 0)
+            if file_path.endswith('image.jpg'):
+                raise RuntimeError("archivo dañado")
+            if file_path.endswith('text.txt'):
+                try:
+                    raise ValueError("traza de prueba")
+                except ValueError:
+                    Messages.print_traceback()
+            Messages.print_info(f"limpio {os.path.basename(file_path)}")
+            return True
+        
+        self.main.args['workers'] = 3
+        output = io.StringIO()
+        with patch.object(self.main.cleaner, '_clean_all_metadata', side_effect=fake_clean), \
+             redirect_stdout(output):
+            result = self.main.wipe()
+        
+        self.assertTrue(result)
+        self.assertEqual(self.main.cleaner.summary, {'processed': 3, 'cleaned': 2, 'failed': 1})
+        
+        # Los mensajes de cada archivo aparecen en el orden del recorrido
+        lines = output.getvalue().splitlines()
+        started = [line for line in lines if line.startswith("Limpiando metadatos de")]
+        expected = [f"Limpiando metadatos de {os.path.join(self.test_dir, name)} ..." for name in os.listdir(self.test_dir)]
+        self.assertEqual(started, expected)
+        self.assertIn("Resumen de limpieza: 3 archivos procesados, 2 limpiados, 1 con errores", lines)
+        
+        # La traza de un hilo se imprime junto a los mensajes de su archivo
+        text_start = lines.index(f"Limpiando metadatos de {os.path.join(self.test_dir, 'text.txt')} ...")
+        self.assertEqual(lines[lines.index("ValueError: traza de prueba") + 1], "limpio text.txt")
+        self.assertGreater(lines.index("ValueError: traza de prueba"), text_start)
+        
+    @patch('exiftool.ExifToolHelper')
+    @patch('subprocess.run')
+    def test_bulk_wipe_uses_one_argfile(self, mock_subprocess_run, mock_exiftool):
+        """Probar la limpieza en bloque: un único exiftool -@ y resultado por archivo"""
+        jpg = os.path.join(self.test_dir, 'image.jpg')
+        txt = os.path.join(self.test_dir, 'text.txt')
+        # Una ruta que contiene a otra no debe recibir sus errores
+        jpg_copy = jpg + '.jpg'
+        shutil.copy(jpg, jpg_copy)
+        argfiles = []
+        
+        def fake_run(command, **kwargs):
+            result = MagicMock()
+            result.returncode = 0
+            result.stdout = ""
+            result.stderr = ""
+            if command[:2] == ['exiftool', '-@']:
+                with open(command[2], encoding='utf-8') as f:
+                    argfiles.append(f.read().splitlines())
+                blocks = [line for line in argfiles[-1] if line in (jpg, txt, jpg_copy)]
+                # image.jpg falla; image.jpg.jpg solo emite un aviso
+                for index, file_path in enumerate(blocks):
+                    result.stdout += f"{Cleaner.BULK_STATUS_MARKER} {index} {1 if file_path == jpg else 0}\n"
+                    if file_path == jpg:
+                        result.stderr += f"Error: Not a valid JPG - {jpg}\n"
+                    elif file_path == jpg_copy:
+                        result.stderr += f"Warning: [minor] Odd trailer - {jpg_copy}\n"
+                    result.stderr += f"{Cleaner.BULK_STATUS_MARKER} {index}\n"
+            return result
+        mock_subprocess_run.side_effect = fake_run
+        mock_exiftool.return_value.__enter__.return_value.get_metadata.side_effect = \
+            lambda files, params=None: [{'SourceFile': fn} for fn in (files if isinstance(files, list) else [files])]
+        
+        self.main.args.update({'bulk': True})
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertTrue(self.main.wipe())
+        
+        # Un solo archivo de argumentos con un comando por archivo (el PDF va por mat2)
+        self.assertEqual(len(argfiles), 1)
+        lines = argfiles[0]
+        self.assertEqual(lines.count('-execute'), 2)
+        self.assertEqual(sorted(line for line in lines if line in (jpg, txt, jpg_copy)), sorted([jpg, txt, jpg_copy]))
+        # El PDF falla al no encontrar qpdf y uno de los archivos del lote devuelve error
+        self.assertEqual(self.main.cleaner.summary, {'processed': 4, 'cleaned': 2, 'failed': 2})
+        # El error se asocia solo al archivo que lo produjo
+        self.assertIn(f"Error al ejecutar exiftool sobre {jpg}: Error: Not a valid JPG - {jpg}",
+                      output.getvalue().splitlines())
+
+    def test_bulk_wipe_fails_when_verification_fails(self):
+        """Probar que un lote cuya verificación final no se puede leer se cuenta como fallido"""
+        jpg = os.path.join(self.test_dir, 'image.jpg')
+        txt = os.path.join(self.test_dir, 'text.txt')
+        cleaner = self.main.cleaner
+
+        for sensitive in (False, True):
+            cleaner.sensitive = sensitive
+            cleaner.summary = {'processed': 0, 'cleaned': 0, 'failed': 0}
+            # En modo sensible la primera lectura localiza las etiquetas; la verificación devuelve errores
+            readings = iter([[[{'SourceFile': fn, 'EXIF:Artist': 'Ana'}] for fn in (jpg, txt)]] if sensitive else [])
+            inspect_batch = lambda files: next(readings, [{'error': 'exiftool no responde'} for _ in files])
+            output = io.StringIO()
+            with patch.object(self.main, 'inspect_batch', side_effect=inspect_batch), \
+                 patch.object(cleaner, '_run_argfile', side_effect=lambda blocks: {fn: (True, None) for fn, _ in blocks}), \
+                 redirect_stdout(output):
+                cleaner._clean_batch([jpg, txt])
+
+            self.assertEqual(cleaner.summary, {'processed': 2, 'cleaned': 0, 'failed': 2})
+            for file_path in (jpg, txt):
+                self.assertIn(f"No se pudieron verificar los metadatos restantes de {file_path}",
+                              output.getvalue().splitlines())
+
     @patch('subprocess.run')
     def test_clean_all_metadata_simple(self, mock_subprocess_run):
         """Prueba simple de limpieza de todos los metadatos"""
@@ -145,6 +782,13 @@ class TestMetaInfo(unittest.TestCase):
         
         # Verificar que se llamó a subprocess.run
         mock_subprocess_run.assert_called()
+        
+        # El archivo se reescribe con una única invocación de exiftool
+        exiftool_calls = [c.args[0] for c in mock_subprocess_run.call_args_list if c.args[0][0] == 'exiftool']
+        self.assertEqual(len(exiftool_calls), 1)
+        self.assertIn('-all=', exiftool_calls[0])
+        for key in SensitivePatterns.get_keys_to_delete():
+            self.assertIn(f"-{key}=", exiftool_calls[0])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import struct
+import zipfile
+from unittest.mock import patch, MagicMock
+
+from PIL import Image
+from reportlab.pdfgen import canvas
+
+# Añadir la ruta raíz del proyecto al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.Main import Main
+from src.readers.NativeReader import NativeReader
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'files')
+
+
+class TestNativeReaders(unittest.TestCase):
+
+    def setUp(self):
+        """Configuración previa a cada prueba"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        shutil.rmtree(self.test_dir)
+
+    def test_jpeg_exif_and_gps(self):
+        """Probar la lectura nativa de EXIF y GPS en un JPEG"""
+        exif = Image.Exif()
+        exif[0x010f] = 'Canon'
+        exif[0x013b] = 'Juan Perez'
+        exif[0x8825] = {1: 'N', 2: (40.0, 25.0, 12.5), 3: 'W', 4: (3.0, 42.0, 0.0)}
+        path = os.path.join(self.test_dir, 'photo.jpg')
+        Image.new('RGB', (20, 10)).save(path, exif=exif, comment=b'hola')
+
+        metadata = NativeReader.read(path)
+
+        self.assertEqual(metadata['SourceFile'], path)
+        self.assertEqual(metadata['File:FileType'], 'JPEG')
+        self.assertEqual(metadata['File:ImageWidth'], 20)
+        self.assertEqual(metadata['File:Comment'], 'hola')
+        self.assertEqual(metadata['EXIF:Make'], 'Canon')
+        self.assertEqual(metadata['EXIF:Artist'], 'Juan Perez')
+        self.assertEqual(metadata['EXIF:GPSLatitudeRef'], 'N')
+        self.assertAlmostEqual(metadata['EXIF:GPSLatitude'], 40.42013889, places=6)
+        self.assertAlmostEqual(metadata['EXIF:GPSLongitude'], 3.7)
+
+    def test_png_text_chunks(self):
+        """Probar la lectura nativa de los fragmentos de texto de un PNG"""
+        metadata = NativeReader.read(os.path.join(FILES_DIR, 'sensitive.png'))
+
+        self.assertEqual(metadata['PNG:ImageWidth'], 100)
+        self.assertEqual(metadata['PNG:Author'], 'Juan Pérez')
+        self.assertEqual(metadata['PNG:Email'], 'juan.perez@example.com')
+
+    def test_ooxml_properties(self):
+        """Probar la lectura nativa de docProps en un documento docx"""
+        path = os.path.join(self.test_dir, 'informe.docx')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', '<Types/>')
+            archive.writestr('docProps/core.xml',
+                '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+                'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/">'
+                '<dc:creator>Juan Perez</dc:creator><cp:lastModifiedBy>Ana Lopez</cp:lastModifiedBy>'
+                '<cp:revision>3</cp:revision><dcterms:created>2024-01-31T10:00:00Z</dcterms:created>'
+                '</cp:coreProperties>')
+            archive.writestr('docProps/app.xml',
+                '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+                '<Company>ACME</Company><Pages>2</Pages></Properties>')
+            archive.writestr('word/document.xml', '<w:document/>')
+
+        metadata = NativeReader.read(path)
+
+        self.assertEqual(metadata['File:FileType'], 'DOCX')
+        self.assertEqual(metadata['XML:Creator'], 'Juan Perez')
+        self.assertEqual(metadata['XML:LastModifiedBy'], 'Ana Lopez')
+        self.assertEqual(metadata['XML:Company'], 'ACME')
+        self.assertEqual(metadata['XML:RevisionNumber'], 3)
+        self.assertEqual(metadata['XML:Pages'], 2)
+        self.assertEqual(metadata['XML:CreateDate'], '2024:01:31 10:00:00Z')
+
+    def test_odf_meta(self):
+        """Probar la lectura nativa de meta.xml en un documento odt"""
+        path = os.path.join(self.test_dir, 'informe.odt')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+            archive.writestr('meta.xml',
+                '<office:document-meta xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+                'xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                '<office:meta><meta:initial-creator>Juan Perez</meta:initial-creator><dc:creator>Ana Lopez</dc:creator>'
+                '<meta:document-statistic meta:page-count="2"/></office:meta></office:document-meta>')
+
+        metadata = NativeReader.read(path)
+
+        self.assertEqual(metadata['File:MIMEType'], 'application/vnd.oasis.opendocument.text')
+        self.assertEqual(metadata['XMP:Initial-creator'], 'Juan Perez')
+        self.assertEqual(metadata['XMP:Creator'], 'Ana Lopez')
+        self.assertEqual(metadata['XMP:Document-statisticPage-count'], 2)
+
+    def test_pdf_info_follows_incremental_updates(self):
+        """Probar que el lector PDF usa el diccionario Info de la última actualización incremental"""
+        path = os.path.join(self.test_dir, 'informe.pdf')
+        pdf = canvas.Canvas(path)
+        pdf.setAuthor('Juan Perez')
+        pdf.showPage()
+        pdf.save()
+
+        metadata = NativeReader.read(path)
+        self.assertEqual(metadata['PDF:Author'], 'Juan Perez')
+        self.assertEqual(metadata['PDF:PageCount'], 1)
+
+        # Añadir una actualización incremental con un Info nuevo, como hace exiftool al limpiar
+        with open(path, 'rb') as f:
+            data = f.read()
+        previous = int(data.rsplit(b'startxref', 1)[1].split()[0])
+        root = data.split(b'/Root ', 1)[1].split(b'R', 1)[0] + b'R'
+        size = int(data.split(b'/Size ', 1)[1].split()[0])
+        obj = b'%d 0 obj\n<< /Producer (Limpio) >>\nendobj\n' % size
+        update = obj + (b'xref\n%d 1\n%010d 00000 n \ntrailer\n<< /Size %d /Root %s /Info %d 0 R /Prev %d >>\n'
+                        b'startxref\n%d\n%%%%EOF\n' % (size, len(data), size + 1, root, size, previous, len(data) + len(obj)))
+        with open(path, 'ab') as f:
+            f.write(update)
+
+        metadata = NativeReader.read(path)
+        self.assertNotIn('PDF:Author', metadata)
+        self.assertEqual(metadata['PDF:Producer'], 'Limpio')
+        self.assertEqual(metadata['PDF:PageCount'], 1)
+
+    def test_mp4_skips_mdat_and_reads_udta(self):
+        """Probar la lectura nativa de moov/udta en un MP4 saltando mdat"""
+        def box(box_type, payload):
+            return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+        mvhd = box(b'mvhd', bytes(4) + struct.pack('>IIII', 3789540000, 3789540000, 1000, 12345) + bytes(80))
+        location = box(b'\xa9xyz', struct.pack('>HH', 18, 0x15c7) + b'+40.4168-003.7038/')
+        artist = box(b'\xa9ART', box(b'data', struct.pack('>II', 1, 0) + b'Juan Perez'))
+        meta = box(b'meta', bytes(4) + box(b'hdlr', bytes(24)) + box(b'ilst', artist))
+        moov = box(b'moov', mvhd + box(b'udta', location + meta))
+        mdat_size = 64 * 1024 * 1024
+
+        path = os.path.join(self.test_dir, 'video.mp4')
+        with open(path, 'wb') as f:
+            f.write(box(b'ftyp', b'isom' + struct.pack('>I', 512) + b'isommp41'))
+            f.write(struct.pack('>I4sQ', 1, b'mdat', 16 + mdat_size))
+            f.seek(mdat_size, 1)
+            f.write(moov)
+
+        metadata = NativeReader.read(path)
+
+        self.assertEqual(metadata['File:FileType'], 'MP4')
+        self.assertEqual(metadata['QuickTime:MajorBrand'], 'isom')
+        self.assertEqual(metadata['QuickTime:CreateDate'], '2024:01:31 10:00:00')
+        self.assertEqual(metadata['QuickTime:Duration'], 12.345)
+        self.assertEqual(metadata['QuickTime:GPSCoordinates'], '40.4168 -3.7038')
+        self.assertEqual(metadata['QuickTime:Artist'], 'Juan Perez')
+
+    def test_unrecognized_file_falls_back(self):
+        """Probar que un archivo no reconocido se deja para exiftool"""
+        path = os.path.join(self.test_dir, 'broken.jpg')
+        with open(path, 'wb') as f:
+            f.write(b'no es una imagen')
+
+        self.assertIsNone(NativeReader.read(path))
+        self.assertIsNone(NativeReader.read(os.path.join(self.test_dir, 'doc.rtf')))
+        self.assertIsNone(NativeReader.read(path.replace('.jpg', '.docx')))
+        pdf_path = path.replace('.jpg', '.pdf')
+        with open(pdf_path, 'wb') as f:
+            f.write(b'%PDF-1.4\nsin tabla xref')
+        self.assertIsNone(NativeReader.read(pdf_path))
+
+    @patch('exiftool.ExifToolHelper')
+    def test_main_uses_native_reader(self, mock_exiftool):
+        """Probar que Main.inspect_batch solo recurre a exiftool para lo que no lee de forma nativa"""
+        mock_instance = mock_exiftool.return_value.__enter__.return_value
+        mock_instance.get_metadata.side_effect = lambda files, params=None: [{'SourceFile': files}]
+        broken = os.path.join(self.test_dir, 'broken.jpg')
+        with open(broken, 'wb') as f:
+            f.write(b'no es una imagen')
+        png = os.path.join(FILES_DIR, 'normal.png')
+
+        main = Main({'input_path': self.test_dir, 'output_path': self.test_dir, 'native': True})
+        result = main.inspect_batch([png, broken])
+
+        self.assertEqual(result[0][0]['PNG:Title'], 'Documento de Prueba')
+        self.assertEqual(result[1], [{'SourceFile': broken}])
+        mock_instance.get_metadata.assert_called_once_with(broken, params=None)
+
+    @patch('subprocess.run')
+    @patch('exiftool.ExifToolHelper')
+    def test_clean_verification_uses_native_reader(self, mock_exiftool, mock_subprocess_run):
+        """Probar que la verificación posterior a la limpieza no lee con exiftool en modo --native"""
+        mock_subprocess_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        path = os.path.join(self.test_dir, 'normal.png')
+        shutil.copy(os.path.join(FILES_DIR, 'normal.png'), path)
+
+        main = Main({'input_path': self.test_dir, 'output_path': self.test_dir, 'native': True, 'wipe_all': True})
+
+        self.assertTrue(main.cleaner._clean_all_metadata(path))
+        mock_exiftool.return_value.__enter__.return_value.get_metadata.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()